@@ -0,0 +1,150 @@
+"""
+Micro-Benchmark Cartesian => Keplerian Conversion.
+
+Compares the previous cart2kepX (reproduced below as cart2kepX_reference;
+arccos + flip masks, repeated dot products) with the fused kernel
+kepler_helpers.cart2kepqQX, with and without preallocated out= arrays, at
+several particle counts. Reports the largest deviation between both (angles
+modulo 2pi).
+
+Usage: python /path/bench_cart2kep.py -sizes 10000 100000 1000000 10000000
+"""
+
+import time
+import argparse
+import numpy as np
+import kepler_helpers as kh
+import vector_helpers as vh
+
+
+###############################################################################
+# FUNCTION DEFINITIONS
+###############################################################################
+
+def cart2kepX_reference(x, y, z, vx, vy, vz, mass, central_mass=1.0):
+    """
+    Previous Implementation of kepler_helpers.cart2kepX.
+    """
+
+    # Gravitational Parameter
+    G = 1.0
+    mu = G * ( central_mass + mass )
+
+    # Angular Momentum Vector
+    hx, hy, hz = vh.cross(x, y, z, vx, vy, vz)
+
+    # Laplace-Runge-Lenz Vector
+    # Scalar Eccentricity
+    tmp_x, tmp_y, tmp_z = vh.cross(vx, vy, vz, hx, hy, hz)
+    r_norm = vh.norm(x, y, z)
+    lrl_x = tmp_x / mu - x / r_norm
+    lrl_y = tmp_y / mu - y / r_norm
+    lrl_z = tmp_z / mu - z / r_norm
+    ecc = vh.norm(lrl_x, lrl_y, lrl_z)
+
+    # Semi-Major Axis
+    a = vh.dot(hx, hy, hz, hx, hy, hz) / ( mu * ( 1.0 - ecc**2.0 ) )
+
+    # Inclination
+    h_norm = vh.norm(hx, hy, hz)
+    inc = np.arccos(vh.dot(0.0, 0.0, 1.0, hx, hy, hz) / h_norm)
+
+    # Longitude of the Ascending Node
+    nx, ny, nz = vh.cross(0.0, 0.0, 1.0, hx, hy, hz)
+    n_norm = vh.norm(nx, ny, nz)
+    tmp0 = 0.0
+    tmpX = np.arccos(vh.dot(1.0, 0.0, 0.0, nx, ny, nz) / n_norm)
+    Omega = np.where(inc==0.0, tmp0, tmpX)
+    Omega[vh.dot(nx, ny, nz, 0.0, 1.0, 0.0) < 0.0] = \
+        2.0 * np.pi - Omega[vh.dot(nx, ny, nz, 0.0, 1.0, 0.0) < 0.0]
+
+    # Argument of Perigee
+    tmp0 = np.arctan2(lrl_y/ecc, lrl_x/ecc)
+    tmpX = np.arccos(vh.dot(nx, ny, nz, lrl_x, lrl_y, lrl_z) / (n_norm * ecc))
+    omega = np.where(inc==0.0, tmp0, tmpX)
+    omega[vh.dot(lrl_x, lrl_y, lrl_z, 0.0, 0.0, 1.0) < 0.0] = \
+        2.0 * np.pi - omega[vh.dot(lrl_x, lrl_y, lrl_z, 0.0, 0.0, 1.0) < 0.0]
+
+    # True Anomaly
+    theta = np.arccos(vh.dot(lrl_x, lrl_y, lrl_z, x, y, z) / (ecc * r_norm))
+    theta[vh.dot(x, y, z, vx, vy, vz) < 0.0] = \
+        2.0 * np.pi - theta[vh.dot(x, y, z, vx, vy, vz) < 0.0]
+
+    # Eccentric Anomaly
+    E = np.arccos((ecc + np.cos(theta)) / (1 + ecc * np.cos(theta)))
+    E[np.logical_and(np.pi < theta, theta < 2.0 * np.pi)] = \
+        2.0 * np.pi - E[np.logical_and(np.pi < theta, theta < 2.0 * np.pi)]
+
+    # Mean Anomaly
+    M = E - ecc * np.sin(E)
+
+    # Return Set (Plus q, Q as Computed by io_helpers)
+    return a, ecc, inc, Omega, omega, M, a * ( 1.0 - ecc ), a * ( 1.0 + ecc )
+
+def random_state(n, seed=42):
+    """
+    Random Elliptic State Vectors.
+    """
+
+    rng = np.random.RandomState(seed)
+    r, v = kh.kep2cartX(rng.uniform(0.5, 5.0, n), rng.uniform(0.0, 0.9, n), \
+                        rng.uniform(0.0, np.pi, n), \
+                        rng.uniform(0.0, 2.0 * np.pi, n), \
+                        rng.uniform(0.0, 2.0 * np.pi, n), \
+                        rng.uniform(0.0, 2.0 * np.pi, n), 0.0)
+    v /= kh.C.genga_to_kms
+    return r[0], r[1], r[2], v[0], v[1], v[2]
+
+def time_best(func, nrep):
+    """
+    Best-of-N Wall Clock Time.
+    """
+
+    tbest = np.inf
+    for irep in range(nrep):
+        tstart = time.time()
+        func()
+        tbest = min(tbest, time.time() - tstart)
+    return tbest
+
+
+###############################################################################
+# MAIN PROGRAM STARTS HERE
+###############################################################################
+
+# Parse Arguments
+parser = argparse.ArgumentParser()
+parser.add_argument('-sizes', type=int, nargs='+', \
+                    default=[ 10000, 100000, 1000000, 10000000 ], \
+                    help='Particle Counts')
+parser.add_argument('-nrep', type=int, default=3, \
+                    help='Number of Repetitions (Best Of)')
+args = parser.parse_args()
+
+# Loop Sizes
+print "// Best of %i" % args.nrep
+print "   %10s %12s %12s %12s %8s %10s" % \
+    ("N", "reference", "fused", "fused+out", "speedup", "max. dev.")
+for n in args.sizes:
+    x, y, z, vx, vy, vz = random_state(n)
+    out = [ np.empty(n) for ii in range(8) ]
+    t_ref = time_best(lambda: cart2kepX_reference(x, y, z, vx, vy, vz, 0.0), \
+                      args.nrep)
+    t_new = time_best(lambda: kh.cart2kepqQX(x, y, z, vx, vy, vz, 0.0), \
+                      args.nrep)
+    t_out = time_best(lambda: kh.cart2kepqQX(x, y, z, vx, vy, vz, 0.0, \
+                                             out=out), args.nrep)
+
+    # Deviation (Angles Modulo 2pi)
+    ref = cart2kepX_reference(x, y, z, vx, vy, vz, 0.0)
+    new = kh.cart2kepqQX(x, y, z, vx, vy, vz, 0.0)
+    dev = 0.0
+    for iel in range(8):
+        dd = new[iel] - ref[iel]
+        if iel in [ 3, 4, 5 ]:
+            dd = np.mod(dd + np.pi, 2.0 * np.pi) - np.pi
+        dev = max(dev, np.nanmax(np.abs(dd)))
+    del ref, new
+
+    print "   %10i %10.4f s %10.4f s %10.4f s %7.2fx %10.2e" % \
+        (n, t_ref, t_new, t_out, t_ref / t_out, dev)
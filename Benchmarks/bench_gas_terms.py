@@ -0,0 +1,78 @@
+"""
+Benchmark Gas Disk S/T Terms.
+
+Compares direct integration (potential_helpers.s_and_t, one call per
+semi-major axis) with the tabulated lookup of resonance_helpers.gas_terms
+(load_gas_table; the table is built once, then read from the disk cache).
+Reports time per semi-major axis and the largest relative deviation, and the
+time of a gas-mode resonance scan (secular_resonances) with both.
+
+Usage: python /path/bench_gas_terms.py -n 20 -t_over_tau 1.0
+"""
+
+import time
+import argparse
+import numpy as np
+import resonance_helpers as rh
+
+
+###############################################################################
+# MAIN PROGRAM STARTS HERE
+###############################################################################
+
+# Parse Arguments
+parser = argparse.ArgumentParser()
+parser.add_argument('-n', type=int, default=20, \
+                    help='Number of Semi-Major Axes (Direct Integration)')
+parser.add_argument('-t_over_tau', type=float, default=1.0, \
+                    help='Gas Decay (t/tau)')
+args = parser.parse_args()
+
+# Table (Build or Load)
+tstart = time.time()
+table = rh.load_gas_table()
+t_table = time.time() - tstart
+print "// Table: %i Points, %.4f - %.4f AU, Build/Load %.2f s" % \
+    (len(table["a"]), table["a"][0], table["a"][-1], t_table)
+print "   Cache: %s" % (rh.gas_table_fname % \
+                       (rh.gas_table_model(), rh.gas_table_amin, \
+                        rh.gas_table_amax, len(table["a"])))
+
+# Random Semi-Major Axes
+a = np.exp(np.random.RandomState(42).uniform(np.log(0.2), np.log(30.0), \
+                                             args.n))
+
+# Direct vs. Table
+tstart = time.time()
+S_d, T_d = rh.gas_terms(a, args.t_over_tau, tabulated=False)
+t_direct = ( time.time() - tstart ) / args.n
+a_many = np.repeat(a, 10000)
+tstart = time.time()
+S_t, T_t = rh.gas_terms(a_many, args.t_over_tau)
+t_lookup = ( time.time() - tstart ) / len(a_many)
+S_t, T_t = S_t[::10000], T_t[::10000]
+print ""
+print "// S, T at %i Semi-Major Axes in [0.2, 30] AU, t/tau = %.2f" % \
+    (args.n, args.t_over_tau)
+print "   %-10s %12.3e s per a" % ("direct", t_direct)
+print "   %-10s %12.3e s per a" % ("table", t_lookup)
+print "   max. rel. dev. S = %.2e, T = %.2e" % \
+    (np.max(np.abs(S_t / S_d - 1.0)), np.max(np.abs(T_t / T_d - 1.0)))
+
+# Resonance Scan
+a_js, m_js = [ 5.202545, 9.554841 ], [ 9.54786e-4, 2.85837e-4 ]
+tstart = time.time()
+res_t = rh.secular_resonances(a_js, m_js, t_over_tau=args.t_over_tau)
+t_scan_t = time.time() - tstart
+tstart = time.time()
+res_d = rh.secular_resonances(a_js, m_js, t_over_tau=args.t_over_tau, \
+                              tabulated=False)
+t_scan_d = time.time() - tstart
+print ""
+print "// Resonance Scan (JS Today), t/tau = %.2f" % args.t_over_tau
+print "   %-10s %10.3f s  %s" % ("direct", t_scan_d, \
+                                 " ".join("%s=%.6f" % (r["name"], r["a"]) \
+                                          for r in res_d))
+print "   %-10s %10.3f s  %s" % ("table", t_scan_t, \
+                                 " ".join("%s=%.6f" % (r["name"], r["a"]) \
+                                          for r in res_t))
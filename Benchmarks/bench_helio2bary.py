@@ -0,0 +1,84 @@
+"""
+Benchmark Grouped Heliocentric => Barycentric Conversion.
+
+Compares the per-snapshot loop (kepler_helpers.helio2bary, called three
+times per group on boolean-masked slices) with the grouped, vectorized
+kepler_helpers.helio2baryX on random stacked snapshots (runs x steps
+groups, keyed by ifname and nstep). Reports the largest deviation.
+
+Usage: python /path/bench_helio2bary.py -nruns 12 -nsteps 100 -nparticles 1000
+"""
+
+import time
+import argparse
+import numpy as np
+import kepler_helpers as kh
+
+
+###############################################################################
+# FUNCTION DEFINITIONS
+###############################################################################
+
+def random_stack(nruns, nsteps, nparticles, seed=42):
+    """
+    Random Stacked Snapshots (Contiguous Groups, as from read_output).
+    """
+
+    rng = np.random.RandomState(seed)
+    n = nruns * nsteps * nparticles
+    ifname = np.repeat(np.arange(nruns), nsteps * nparticles).astype(float)
+    nstep = np.tile(np.repeat(np.arange(nsteps) * 1000, nparticles), nruns)
+    cols = [ rng.randn(n) for ii in range(6) ]
+    m = rng.uniform(0.0, 1.0e-5, n)
+    return cols, m, ifname, nstep
+
+def helio2bary_loop(cols, m, ifname, nstep):
+    """
+    Per-Snapshot Loop.
+    """
+
+    out = [ np.empty(len(m)) for ii in range(6) ]
+    for ii in np.unique(ifname):
+        for nn in np.unique(nstep[ifname == ii]):
+            sel = np.logical_and(ifname == ii, nstep == nn)
+            for iax in range(3):
+                out[iax][sel], out[iax+3][sel] = \
+                    kh.helio2bary(cols[iax][sel], cols[iax+3][sel], m[sel])
+    return out
+
+
+###############################################################################
+# MAIN PROGRAM STARTS HERE
+###############################################################################
+
+# Parse Arguments
+parser = argparse.ArgumentParser()
+parser.add_argument('-nruns', type=int, default=12, \
+                    help='Number of Runs')
+parser.add_argument('-nsteps', type=int, default=100, \
+                    help='Number of Snapshots per Run')
+parser.add_argument('-nparticles', type=int, default=1000, \
+                    help='Number of Particles per Snapshot')
+args = parser.parse_args()
+
+# Data
+cols, m, ifname, nstep = random_stack(args.nruns, args.nsteps, args.nparticles)
+print "// %i Runs x %i Snapshots x %i Particles" % \
+    (args.nruns, args.nsteps, args.nparticles)
+
+# Loop
+tstart = time.time()
+ref = helio2bary_loop(cols, m, ifname, nstep)
+tloop = time.time() - tstart
+
+# Grouped
+tstart = time.time()
+new = kh.helio2baryX(*(cols + [ m ]), keys=[ ifname, nstep ])
+tgrp = time.time() - tstart
+
+# Report
+dev = max([ np.max(np.abs(new[ii] - ref[ii])) for ii in range(6) ])
+print "   %-24s %10.3f s" % ("helio2bary (loop)", tloop)
+print "   %-24s %10.3f s" % ("helio2baryX (grouped)", tgrp)
+print "   %-24s %10.1f x" % ("Speedup", tloop / tgrp)
+print "   Max. Deviation: %.2e" % dev
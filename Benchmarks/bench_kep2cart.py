@@ -0,0 +1,96 @@
+"""
+Benchmark Keplerian => Cartesian Conversion.
+
+Compares the scalar path (kepler_helpers.kep2cart, one call per element, as
+previously used by IC_Helpers/genic_astorb.py) with the vectorized path
+(kepler_helpers.kep2cartX) on random elliptic and hyperbolic elements.
+The scalar path is timed on a subset and extrapolated.
+
+Also reports the largest relative deviation between both paths and the
+largest Kepler equation residual of the vectorized solver (nrX).
+
+Usage: python /path/bench_kep2cart.py -n 1000000 -nscalar 10000
+"""
+
+import time
+import argparse
+import numpy as np
+import kepler_helpers as kh
+
+
+###############################################################################
+# FUNCTION DEFINITIONS
+###############################################################################
+
+def random_elements(n, fhyp, seed=42):
+    """
+    Random Elements. Fraction fhyp is Hyperbolic.
+    """
+
+    rng = np.random.RandomState(seed)
+    nhyp = int(fhyp * n)
+    ecc = rng.uniform(0.0, 0.99, n)
+    ecc[:nhyp] = rng.uniform(1.01, 5.0, nhyp)
+    a = rng.uniform(0.5, 5.0, n)
+    a[:nhyp] *= -1.0
+    inc = rng.uniform(0.0, np.pi, n)
+    Omega = rng.uniform(0.0, 2.0 * np.pi, n)
+    omega = rng.uniform(0.0, 2.0 * np.pi, n)
+    M = rng.uniform(0.0, 2.0 * np.pi, n)
+    M[:nhyp] = rng.uniform(-10.0, 10.0, nhyp)
+    return a, ecc, inc, Omega, omega, M
+
+def kep2cart_scalar(a, ecc, inc, Omega, omega, M):
+    r = np.empty((3, len(a))); v = np.empty((3, len(a)))
+    for kk in range(len(a)):
+        r[:,kk], v[:,kk] = kh.kep2cart(a[kk], ecc[kk], inc[kk], \
+                                       Omega[kk], omega[kk], M[kk], \
+                                       0.0, 1.0)
+    return r, v
+
+
+###############################################################################
+# MAIN PROGRAM STARTS HERE
+###############################################################################
+
+# Parse Arguments
+parser = argparse.ArgumentParser()
+parser.add_argument('-n', type=int, default=1000000, \
+                    help='Number of Elements')
+parser.add_argument('-nscalar', type=int, default=10000, \
+                    help='Number of Elements for Scalar Path')
+parser.add_argument('-fhyp', type=float, default=0.1, \
+                    help='Fraction of Hyperbolic Orbits')
+args = parser.parse_args()
+
+# Elements
+a, ecc, inc, Omega, omega, M = random_elements(args.n, args.fhyp)
+nscalar = min(args.nscalar, args.n)
+print "// %i Elements (%.0f%% Hyperbolic), Scalar Path on %i" % \
+    (args.n, 100.0 * args.fhyp, nscalar)
+
+# Vectorized
+tstart = time.time()
+r, v = kh.kep2cartX(a, ecc, inc, Omega, omega, M, 0.0, 1.0)
+tvec = time.time() - tstart
+
+# Scalar (Subset; Shuffled So Both Orbit Types Are Sampled)
+isub = np.random.RandomState(0).permutation(args.n)[:nscalar]
+tstart = time.time()
+rs, vs = kep2cart_scalar(a[isub], ecc[isub], inc[isub], \
+                         Omega[isub], omega[isub], M[isub])
+tsca = (time.time() - tstart) * float(args.n) / float(nscalar)
+
+# Accuracy
+dr = np.max(np.abs(r[:,isub] - rs) / np.max(np.abs(rs), axis=0))
+dv = np.max(np.abs(v[:,isub] - vs) / np.max(np.abs(vs), axis=0))
+E = kh.nrX(M, ecc)
+res = np.where(ecc < 1.0, E - ecc * np.sin(E) - M, \
+               ecc * np.sinh(E) - E - M)
+
+# Report
+print "   %-24s %10.3f s" % ("kep2cart (extrapolated)", tsca)
+print "   %-24s %10.3f s" % ("kep2cartX", tvec)
+print "   %-24s %10.1f x" % ("Speedup", tsca / tvec)
+print "   Max. Rel. Deviation (r, v): %.2e, %.2e" % (dr, dv)
+print "   Max. Kepler Residual (nrX): %.2e" % np.max(np.abs(res))
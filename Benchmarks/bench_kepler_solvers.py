@@ -0,0 +1,135 @@
+"""
+Benchmark Kepler Equation Solvers (Accuracy and Speed).
+
+Compares
+- kepler_helpers.nr (scalar Newton-Raphson, tolerance 1e-5),
+- kepler_helpers.nrX (vectorized Halley, tolerance 1e-12),
+- kepler_helpers.solve_kepler (starter + fixed fifth-order corrections),
+  vectorized and called per element,
+on random elements drawn from several regimes (moderate/near-parabolic
+elliptic, tiny mean anomalies, hyperbolic). Scalar paths are timed on a
+subset and extrapolated.
+
+Errors are relative to a long double Newton polish of the result,
+normalised by max(|E|, 1).
+
+Usage: python /path/bench_kepler_solvers.py -n 1000000 -nscalar 10000
+"""
+
+import time
+import argparse
+import numpy as np
+import kepler_helpers as kh
+
+
+###############################################################################
+# FUNCTION DEFINITIONS
+###############################################################################
+
+def regimes(n, seed=42):
+    """
+    Random (M, ecc) per Regime.
+    """
+
+    rng = np.random.RandomState(seed)
+    tiny = np.sign(rng.uniform(-1.0, 1.0, n)) * \
+        10.0**rng.uniform(-12.0, -2.0, n)
+    return [ [ "ecc<0.99", rng.uniform(-np.pi, np.pi, n), \
+               rng.uniform(0.0, 0.99, n) ], \
+             [ "1-ecc<1e-2", rng.uniform(-np.pi, np.pi, n), \
+               1.0 - 10.0**rng.uniform(-12.0, -2.0, n) ], \
+             [ "1-ecc<1e-2, |M|<1e-2", tiny, \
+               1.0 - 10.0**rng.uniform(-12.0, -2.0, n) ], \
+             [ "ecc>1", np.sign(rng.uniform(-1.0, 1.0, n)) * \
+               10.0**rng.uniform(-4.0, 3.0, n), \
+               1.0 + 10.0**rng.uniform(-2.0, 2.0, n) ], \
+             [ "ecc-1<1e-2, |M|<1e-2", tiny, \
+               1.0 + 10.0**rng.uniform(-12.0, -2.0, n) ] ]
+
+def reference(E, M, ecc):
+    """
+    Polish with Long Double Newton Iterations (Cancellation-Free f, f').
+    """
+
+    E = E.astype(np.longdouble)
+    M = M.astype(np.longdouble); ecc = ecc.astype(np.longdouble)
+    ell = ecc < 1.0
+    for ii in range(4):
+        f = np.where(ell, \
+                     ( 1.0 - ecc ) * E + ecc * kh._x_minus_sin(E) - M, \
+                     ( ecc - 1.0 ) * E + ecc * kh._x_minus_sin(E, True) - M)
+        fp = np.where(ell, \
+                      ( 1.0 - ecc ) + 2.0 * ecc * np.sin(0.5 * E)**2.0, \
+                      ( ecc - 1.0 ) + 2.0 * ecc * np.sinh(0.5 * E)**2.0)
+        E = E - f / fp
+    return E
+
+def max_error(E, M, ecc):
+    """
+    Max. Error (Converged Elements), Number of Failures.
+    """
+
+    ok = np.isfinite(E)
+    Eref = reference(E[ok], M[ok], ecc[ok])
+    err = np.abs(E[ok].astype(np.longdouble) - Eref) / \
+        np.maximum(np.abs(Eref), 1.0)
+    return float(np.max(err)), np.sum(~ok)
+
+def scalar_loop(func, M, ecc):
+    """
+    Call Scalar Solver per Element. Failures => NaN.
+    """
+
+    E = np.empty(len(M))
+    for kk in range(len(M)):
+        try:
+            E[kk] = func(M[kk], ecc[kk])
+        except Exception:
+            E[kk] = np.nan
+    return E
+
+
+###############################################################################
+# MAIN PROGRAM STARTS HERE
+###############################################################################
+
+# Parse Arguments
+parser = argparse.ArgumentParser()
+parser.add_argument('-n', type=int, default=1000000, \
+                    help='Number of Elements per Regime')
+parser.add_argument('-nscalar', type=int, default=10000, \
+                    help='Number of Elements for Scalar Paths')
+args = parser.parse_args()
+nscalar = min(args.n, args.nscalar)
+
+# Solvers: Name, Function, Vectorized?
+solvers = [ [ "nr", lambda M, e: kh.nr(M, e), False ], \
+            [ "nrX", lambda M, e: kh.nrX(M, e), True ], \
+            [ "solve_kepler (niter=1)", \
+              lambda M, e: kh.solve_kepler(M, e, niter=1), True ], \
+            [ "solve_kepler (niter=2)", \
+              lambda M, e: kh.solve_kepler(M, e, niter=2), True ], \
+            [ "solve_kepler (scalar)", \
+              lambda M, e: kh.solve_kepler(M, e), False ] ]
+
+# Loop Regimes
+print "// %i Elements per Regime, Scalar Paths on %i" % (args.n, nscalar)
+for name, M, ecc in regimes(args.n):
+    print "** %s" % name
+    for sname, func, vectorized in solvers:
+        try:
+            tstart = time.time()
+            if vectorized:
+                E = func(M, ecc)
+                Mx, eccx = M, ecc
+            else:
+                Mx, eccx = M[:nscalar], ecc[:nscalar]
+                E = scalar_loop(func, Mx, eccx)
+            tsol = time.time() - tstart
+            tsol *= float(args.n) / float(len(Mx))
+            err, nfail = max_error(E, Mx, eccx)
+            print "   %-24s %8.3f s %10.1f ns/element  " \
+                "Max. Error %.2e  Failed %i" % \
+                (sname, tsol, tsol / args.n * 1.0e9, err, nfail)
+        except Exception as e:
+            print "   %-24s !! %s" % (sname, e)
@@ -0,0 +1,104 @@
+"""
+Benchmark Laplace Coefficients.
+
+Compares the previous 10-term power series (reproduced below as
+laplace_coefficient_reference) with the quadrature engine
+resonance_helpers.laplace_coefficientX and its interpolation table
+(laplace_table/laplace_interpolate) for b_{3/2}^{(1)} and b_{3/2}^{(2)}:
+accuracy against the Murray & Dermott (1999) Eq. (7.33) values, relative error
+versus alpha (reference: laplace_coefficientX at tol=1e-20), and timings for
+an array of alphas.
+
+Usage: python /path/bench_laplace.py -n 100000
+"""
+
+import time
+import argparse
+import numpy as np
+import resonance_helpers as rh
+
+
+###############################################################################
+# FUNCTION DEFINITIONS
+###############################################################################
+
+def laplace_coefficient_reference(s, j, alpha, nterms=10):
+    """
+    Previous Implementation of resonance_helpers.laplace_coefficient.
+    """
+
+    ss = 1.0
+    for jj in range(j):
+        ss *= ( s + jj ) / ( jj + 1.0 )
+    term, series = 1.0, 1.0
+    for k in range(nterms - 1):
+        term = term * ( s + k ) * ( s + j + k ) / \
+               ( ( k + 1.0 ) * ( j + k + 1.0 ) ) * alpha**2.0
+        series = series + term
+    return 2.0 * ss * alpha**j * series
+
+def time_best(func, nrep):
+    """
+    Best-of-N Wall Clock Time.
+    """
+
+    tbest = np.inf
+    for irep in range(nrep):
+        tstart = time.time()
+        func()
+        tbest = min(tbest, time.time() - tstart)
+    return tbest
+
+
+###############################################################################
+# MAIN PROGRAM STARTS HERE
+###############################################################################
+
+# Parse Arguments
+parser = argparse.ArgumentParser()
+parser.add_argument('-n', type=int, default=100000, \
+                    help='Number of Alphas')
+parser.add_argument('-nrep', type=int, default=3, \
+                    help='Number of Repetitions (Best Of)')
+args = parser.parse_args()
+
+# Murray & Dermott (1999), Eq. (7.33): Jupiter/Saturn
+alpha_js = 5.202545 / 9.554841
+print "// Murray & Dermott (1999), Eq. (7.33), alpha = %.6f" % alpha_js
+print "   %8s %12s %12s %12s" % ("", "M&D", "series", "quadrature")
+for j, b_md in zip([ 1, 2 ], [ 3.17296, 2.07110 ]):
+    print "   b_3/2^%i %12.5f %12.5f %12.5f" % \
+        (j, b_md, laplace_coefficient_reference(1.5, j, alpha_js), \
+         rh.laplace_coefficientX(1.5, j, alpha_js))
+
+# Relative Error vs. alpha
+table = rh.laplace_table(1.5, [ 1, 2 ])
+print ""
+print "// Relative Error, b_3/2^1"
+print "   %6s %10s %10s %10s" % ("alpha", "series", "quadrature", "table")
+for alpha in [ 0.3, 0.5, 0.7, 0.8, 0.9, 0.95, 0.99 ]:
+    ref = rh.laplace_coefficientX(1.5, 1, alpha, tol=1.0e-20)
+    err = [ laplace_coefficient_reference(1.5, 1, alpha), \
+            rh.laplace_coefficientX(1.5, 1, alpha), \
+            rh.laplace_interpolate(table, alpha)[0] ]
+    print "   %6.2f %10.2e %10.2e %10.2e" % \
+        tuple([ alpha ] + [ np.abs(ee / ref - 1.0) for ee in err ])
+
+# Timings
+alpha = np.random.RandomState(42).uniform(0.0, 0.95, args.n)
+t_ref = time_best(lambda: [ laplace_coefficient_reference(1.5, j, alpha) \
+                            for j in [ 1, 2 ] ], args.nrep)
+t_new = time_best(lambda: rh.laplace_coefficientX(1.5, [ 1, 2 ], alpha), \
+                  args.nrep)
+t_der = time_best(lambda: rh.laplace_coefficientX(1.5, [ 1, 2 ], alpha, \
+                                                  der=[ 0, 1, 2 ]), args.nrep)
+t_tab = time_best(lambda: rh.laplace_table(1.5, [ 1, 2 ]), 1)
+t_int = time_best(lambda: rh.laplace_interpolate(table, alpha), args.nrep)
+print ""
+print "// %i Alphas in [0, 0.95], b_3/2^1 and b_3/2^2, Best of %i" % \
+    (args.n, args.nrep)
+print "   series (10 terms)     %10.4f s" % t_ref
+print "   quadrature            %10.4f s" % t_new
+print "   quadrature + d/da^2   %10.4f s" % t_der
+print "   table (build, once)   %10.4f s" % t_tab
+print "   table (lookup)        %10.4f s" % t_int
@@ -0,0 +1,75 @@
+"""
+Benchmark Orbit-Space Neighbour Queries.
+
+Embeds random asteroid-like orbits (metric_helpers.cart2embeddingX) and times
+nearest-neighbour queries (k=2, i.e. the closest other body) for all bodies
+with the KD-tree index and with the brute-force fallback. The fallback is
+timed on a subset of queries and extrapolated.
+
+Usage: python /path/bench_metric.py -n 100000 -nbrute 1000
+"""
+
+import time
+import argparse
+import numpy as np
+import kepler_helpers as kh
+import metric_helpers as mh
+
+
+###############################################################################
+# FUNCTION DEFINITIONS
+###############################################################################
+
+def random_embedding(n, seed=42):
+    """
+    Random Main Belt-Like Orbits => Embedding.
+    """
+
+    rng = np.random.RandomState(seed)
+    r, v = kh.kep2cartX(rng.uniform(2.0, 3.5, n), rng.uniform(0.0, 0.3, n), \
+                        rng.uniform(0.0, 0.5, n), \
+                        rng.uniform(0.0, 2.0 * np.pi, n), \
+                        rng.uniform(0.0, 2.0 * np.pi, n), \
+                        rng.uniform(0.0, 2.0 * np.pi, n), 0.0)
+    v /= kh.C.genga_to_kms
+    return mh.cart2embeddingX(r[0], r[1], r[2], v[0], v[1], v[2])
+
+
+###############################################################################
+# MAIN PROGRAM STARTS HERE
+###############################################################################
+
+# Parse Arguments
+parser = argparse.ArgumentParser()
+parser.add_argument('-n', type=int, default=100000, \
+                    help='Number of Bodies')
+parser.add_argument('-nbrute', type=int, default=1000, \
+                    help='Number of Queries for Brute Force')
+args = parser.parse_args()
+nbrute = min(args.n, args.nbrute)
+
+# Embedding
+emb = random_embedding(args.n)
+print "// %i Bodies, Brute Force on %i Queries" % (args.n, nbrute)
+
+# KD-Tree
+if mh.cKDTree is not None:
+    tstart = time.time()
+    index = mh.build_index(emb)
+    rho, idx = mh.query_knn(index, emb, k=2)
+    ttree = time.time() - tstart
+    print "   %-24s %10.3f s" % ("cKDTree (build+query)", ttree)
+else:
+    print "   !! scipy Not Available"
+
+# Brute Force
+index = { "emb": emb, "tree": None }
+tstart = time.time()
+rho_b, idx_b = mh.query_knn(index, emb[:nbrute], k=2)
+tbrute = (time.time() - tstart) * float(args.n) / float(nbrute)
+print "   %-24s %10.3f s" % ("Brute Force (extrap.)", tbrute)
+
+# Report
+if mh.cKDTree is not None:
+    print "   %-24s %10.1f x" % ("Speedup", tbrute / ttree)
+    print "   Max. Deviation: %.2e" % np.max(np.abs(rho[:nbrute] - rho_b))
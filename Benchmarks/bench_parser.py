@@ -0,0 +1,114 @@
+"""
+Benchmark Parsers for Genga Coordinate Outputs (Out_*.dat).
+
+Writes a synthetic snapshot (default 100k particles) to a temporary
+directory and reports throughput (MB/s) for
+- the generic pandas read_csv path (previous io_helpers default),
+- io_helpers.parse_output (fixed layout, C tokenizer),
+- numpy.fromfile (text mode, whitespace tokenizer),
+- io_helpers sidecar cache (second read of the same snapshot).
+
+Usage: python /path/bench_parser.py -npart 100000 -nrep 5
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import argparse
+import numpy as np
+import pandas as pd
+import io_helpers as ioh
+
+
+###############################################################################
+# FUNCTION DEFINITIONS
+###############################################################################
+
+def write_snapshot(fname, npart):
+    """
+    Write Synthetic Genga Output (22 Columns, Trailing Space).
+    """
+
+    rng = np.random.RandomState(42)
+    data = rng.uniform(-5.0, 5.0, (npart, 21))
+    data[:,0] = 1.0e3
+    data[:,1] = np.arange(npart)
+    data[:,2] = np.abs(data[:,2]) * 1.0e-9
+    data[:,10:19] = 0.0
+    data[:,19] = rng.randint(0, 10, npart)
+    data[:,20] = 0.0
+    fmt = [ "%.16e", "%i", "%.16e", "%.16e" ] + \
+          [ "%+.16e" ] * 6 + \
+          [ "%i" ] * 3 + [ "%.16e" ] * 4 + [ "%i" ] * 4
+    with open(fname, "w") as f:
+        np.savetxt(f, data, fmt=" ".join(fmt) + " ")
+
+def time_best(func, nrep):
+    """
+    Best-of-N Wall Clock Time.
+    """
+
+    tbest = np.inf
+    for irep in range(nrep):
+        tstart = time.time()
+        func()
+        tbest = min(tbest, time.time() - tstart)
+    return tbest
+
+def read_generic(fname):
+    return pd.read_csv(fname, sep=" ", header=None, \
+                       names=ioh.names_cols_out, dtype={ "pid": np.int32 }, \
+                       usecols=ioh.touse_cols_out)
+
+def read_fromfile(fname):
+    data = np.fromfile(fname, sep=" ")
+    data = data.reshape(-1, len(ioh.names_cols_out)-1)
+    return [ np.ascontiguousarray(data[:,icol]) \
+             for icol in ioh.touse_cols_out ]
+
+
+###############################################################################
+# MAIN PROGRAM STARTS HERE
+###############################################################################
+
+# Parse Arguments
+parser = argparse.ArgumentParser()
+parser.add_argument('-npart', type=int, default=100000, \
+                    help='Number of Particles')
+parser.add_argument('-nrep', type=int, default=5, \
+                    help='Number of Repetitions (Best Of)')
+args = parser.parse_args()
+
+# Synthetic Snapshot
+tmpdir = tempfile.mkdtemp()
+fname = "%s/Out_bench_%012d.dat" % (tmpdir, 0)
+print "// Writing %i Particles to %s" % (args.npart, fname)
+write_snapshot(fname, args.npart)
+mbytes = os.path.getsize(fname) / 1024.0**2.0
+
+# Sanity Check
+cols = ioh.parse_output(fname)
+dfg = read_generic(fname)
+for col in cols.keys():
+    if not np.array_equal(cols[col], dfg[col].values):
+        print "!! Parsers disagree on column %s" % col
+        sys.exit()
+
+# Warm Sidecar Cache
+ioh._read_output_raw(fname, cache=True)
+
+# Benchmark
+print "// %.1f MB, Best of %i" % (mbytes, args.nrep)
+benchmarks = [ [ "read_csv (generic)", lambda: read_generic(fname) ], \
+               [ "parse_output", lambda: ioh.parse_output(fname) ], \
+               [ "numpy.fromfile", lambda: read_fromfile(fname) ], \
+               [ "sidecar cache", \
+                 lambda: ioh._read_output_raw(fname, cache=True) ] ]
+for name, func in benchmarks:
+    tbest = time_best(func, args.nrep)
+    print "   %-20s %8.3f s %10.1f MB/s" % (name, tbest, mbytes / tbest)
+
+# Clean Up
+shutil.rmtree(tmpdir)
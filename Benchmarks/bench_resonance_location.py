@@ -0,0 +1,110 @@
+"""
+Benchmark Secular Resonance Locations.
+
+Compares the previous grid scan (reproduced below as
+secular_resonance_location_reference; 0.01 AU grid from 0.1 to 5 AU, locations
+snap to the grid) with the root-finding locator
+resonance_helpers.secular_resonances (coarse sweep, bracketing, Brent) for
+randomly perturbed Jupiter/Saturn configurations. Reports the time per
+snapshot and the largest deviation from a tol=1e-10 solution. With -gas, also
+counts the gas-disk integrals (potential_helpers.s_and_t calls) per snapshot.
+
+Usage: python /path/bench_resonance_location.py -n 200 [-gas 5.0]
+"""
+
+import time
+import argparse
+import numpy as np
+import resonance_helpers as rh
+
+
+###############################################################################
+# FUNCTION DEFINITIONS
+###############################################################################
+
+def secular_resonance_location_reference(a_1, a_2, m_1, m_2):
+    """
+    Previous Implementation of resonance_helpers.secular_resonance_location.
+    """
+
+    a_ast = np.mgrid[0.1:5.0:0.01]
+    g_1, g_2, f_1, f_2 = rh.secular_frequencies_planets(a_1, a_2, m_1, m_2)
+    g, f = rh.secular_frequencies_planets_and_asteroid(a_1, a_2, m_1, m_2, \
+                                                       a_ast)
+    out = []
+    for y in [ g - g_1, g - g_2, f - f_1, f - f_2 ]:
+        out.append(a_ast[:-1][np.diff(np.sign(y))**2.0 > 1.0e-16])
+    return out
+
+def count_calls(func):
+    """
+    Wrap func, Count Calls.
+    """
+
+    def wrapped(*args):
+        wrapped.ncalls += 1
+        return func(*args)
+    wrapped.ncalls = 0
+    return wrapped
+
+
+###############################################################################
+# MAIN PROGRAM STARTS HERE
+###############################################################################
+
+# Parse Arguments
+parser = argparse.ArgumentParser()
+parser.add_argument('-n', type=int, default=200, \
+                    help='Number of Snapshots')
+parser.add_argument('-gas', type=float, default=None, \
+                    help='Gas Mode: t/tau (Needs potential_helpers)')
+args = parser.parse_args()
+
+# Perturbed Jupiter/Saturn
+rng = np.random.RandomState(42)
+a_j = 5.202545 * rng.uniform(0.9, 1.1, args.n)
+a_s = 9.554841 * rng.uniform(0.9, 1.1, args.n)
+m_j, m_s = 9.54786e-4, 2.85837e-4
+
+# Time Both
+tstart = time.time()
+ref = [ secular_resonance_location_reference(a_j[ii], a_s[ii], m_j, m_s) \
+        for ii in range(args.n) ]
+t_ref = ( time.time() - tstart ) / args.n
+tstart = time.time()
+new = [ rh.secular_resonances([ a_j[ii], a_s[ii] ], [ m_j, m_s ]) \
+        for ii in range(args.n) ]
+t_new = ( time.time() - tstart ) / args.n
+
+# Deviation from Converged Locations
+dev_ref, dev_new = 0.0, 0.0
+for ii in range(args.n):
+    exact = rh.secular_resonances([ a_j[ii], a_s[ii] ], [ m_j, m_s ], \
+                                  tol=1.0e-10)
+    dev_new = max(dev_new, np.max(np.abs(new[ii]["a"] - exact["a"])))
+    for iname, name in enumerate([ "nu_5", "nu_6", "nu_15", "nu_16" ]):
+        a_exact = exact["a"][exact["name"] == name]
+        if len(a_exact) == len(ref[ii][iname]):
+            dev_ref = max(dev_ref, \
+                          np.max(np.abs(ref[ii][iname] - a_exact), \
+                                 initial=0.0))
+
+print "// %i Snapshots, No Gas" % args.n
+print "   %-24s %10.2f ms %12.2e AU" % ("grid scan (0.01 AU)", \
+                                        t_ref * 1.0e3, dev_ref)
+print "   %-24s %10.2f ms %12.2e AU" % ("root finding", \
+                                        t_new * 1.0e3, dev_new)
+
+# Gas Mode: Count Disk Integrals
+if args.gas is not None:
+    rh.ph.s_and_t = count_calls(rh.ph.s_and_t)
+    tstart = time.time()
+    for ii in range(min(args.n, 10)):
+        rh.secular_resonances([ a_j[ii], a_s[ii] ], [ m_j, m_s ], \
+                              t_over_tau=args.gas)
+    nsnap = min(args.n, 10)
+    print ""
+    print "// Gas, t/tau = %.2f, %i Snapshots" % (args.gas, nsnap)
+    print "   %.1f s_and_t Calls, %.2f s per Snapshot" % \
+        (float(rh.ph.s_and_t.ncalls) / nsnap, \
+         ( time.time() - tstart ) / nsnap)
@@ -0,0 +1,60 @@
+"""
+Benchmark Gas Disk S/T Integrators.
+
+Compares the compiled integrator potential_helpers.s_and_t (f2py; build with
+make in Helpers/) with the NumPy port gas_helpers.s_and_tX on the same grids:
+time per planet location and largest relative deviation. Without the compiled
+module, only the NumPy timings are reported.
+
+Usage: python /path/bench_s_and_t.py -n 20
+"""
+
+import time
+import argparse
+import numpy as np
+import gas_helpers as gh
+
+# Compiled Module (Optional)
+try:
+    import potential_helpers as ph
+except ImportError:
+    ph = None
+
+
+###############################################################################
+# MAIN PROGRAM STARTS HERE
+###############################################################################
+
+# Parse Arguments
+parser = argparse.ArgumentParser()
+parser.add_argument('-n', type=int, default=20, \
+                    help='Number of Planet Locations')
+parser.add_argument('-t_over_tau', type=float, default=1.0, \
+                    help='Gas Decay (t/tau)')
+args = parser.parse_args()
+
+# Planet Locations (Both Sides of the Disk Edges)
+a_p = np.exp(np.random.RandomState(42).uniform(np.log(0.05), np.log(50.0), \
+                                               args.n))
+
+# NumPy
+tstart = time.time()
+s_np, t_np = gh.s_and_tX(a_p, args.t_over_tau)
+t_numpy = ( time.time() - tstart ) / args.n
+
+print "// %i Planet Locations in [0.05, 50] AU, t/tau = %.2f" % \
+    (args.n, args.t_over_tau)
+print "   %-10s %10.4f s per a_p" % ("numpy", t_numpy)
+
+# Compiled
+if ph is None:
+    print "   %-10s %10s" % ("f2py", "n/a (potential_helpers not built)")
+else:
+    s_f, t_f = np.zeros(args.n), np.zeros(args.n)
+    tstart = time.time()
+    for ia in range(args.n):
+        s_f[ia], t_f[ia] = ph.s_and_t(a_p[ia], args.t_over_tau)
+    t_f2py = ( time.time() - tstart ) / args.n
+    print "   %-10s %10.4f s per a_p" % ("f2py", t_f2py)
+    print "   max. rel. dev. S = %.2e, T = %.2e" % \
+        (np.max(np.abs(s_np / s_f - 1.0)), np.max(np.abs(t_np / t_f - 1.0)))
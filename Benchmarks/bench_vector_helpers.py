@@ -0,0 +1,117 @@
+"""
+Benchmark vector_helpers Backends (numba Ufuncs vs. numpy).
+
+Times cross/dot/norm on random vectors (with and without out= buffers)
+and read_output end to end on a synthetic snapshot (full elements, and
+a/e/i only, which runs through cart2aeX/cart2incX and hence vector_helpers),
+for every available backend. Sidecar caches are disabled, so parsing is
+included.
+
+Usage: python /path/bench_vector_helpers.py -n 1000000 -npart 100000
+"""
+
+import time
+import shutil
+import tempfile
+import argparse
+import numpy as np
+import io_helpers as ioh
+import vector_helpers as vh
+
+
+###############################################################################
+# FUNCTION DEFINITIONS
+###############################################################################
+
+def write_snapshot(fname, npart):
+    """
+    Write Synthetic Genga Output (22 Columns, Trailing Space).
+    Bound Orbits (|r| ~ 1-5, |v| ~ 0.3-1).
+    """
+
+    rng = np.random.RandomState(42)
+    data = rng.uniform(-5.0, 5.0, (npart, 21))
+    data[:,0] = 1.0e3
+    data[:,1] = np.arange(npart)
+    data[:,2] = np.abs(data[:,2]) * 1.0e-9
+    data[:,7:10] *= 0.1
+    data[:,10:19] = 0.0
+    data[:,19] = rng.randint(0, 10, npart)
+    data[:,20] = 0.0
+    fmt = [ "%.16e", "%i", "%.16e", "%.16e" ] + \
+          [ "%+.16e" ] * 6 + \
+          [ "%i" ] * 3 + [ "%.16e" ] * 4 + [ "%i" ] * 4
+    with open(fname, "w") as f:
+        np.savetxt(f, data, fmt=" ".join(fmt) + " ")
+
+def time_best(func, nrep):
+    """
+    Best-of-N Wall Clock Time.
+    """
+
+    tbest = np.inf
+    for irep in range(nrep):
+        tstart = time.time()
+        func()
+        tbest = min(tbest, time.time() - tstart)
+    return tbest
+
+
+###############################################################################
+# MAIN PROGRAM STARTS HERE
+###############################################################################
+
+# Parse Arguments
+parser = argparse.ArgumentParser()
+parser.add_argument('-n', type=int, default=1000000, \
+                    help='Number of Vectors (Primitives)')
+parser.add_argument('-npart', type=int, default=100000, \
+                    help='Number of Particles (read_output)')
+parser.add_argument('-nrep', type=int, default=5, \
+                    help='Number of Repetitions (Best Of)')
+args = parser.parse_args()
+
+# Data
+rng = np.random.RandomState(42)
+vecs = list(rng.randn(6, args.n))
+out = [ np.ones(args.n) for ii in range(3) ]
+tmpdir = tempfile.mkdtemp()
+fname = "%s/Out_bench_%012d.dat" % (tmpdir, 0)
+write_snapshot(fname, args.npart)
+
+# Loop Backends
+backends = [ "numba", "numpy" ] if vh.have_numba else [ "numpy" ]
+if not vh.have_numba:
+    print "!! numba Not Available, numpy Backend Only"
+print "// %i Vectors, %i Particles, Best of %i" % \
+    (args.n, args.npart, args.nrep)
+timings = {}
+for backend in backends:
+    vh.set_backend(backend)
+    benchmarks = [ [ "cross", lambda: vh.cross(*vecs) ], \
+                   [ "cross (out=)", lambda: vh.cross(*vecs, out=out) ], \
+                   [ "dot", lambda: vh.dot(*vecs) ], \
+                   [ "dot (out=)", lambda: vh.dot(*vecs, out=out[0]) ], \
+                   [ "norm", lambda: vh.norm(*vecs[:3]) ], \
+                   [ "read_output (all)", \
+                     lambda: ioh.read_output(fname, "heliocentric", \
+                                             cache=False) ], \
+                   [ "read_output (a,e,i)", \
+                     lambda: ioh.read_output(fname, "heliocentric", \
+                                             cache=False, \
+                                             elements=[ "a", "e", "i" ]) ] ]
+    print "** %s" % backend
+    for name, func in benchmarks:
+        func()
+        timings[backend, name] = time_best(func, args.nrep)
+        print "   %-24s %8.4f s" % (name, timings[backend, name])
+
+# Speedups
+if vh.have_numba:
+    print "** Speedup numba vs. numpy"
+    for name, _ in benchmarks:
+        print "   %-24s %8.2f x" % \
+            (name, timings["numpy", name] / timings["numba", name])
+
+# Clean Up
+shutil.rmtree(tmpdir)
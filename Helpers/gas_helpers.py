@@ -77,3 +77,152 @@ def get_volume_density_mmsn(r, z):
     # Return
     return rho
 
+
+
+# S/T Integrals: Disk Model and Constants of potential_helpers.f90
+st_pi = 3.14159265359
+st_G = 6.674e-8     # cm3/g/s2
+st_au = 1.49598e13  # cm
+st_sigma_0 = 2000.0 # g/cm2
+st_r_in = 0.1       # AU
+st_r_out = 35.0     # AU
+st_alpha = 1.0
+st_h_0 = 0.03358    # AU
+
+# S/T Integrals: Max. Grid Cells per Chunk
+_st_chunk = 2**16
+
+
+def _st_grid(ncells, widths, starts):
+    """
+    Cell-Centered Nested Grid (cf. potential_helpers.f90).
+
+    @param: ncells - Cells per Segment [List of Int]
+    @param: widths, starts - Segment Widths, Starts [Lists of Float/Arrays]
+    @return: x, dx - Cell Centers, Widths (Segments Concatenated on Last
+                     Axis) [Numpy Arrays]
+    """
+
+    x, dx = [], []
+    for ncell, width, start in zip(ncells, widths, starts):
+        width = np.asarray(width, dtype=np.float64)[...,np.newaxis]
+        start = np.asarray(start, dtype=np.float64)[...,np.newaxis]
+        icell = np.arange(1, ncell + 1) - 0.5
+        x.append(start + icell * width / ncell)
+        dx.append(np.ones_like(x[-1]) * width / ncell)
+    return np.concatenate(x, axis=-1), np.concatenate(dx, axis=-1)
+
+def _s_and_t_single(a_p):
+    """
+    S and T Integrals for One Planet Location (AU) at t/tau = 0.
+    """
+
+    # Conversions
+    r_in, r_out = st_r_in * st_au, st_r_out * st_au
+    a_p = a_p * st_au
+    h_0 = st_h_0 * st_au
+
+    # Radial Grid: Inner Disk, High-Res on Planet, Outer Disk
+    # Segments Vanish if the Planet Sits Beyond the Disk Edges
+    a_1, a_2 = 0.98 * a_p, 1.02 * a_p
+    ncells, widths, starts = [], [], []
+    if r_in < a_1:
+        ncells.append(100); widths.append(a_1 - r_in); starts.append(r_in)
+    if r_out > a_1 and r_in < a_2:
+        ncells.append(100); widths.append(a_2 - a_1); starts.append(a_1)
+    if r_out > a_2:
+        ncells.append(200); widths.append(r_out - a_2); starts.append(a_2)
+    r, dr = _st_grid(ncells, widths, starts)
+
+    # Surface Density, Scale Height (Vertically Isothermal)
+    sigma = st_sigma_0 * ( r / st_au )**(-st_alpha)
+    h = h_0 * ( r / st_au )**1.25
+
+    # Vertical Grid per Radius: 0 to 0.015 r, 0.015 r to 0.5 r
+    z_1 = 0.03 * 0.5 * r
+    z, dz = _st_grid([ 10, 100 ], [ z_1, 0.5 * r - z_1 ], [ 0.0, z_1 ])
+
+    # Azimuthal Grid: 0 to 0.03 pi, 0.03 pi to pi
+    p_1 = 0.03 * st_pi
+    p, dp = _st_grid([ 10, 100 ], [ p_1, st_pi - p_1 ], [ 0.0, p_1 ])
+    cp = np.cos(p)
+
+    # Gas Density (Quarter Space, x4)
+    frho = 4.0 / np.sqrt(2.0 * st_pi) * dr * r * sigma / h
+    rho = frho[:,np.newaxis] * dz * \
+          np.exp(-0.5 * ( z / h[:,np.newaxis] )**2.0)
+
+    # Azimuthal Weights: Integrands are c32 (1, cp) and c52 (1, cp, cp^2)
+    w32 = np.column_stack([ dp, dp * cp ])
+    w52 = np.column_stack([ dp, dp * cp, dp * cp**2.0 ])
+
+    # Loop Radial Chunks
+    s, t = 0.0, 0.0
+    nchunk = max(1, _st_chunk // ( z.shape[1] * len(p) ))
+    for istart in range(0, len(r), nchunk):
+        sl = slice(istart, istart + nchunk)
+        rr, zz = r[sl,np.newaxis], z[sl]
+        rpa = rr / a_p
+
+        # c1 = |r - a|^2 / a^2; c32 = c1^-3/2, c52 = c1^-5/2
+        arz = ( 1.0 + rpa**2.0 + ( zz / a_p )**2.0 )[...,np.newaxis]
+        c1 = arz - ( 2.0 * rpa )[...,np.newaxis] * cp
+        c32 = np.sqrt(c1)
+        c32 *= c1
+        np.divide(1.0, c32, out=c32)
+        c52 = np.divide(c32, c1, out=c1)
+
+        # Azimuthal Sums (BLAS)
+        I32 = np.dot(c32, w32)
+        I52 = np.dot(c52, w52)
+
+        # Radial/Vertical Sums
+        rhoc = rho[sl]
+        s += np.sum(rhoc * ( - rpa * I32[...,1] + \
+                             3.0 * ( zz / a_p )**2.0 * I52[...,0] ))
+        t += np.sum(rhoc * ( - 3.0 * I32[...,0] + \
+                             2.0 * rpa * I32[...,1] + \
+                             3.0 * ( I52[...,0] - \
+                                     2.0 * rpa * I52[...,1] + \
+                                     rpa**2.0 * I52[...,2] ) ))
+
+    # Return
+    return -0.25 * st_G * s / a_p, 0.25 * st_G * t / a_p
+
+def s_and_tX(a_p, time):
+    """
+    Integrate the S and T Terms of the Gas Disk Potential (NumPy).
+
+    Same disk (Morishima+ 2010) and nested radial/vertical/azimuthal grids as
+    potential_helpers.s_and_t (potential_helpers.f90), for arrays of planet
+    locations and times. The azimuthal sums of each radial chunk are matrix
+    products; S and T scale with the surface density, so each unique a_p is
+    integrated once at time 0 and multiplied by exp(-time).
+
+    Cf. Nagasawa+ (2000), Appendix, Eq. (A3)
+        http://adsabs.harvard.edu/abs/2000AJ....119.1480N
+    Cf. Morishima+ (2010), Section 2.2
+        http://adsabs.harvard.edu/abs/2010Icar..207..517M
+
+    @param: a_p - Planet Location(s) (AU) [Float or Array]
+    @param: time - Decay Time(s) (Units of Tau) [Float or Array]
+    @return: s, t - S and T (CGS), Broadcast Shape of a_p, time
+                    [Numpy Arrays]
+    """
+
+    # Broadcast
+    a_p, time = np.broadcast_arrays(np.asarray(a_p, dtype=np.float64), \
+                                    np.asarray(time, dtype=np.float64))
+
+    # Integrate Unique Locations
+    a_unique, inverse = np.unique(a_p, return_inverse=True)
+    st = np.array([ _s_and_t_single(a_loc) for a_loc in a_unique ])
+    st = st.reshape(len(a_unique), 2)
+
+    # Decay Gas
+    decay = np.exp(-time)
+    s = st[inverse,0].reshape(a_p.shape) * decay
+    t = st[inverse,1].reshape(a_p.shape) * decay
+
+    # Return
+    return s, t
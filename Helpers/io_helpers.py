@@ -2,61 +2,267 @@
 I/O Helpers. Mostly to read Genga files.
 """
 
+import os
+import glob
 import numpy as np
 import pandas as pd
 import kepler_helpers as kh
 import constants as C
 import vector_helpers as vh
 import collision_helpers as ch
+import multiprocessing as mp
 import time
 
-# Single Genga Output
-def read_output(fname, frame):
-    names_cols = [ "time", "pid", "mass", "radius", \
+# Genga Output Format (Out_*.dat)
+names_cols_out = [ "time", "pid", "mass", "radius", \
                    "x", "y", "z", \
                    "vx", "vy", "vz", \
                    "Sx", "Sy", "Sz", \
                    "amin", "amax", "emin", "emax", \
                    "aecount", "aecountT", "enccount", \
                    "test", "X" ]
-    touse_cols = [ 0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 19 ]
-    types_cols = { "pid": np.int32 }
+touse_cols_out = [ 0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 19 ]
+names_elements = [ "a", "e", "i", "Omega", "omega", "M", "Q", "q" ]
+types_cols_out = { "pid": np.int32, \
+                   "time": np.float64, "mass": np.float64, \
+                   "radius": np.float64, \
+                   "x": np.float64, "y": np.float64, "z": np.float64, \
+                   "vx": np.float64, "vy": np.float64, "vz": np.float64 }
+
+def _read_genga_table(fname, names_cols, touse_cols, types_cols):
+    """
+    Parse a Space-Separated Genga File with a Fixed Column Layout.
+
+    Uses the pandas C tokenizer (the fastest parser we have measured for
+    these files) with the known layout. Passing explicit types skips type
+    inference; Genga never writes NaN markers, so NaN detection is skipped.
+
+    @param: fname - Genga File [String]
+    @param: names_cols - All Column Names [List of Strings]
+    @param: touse_cols - Indices of Columns to Load [List of Integers]
+    @param: types_cols - Column Types [Dict]
+    @return: df - Loaded Columns [Pandas Dataframe]
+    @raises: IOError - If the file does not exist
+    """
+
+    return pd.read_csv(fname, \
+                       sep=" ", \
+                       header=None, \
+                       names=names_cols, dtype=types_cols, \
+                       usecols=touse_cols, \
+                       na_filter=False)
+
+def parse_output(fname):
+    """
+    Parse Raw Columns of a Genga Output into Contiguous Arrays.
+
+    @param: fname - Genga Output File [String]
+    @return: cols - Column Name => Contiguous Array [Dict of Numpy Arrays]
+    @raises: IOError - If the output does not exist
+    """
+
+    df = _read_genga_table(fname, names_cols_out, touse_cols_out, \
+                           types_cols_out)
+    cols = {}
+    for icol in touse_cols_out:
+        col = names_cols_out[icol]
+        cols[col] = np.ascontiguousarray(df[col].values)
+    return cols
+
+# Sidecar Cache for Parsed Outputs (Subdirectory of Run Directory)
+cache_dirname = ".g3cache"
+
+def output_cache_fname(fname):
+    """
+    Return Sidecar Cache Filename for a Genga Output.
+
+    The cache is keyed on file size and modification time. If the output is
+    rewritten, the key changes and the old sidecar is considered stale.
+
+    @param: fname - Genga Output File [String]
+    @return: cname - Sidecar Cache File (.npy) [String]
+    """
+
+    st = os.stat(fname)
+    cdir = os.path.join(os.path.dirname(fname), cache_dirname)
+    cname = "%s.%i_%i.npy" % (os.path.basename(fname), \
+                              st.st_size, int(st.st_mtime * 1.0e6))
+    return os.path.join(cdir, cname)
+
+def _write_output_cache(fname, cname, df):
+    """
+    Write Sidecar Cache. Atomic Rename, Remove Stale Sidecars.
+    Fails silently (e.g. read-only run directories).
+    """
+
+    try:
+        cdir = os.path.dirname(cname)
+        if not os.path.isdir(cdir):
+            os.makedirs(cdir)
+        ctmp = "%s.%i.tmp.npy" % (cname[:-4], os.getpid())
+        np.save(ctmp, df.to_records(index=False))
+        os.rename(ctmp, cname)
+        for cstale in glob.glob("%s/%s.*.npy" % \
+                                (cdir, os.path.basename(fname))):
+            if not (cstale == cname or cstale.endswith(".tmp.npy")):
+                os.remove(cstale)
+    except (IOError, OSError):
+        pass
+
+def _read_output_raw(fname, cache=True):
+    """
+    Load Raw Columns of a Single Genga Output.
+
+    If cache is set, a binary sidecar is used (and built on first read), so
+    later reads of the same snapshot skip the text parsing altogether.
+
+    @param: fname - Genga Output File [String]
+    @param: cache - Use/Maintain Sidecar Cache [Bool]
+    @return: df - Raw Columns (touse_cols_out) [Pandas Dataframe]
+    @raises: IOError - If the output does not exist
+    """
+
+    # Cache Hit?
+    if cache:
+        try:
+            cname = output_cache_fname(fname)
+        except OSError:
+            raise IOError("File Not Found: %s" % fname)
+        if os.path.isfile(cname):
+            try:
+                data = np.load(cname, mmap_mode="r")
+                cols = [ names_cols_out[icol] for icol in touse_cols_out ]
+                return pd.DataFrame(dict((col, data[col]) for col in cols), \
+                                    columns=cols)
+            except (IOError, ValueError):
+                pass
+
+    # Load CSV
+    df = _read_genga_table(fname, names_cols_out, touse_cols_out, \
+                           types_cols_out)
+
+    # Populate Cache
+    if cache:
+        _write_output_cache(fname, cname, df)
+
+    # Return
+    return df
+
+def _warm_output_cache_worker(fname):
+    """
+    Cache Warming Worker. Returns Nothing Heavy (Pickling Overhead).
+    """
+
+    _read_output_raw(fname, cache=True)
+    return fname
+
+def warm_output_cache(cdir, nprocs=1):
+    """
+    Build Sidecar Caches for all Genga Outputs in a Run Directory.
+    Existing, up-to-date sidecars are kept.
+
+    @param: cdir - Run Directory [String]
+    @param: nprocs - Number of Processes [Integer]
+    @return: nfiles - Number of Outputs Processed [Integer]
+    """
+
+    globs = sorted(glob.glob("%s/Out_*.dat" % cdir))
+    if nprocs == 1:
+        for fname in globs:
+            _warm_output_cache_worker(fname)
+    else:
+        pool = mp.Pool(processes=nprocs)
+        pool.map(_warm_output_cache_worker, globs)
+        pool.close()
+        pool.join()
+    return len(globs)
+
+def _check_frame(frame):
+    """
+    User must pick reference frame.
+    Genga outputs are heliocentric by default.
+    """
 
-    # User must pick reference frame
-    # Genga outputs are heliocentric by default
     if not frame in [ "barycentric", "heliocentric" ]:
         estring = "Must Select Heliocentric/Barycentric Frame"
         raise Exception(estring)
 
-    # Load CSV
-    try:
-        df = pd.read_csv(fname, \
-                         sep=" ", \
-                         header=None, \
-                         names=names_cols, dtype=types_cols, \
-                         usecols=touse_cols)
-    except IOError:
-         raise Exception("File Not Found: %s" % fname)
+def nstep_from_fname(fname):
+    """
+    In : /some/dir/Out_run_03_000156000000.dat
+    Out: 156000000
+    """
 
-    # Remove Ghost Particles (Negative Masses)
-    df = df[df.mass>=0.0]
+    return int(fname.split('/')[-1][:-4].split('_')[-1])
+
+def _check_elements(elements):
+    """
+    Validate Requested Orbital Elements. None Means All.
+    """
+
+    if elements is None:
+        return list(names_elements)
+    for element in elements:
+        if not element in names_elements:
+            raise Exception("Unknown Orbital Element: %s" % element)
+    return [ element for element in names_elements if element in elements ]
+
+def _compute_elements(df, frame, elements=None):
+    """
+    Remove Ghost Particles, Compute Orbital Elements, Fix Mass.
+
+    Only the requested elements are computed. Skipping the angles (Omega,
+    omega, M) avoids the expensive part of cart2kepX; an empty list skips
+    the frame conversion and element computation altogether.
 
-    # Convenience
-    x = np.asarray(df.x); y = np.asarray(df.y); z = np.asarray(df.z)
-    vx = np.asarray(df.vx); vy = np.asarray(df.vy); vz = np.asarray(df.vz)
-    m = np.asarray(df.mass)
+    @param: df - Raw Columns (One or More Snapshots) [Pandas Dataframe]
+    @param: frame - "heliocentric" or "barycentric" [String]
+    @param: elements - Elements to Compute (None = All) [List of Strings]
+    @return: df - Dataframe w/ Elements [Pandas Dataframe]
+    """
 
-    # Barycentric Coordinates
-    if frame == "barycentric":
-        x, vx = kh.helio2bary(x, vx, m)
-        y, vy = kh.helio2bary(y, vy, m)
-        z, vz = kh.helio2bary(z, vz, m)
+    # Requested Elements
+    elements = _check_elements(elements)
 
-    # Compute Orbital Elements
-    df["a"], df["e"], df["i"], df["Omega"], df["omega"], df["M"] = \
-        kh.cart2kepX(x, y, z, vx, vy, vz, m)
-    df["Q"] = df["a"] * ( 1 + df["e"] )
-    df["q"] = df["a"] * ( 1 - df["e"] )
+    # Remove Ghost Particles (Negative Masses)
+    df = df[df.mass>=0.0]
+
+    # Anything to Compute?
+    if len(elements) > 0:
+
+        # Convenience
+        x = np.asarray(df.x); y = np.asarray(df.y); z = np.asarray(df.z)
+        vx = np.asarray(df.vx); vy = np.asarray(df.vy); vz = np.asarray(df.vz)
+        m = np.asarray(df.mass)
+
+        # Barycentric Coordinates (One Barycentre per Run and Snapshot)
+        if frame == "barycentric":
+            keys = [ np.asarray(df[col]) for col in [ "ifname", "nstep" ] \
+                     if col in df.columns ]
+            x, y, z, vx, vy, vz = \
+                kh.helio2baryX(x, y, z, vx, vy, vz, m, \
+                               keys=keys if len(keys) > 0 else None)
+
+        # Compute Orbital Elements
+        kep = {}
+        if len(set(elements) & set([ "Omega", "omega", "M" ])) > 0:
+            kep["a"], kep["e"], kep["i"], \
+                kep["Omega"], kep["omega"], kep["M"], \
+                kep["q"], kep["Q"] = \
+                kh.cart2kepqQX(x, y, z, vx, vy, vz, m)
+        else:
+            if len(set(elements) & set([ "a", "e", "Q", "q" ])) > 0:
+                kep["a"], kep["e"] = kh.cart2aeX(x, y, z, vx, vy, vz, m)
+            if "i" in elements:
+                kep["i"] = kh.cart2incX(x, y, z, vx, vy, vz)
+            if "Q" in elements:
+                kep["Q"] = kep["a"] * ( 1 + kep["e"] )
+            if "q" in elements:
+                kep["q"] = kep["a"] * ( 1 - kep["e"] )
+
+        # Write Requested Elements
+        for element in elements:
+            df[element] = kep[element]
 
     # Fix Mass
     df.mass *= C.msun/C.mearth
@@ -64,41 +270,185 @@ def read_output(fname, frame):
     # Return
     return df
 
-# Stack Multiple Genga Outputs, Remove Duplicate IDs
-# fnames = [ fname01, fname02, ... ]
-def read_output_and_stack(fnames, frame, drop_duplicates=True, nofail=False):
-    names_cols = [ "time", "pid", "mass", "radius", \
-                   "x", "y", "z", \
-                   "vx", "vy", "vz", \
-                   "Sx", "Sy", "Sz", \
-                   "amin", "amax", "emin", "emax", \
-                   "aecount", "aecountT", "enccount", \
-                   "test", "X" ]
-    touse_cols = [ 0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 19 ]
-    types_cols = { "pid": np.int32 }
+# Storage Schemas (Column Projection, Downcasting)
+# columns: Columns to Keep (None = All), types: Column => Storage Type
+# full    - Everything, as Computed
+# compact - Everything, float32 Radii/Positions/Velocities/Elements
+# minimal - Only time, pid, mass, a, e, i, ifname, nstep (float32 a, e, i)
+# Time and mass stay float64 (nstep/time matching, mass cutoffs and sums).
+# ifname/nstep are stored as integers.
+_types_compact = dict([ [ col, np.float32 ] \
+                        for col in [ "radius", "x", "y", "z", \
+                                     "vx", "vy", "vz" ] + names_elements ])
+_types_compact.update({ "ifname": np.int32, "nstep": np.int64 })
+schemas = { "full": { "columns": None, \
+                      "types": {} }, \
+            "compact": { "columns": None, \
+                         "types": _types_compact }, \
+            "minimal": { "columns": [ "time", "pid", "mass", \
+                                      "a", "e", "i", "ifname", "nstep" ], \
+                         "types": { "a": np.float32, "e": np.float32, \
+                                    "i": np.float32, "ifname": np.int32, \
+                                    "nstep": np.int64 } } }
+
+def _get_schema(schema):
+    """
+    Look Up Schema by Name. Dicts (Same Keys) are Passed Through.
+    """
+
+    if isinstance(schema, dict):
+        return schema
+    if not schema in schemas:
+        raise Exception("Unknown Schema: %s" % schema)
+    return schemas[schema]
+
+def apply_schema(df, schema):
+    """
+    Project and Downcast Columns According to a Schema.
+    Columns named in the schema, but absent from df, are ignored.
+
+    @param: df - Coordinates/Elements [Pandas Dataframe]
+    @param: schema - Schema Name (Cf. schemas) or Dict (None = No-Op) [String]
+    @return: df - Projected/Downcast Copy [Pandas Dataframe]
+    """
+
+    if schema is None:
+        return df
+    schema = _get_schema(schema)
+
+    # Project
+    if schema["columns"] is not None:
+        df = df[[ col for col in df.columns if col in schema["columns"] ]]
+
+    # Downcast
+    types = dict([ [ col, dtype ] for col, dtype in schema["types"].items() \
+                   if col in df.columns ])
+    return df.astype(types)
+
+def schema_report(df, schema, report=None):
+    """
+    Report Bytes Saved and Error Introduced by a Schema, per Column.
+    Pass the previous report to accumulate over snapshots (bytes are summed,
+    errors are maximised).
+
+    @param: df - Coordinates/Elements (Before apply_schema) [Pandas Dataframe]
+    @param: schema - Schema Name (Cf. schemas) or Dict [String]
+    @param: report - Previous Report [Pandas Dataframe]
+    @return: report - Bytes In/Out, Max. Abs./Rel. Error [Pandas Dataframe]
+    """
+
+    dfs = apply_schema(df, schema)
+    rows = []
+    for col in df.columns:
+        x = np.asarray(df[col])
+        if col in dfs.columns:
+            xs = np.asarray(dfs[col])
+            nbytes_out = xs.nbytes
+            if len(x) > 0 and x.dtype.kind == "f":
+                dx = np.abs(xs.astype(x.dtype) - x)
+                ax = np.abs(x)
+                abs_err = np.max(dx)
+                rel_err = np.max(dx[ax > 0] / ax[ax > 0]) \
+                    if np.any(ax > 0) else 0.0
+            else:
+                abs_err, rel_err = 0.0, 0.0
+        else:
+            nbytes_out = 0
+            abs_err, rel_err = np.nan, np.nan
+        rows.append([ col, x.nbytes, nbytes_out, abs_err, rel_err ])
+    df_report = pd.DataFrame(rows, columns=[ "column", "bytes_in", \
+                                             "bytes_out", "abs_err", \
+                                             "rel_err" ])
+    df_report.set_index("column", inplace=True)
+
+    # Accumulate
+    if report is not None:
+        df_report[["bytes_in", "bytes_out"]] += \
+            report[["bytes_in", "bytes_out"]]
+        df_report["abs_err"] = np.fmax(df_report.abs_err, report.abs_err)
+        df_report["rel_err"] = np.fmax(df_report.rel_err, report.rel_err)
+
+    # Return
+    return df_report
+
+# Single Genga Output
+def read_output(fname, frame, cache=True, elements=None):
 
     # User must pick reference frame
-    # Genga outputs are heliocentric by default
-    if not frame in [ "barycentric", "heliocentric" ]:
-        estring = "Must Select Heliocentric/Barycentric Frame"
-        raise Exception(estring)
+    _check_frame(frame)
+
+    # Load CSV (Or Sidecar Cache)
+    try:
+        df = _read_output_raw(fname, cache=cache)
+    except IOError:
+         raise Exception("File Not Found: %s" % fname)
+
+    # Compute Elements, Return
+    return _compute_elements(df, frame, elements=elements)
+
+def _iterate_output_raw(fnames, nofail=False, cache=True):
+    """
+    Generator over Raw Columns of Multiple Genga Outputs.
+    Tags each snapshot with its position in fnames (ifname) and nstep.
+
+    @param: fnames - List of Genga Output Files [List of Strings]
+    @param: nofail - Skip Missing Files [Bool]
+    @param: cache - Use/Maintain Sidecar Cache [Bool]
+    @yield: dfx - Raw Columns + ifname/nstep (One Snapshot) [Pandas Dataframe]
+    """
 
-    # Load CSV
-    df = pd.DataFrame()
     for ifname, fname in enumerate(fnames):
         try:
-            dfx = pd.read_csv(fname, \
-                              sep=" ", \
-                              header=None, \
-                              names=names_cols, dtype=types_cols, \
-                              usecols=touse_cols)
-            dfx['ifname'] = \
-                pd.DataFrame({'ifname': np.ones(len(dfx)) * ifname})
-            dfx['nstep'] = int(fname.split('/')[-1][:-4].split('_')[-1])
-            df = df.append(dfx)
+            dfx = _read_output_raw(fname, cache=cache)
         except IOError:
             if not nofail:
                 raise Exception("File Not Found: %s" % fname)
+            continue
+        dfx['ifname'] = np.ones(len(dfx)) * ifname
+        dfx['nstep'] = nstep_from_fname(fname)
+        yield dfx
+
+# Iterate Multiple Genga Outputs, One Snapshot at a Time
+# fnames = [ fname01, fname02, ... ]
+def iterate_output(fnames, frame, nofail=False, cache=True, elements=None, \
+                   schema=None):
+    """
+    Generator Version of read_output_and_stack. Memory stays bounded by the
+    largest snapshot, regardless of the number of files.
+
+    @param: fnames - List of Genga Output Files [List of Strings]
+    @param: frame - "heliocentric" or "barycentric" [String]
+    @param: nofail - Skip Missing Files [Bool]
+    @param: cache - Use/Maintain Sidecar Cache [Bool]
+    @param: elements - Elements to Compute (None = All) [List of Strings]
+    @param: schema - Storage Schema (None = Keep All) [String]
+    @yield: df - One Snapshot w/ Elements, ifname, nstep [Pandas Dataframe]
+    """
+
+    # User must pick reference frame
+    _check_frame(frame)
+
+    for dfx in _iterate_output_raw(fnames, nofail=nofail, cache=cache):
+        yield apply_schema(_compute_elements(dfx, frame, elements=elements), \
+                           schema)
+
+# Stack Multiple Genga Outputs, Remove Duplicate IDs
+# fnames = [ fname01, fname02, ... ]
+def read_output_and_stack(fnames, frame, drop_duplicates=True, nofail=False, \
+                          cache=True, elements=None, schema=None):
+
+    # User must pick reference frame
+    _check_frame(frame)
+
+    # Load CSV (Or Sidecar Cache), Concatenate Once
+    dfs = list(_iterate_output_raw(fnames, nofail=nofail, cache=cache))
+    if len(dfs) > 0:
+        df = pd.concat(dfs)
+    else:
+        cols = [ names_cols_out[icol] for icol in touse_cols_out ]
+        df = pd.DataFrame(columns=cols + [ "ifname", "nstep" ], \
+                          dtype=np.float64)
+    del dfs
 
     # Drop Duplicate Indices
     # http://stackoverflow.com/questions/13035764/remove-rows-with-duplicate-indices-pandas-dataframe-and-timeseries
@@ -108,32 +458,243 @@ def read_output_and_stack(fnames, frame, drop_duplicates=True, nofail=False):
     # Reindex (Relevant if we load multiple snapshots into one file)
     df.reset_index(drop=True, inplace=True)
 
-    # Remove Ghost Particles (Negative Masses)
-    df = df[df.mass>=0.0]
+    # Compute Elements, Apply Schema, Return
+    return apply_schema(_compute_elements(df, frame, elements=elements), \
+                        schema)
 
-    # Convenience
-    x = np.asarray(df.x); y = np.asarray(df.y); z = np.asarray(df.z)
-    vx = np.asarray(df.vx); vy = np.asarray(df.vy); vz = np.asarray(df.vz)
-    m = np.asarray(df.mass)
+def _read_output_worker(task):
+    """
+    Parallel Loader Worker. Parse One Output, Compute Elements.
 
-    # Barycentric Coordinates
-    if frame == "barycentric":
-        x, vx = kh.helio2bary(x, vx, m)
-        y, vy = kh.helio2bary(y, vy, m)
-        z, vz = kh.helio2bary(z, vz, m)
+    @param: task - [ ifname, fname, frame, nofail, cache, elements,
+                     schema ] [List]
+    @return: df - One Snapshot w/ Elements (None if Skipped) [Dataframe]
+    """
 
-    # Compute Orbital Elements
-    df["a"], df["e"], df["i"], df["Omega"], df["omega"], df["M"] = \
-        kh.cart2kepX(x, y, z, vx, vy, vz, m)
-    df["Q"] = df["a"] * ( 1 + df["e"] )
-    df["q"] = df["a"] * ( 1 - df["e"] )
+    ifname, fname, frame, nofail, cache, elements, schema = task
+    try:
+        dfx = _read_output_raw(fname, cache=cache)
+    except IOError:
+        if not nofail:
+            raise Exception("File Not Found: %s" % fname)
+        return None
+    dfx['ifname'] = np.ones(len(dfx)) * ifname
+    dfx['nstep'] = nstep_from_fname(fname)
+    return apply_schema(_compute_elements(dfx, frame, elements=elements), \
+                        schema)
 
-    # Fix Mass
-    df.mass *= C.msun/C.mearth
+# Load Multiple Genga Outputs on a Pool of Processes
+# fnames = [ fname01, fname02, ... ]
+def read_output_parallel(fnames, frame, nprocs=1, nofail=False, \
+                         cache=True, stack=True, elements=None, schema=None):
+    """
+    Parse Outputs and Compute Elements on a Pool of Processes.
+    Degrades to a serial loop for nprocs=1.
+
+    Results are returned in nstep order. Barycentric offsets are computed
+    for each snapshot separately.
+
+    NB: Cannot be called from within a multiprocessing worker (daemonic
+        processes cannot have children).
+
+    @param: fnames - List of Genga Output Files [List of Strings]
+    @param: frame - "heliocentric" or "barycentric" [String]
+    @param: nprocs - Number of Processes [Integer]
+    @param: nofail - Skip Missing Files [Bool]
+    @param: cache - Use/Maintain Sidecar Cache [Bool]
+    @param: stack - Concatenate Snapshots [Bool]
+    @param: elements - Elements to Compute (None = All) [List of Strings]
+    @param: schema - Storage Schema (None = Keep All) [String]
+    @return: df - Stacked Snapshots [Pandas Dataframe] (stack=True)
+             dfs - Snapshots [List of Pandas Dataframes] (stack=False)
+    """
+
+    # User must pick reference frame
+    _check_frame(frame)
+
+    # Tasks, Sorted by Step (Stable)
+    tasks = []
+    for ifname, fname in enumerate(fnames):
+        tasks.append([ ifname, fname, frame, nofail, cache, elements, \
+                       schema ])
+    tasks = sorted(tasks, key=lambda task: nstep_from_fname(task[1]))
+
+    # Serial or Parallel
+    if nprocs == 1:
+        dfs = [ _read_output_worker(task) for task in tasks ]
+    else:
+        pool = mp.Pool(processes=nprocs)
+        dfs = pool.map(_read_output_worker, tasks, \
+                       max(1, len(tasks) // (4 * nprocs)))
+        pool.close()
+        pool.join()
+    dfs = [ dfx for dfx in dfs if dfx is not None ]
 
     # Return
+    if not stack:
+        return dfs
+    if len(dfs) > 0:
+        df = pd.concat(dfs)
+    else:
+        df = read_output_and_stack([], frame, elements=elements, \
+                                   schema=schema)
+    df.reset_index(drop=True, inplace=True)
     return df
 
+# Run Manifest (Index of Genga Outputs in a Run Directory)
+manifest_basename = "Manifest.hdf5"
+
+def _parse_output_fname(fname):
+    """
+    In : /some/dir/Out_run_03_000156000000.dat
+    Out: run_03, 156000000
+    """
+
+    basename = fname.strip().split("/")[-1][:-4]
+    return basename[4:-13], int(basename.split("_")[-1])
+
+def _scan_output(fname):
+    """
+    Scan a Genga Output without Parsing. Reads the time from the first line
+    and counts lines in binary chunks.
+
+    @param: fname - Genga Output File [String]
+    @return: time - Simulation Time [Float]
+    @return: npart - Number of Lines (Particles, incl. Ghosts) [Integer]
+    """
+
+    with open(fname, "rb") as f:
+        line = f.readline()
+        if len(line.strip()) > 0:
+            time = float(line.split()[0])
+        else:
+            time = np.nan
+        npart = 1 if line.endswith(b"\n") else 0
+        while True:
+            chunk = f.read(1024 * 1024)
+            if not chunk:
+                break
+            npart += chunk.count(b"\n")
+    return time, npart
+
+def manifest_fname(cdir):
+    """
+    Return Persisted Manifest Filename for a Run Directory.
+    """
+
+    return os.path.join(cdir, cache_dirname, manifest_basename)
+
+def build_manifest(cdir, save=True):
+    """
+    Scan a Run Directory, Build Index of Genga Outputs.
+
+    An existing manifest is updated in place. Only outputs that are new or
+    changed (size, modification time) are scanned.
+
+    Columns: run_name, fname (basename), time, npart, size (bytes), mtime.
+    Index: nstep (sorted).
+
+    @param: cdir - Run Directory [String]
+    @param: save - Persist Manifest (.g3cache/Manifest.hdf5) [Bool]
+    @return: dfm - Manifest [Pandas Dataframe]
+    """
+
+    # Previous Manifest
+    mname = manifest_fname(cdir)
+    if os.path.isfile(mname):
+        dfm_old = pd.read_hdf(mname, "df")
+    else:
+        dfm_old = None
+
+    # Scan
+    rows = []
+    for fname in glob.glob("%s/Out_*.dat" % cdir):
+        run_name, nstep = _parse_output_fname(fname)
+        st = os.stat(fname)
+        mtime = int(st.st_mtime * 1.0e6)
+        if dfm_old is not None and nstep in dfm_old.index and \
+            dfm_old.loc[nstep, "size"] == st.st_size and \
+            dfm_old.loc[nstep, "mtime"] == mtime:
+            time = dfm_old.loc[nstep, "time"]
+            npart = dfm_old.loc[nstep, "npart"]
+        else:
+            time, npart = _scan_output(fname)
+        rows.append([ nstep, run_name, os.path.basename(fname), \
+                      time, npart, st.st_size, mtime ])
+
+    # Build Dataframe
+    cols = [ "nstep", "run_name", "fname", "time", "npart", "size", "mtime" ]
+    dfm = pd.DataFrame(rows, columns=cols)
+    dfm = dfm.astype({ "nstep": np.int64, "time": np.float64, \
+                       "npart": np.int64, "size": np.int64, \
+                       "mtime": np.int64 })
+    dfm.sort_values(by="nstep", inplace=True)
+    dfm.set_index("nstep", inplace=True)
+
+    # Save
+    if save:
+        try:
+            if not os.path.isdir(os.path.dirname(mname)):
+                os.makedirs(os.path.dirname(mname))
+            with pd.HDFStore(mname, "w") as store:
+                store["df"] = dfm
+        except (IOError, OSError):
+            pass
+
+    # Return
+    return dfm
+
+def load_manifest(cdir, refresh=False):
+    """
+    Load Persisted Manifest of a Run Directory. Build if Missing.
+
+    @param: cdir - Run Directory [String]
+    @param: refresh - Rescan Directory for New/Changed Outputs [Bool]
+    @return: dfm - Manifest [Pandas Dataframe]
+    """
+
+    mname = manifest_fname(cdir)
+    if refresh or not os.path.isfile(mname):
+        dfm = build_manifest(cdir)
+    else:
+        dfm = pd.read_hdf(mname, "df")
+    if len(dfm) == 0:
+        raise Exception("No Outputs Found: %s" % cdir)
+    return dfm
+
+def manifest_lookup_nstep(dfm, cdir, nstep):
+    """
+    Return Filename of Output for a Given Step. Hash Lookup.
+
+    @param: dfm - Manifest [Pandas Dataframe]
+    @param: cdir - Run Directory [String]
+    @param: nstep - Step [Integer]
+    @return: fname - Genga Output File [String]
+    """
+
+    try:
+        return os.path.join(cdir, dfm.at[nstep, "fname"])
+    except KeyError:
+        raise Exception("Output Not Found: %s (Step %012d)" % (cdir, nstep))
+
+def manifest_lookup_time(dfm, time):
+    """
+    Return Step of Output Closest to a Given Simulation Time.
+    Binary Search (Outputs are Sorted in Time).
+
+    @param: dfm - Manifest [Pandas Dataframe]
+    @param: time - Simulation Time [Float]
+    @return: nstep - Step [Integer]
+    """
+
+    times = dfm["time"].values
+    itime = np.searchsorted(times, time)
+    if itime == len(times):
+        itime -= 1
+    elif itime > 0 and (time - times[itime-1]) <= (times[itime] - time):
+        itime -= 1
+    return dfm.index[itime]
+
 # Stack Collision Files For Multiple Genga Outputs
 # fnames = [ fname01, fname02, ... ]
 def read_collisions_and_stack(fnames, \
@@ -166,20 +727,18 @@ def read_collisions_and_stack(fnames, \
                        13, 14 ]
     types_cols = { "pidi": np.int32, "pidj": np.int32 }
 
-    # Load CSV
-    df = pd.DataFrame()
+    # Load CSV, Concatenate Once
+    dfs = []
     for ifname, fname in enumerate(fnames):
         try:
-            dfx = pd.read_csv(fname, \
-                              sep=" ", \
-                              header=None, names=names_cols, \
-                              dtype=types_cols, \
-                              usecols=touse_cols)
-            dfx['ifname'] = \
-                pd.DataFrame({'ifname': np.ones(len(dfx)) * ifname})
-            df = df.append(dfx, ignore_index=True)
+            dfx = _read_genga_table(fname, names_cols, touse_cols, \
+                                    types_cols)
+            dfx['ifname'] = np.ones(len(dfx)) * ifname
+            dfs.append(dfx)
         except IOError:
             raise Exception("File Not Found: %s" % fname)
+    df = pd.concat(dfs, ignore_index=True)
+    del dfs
 
     # Fix Mass
     df.mi *= C.msun/C.mearth
@@ -242,24 +801,22 @@ def read_ejections_and_stack(fnames, return_xyz=False):
         touse_cols = [ 0, 1, 2, 13 ]
     types_cols = { "pid": np.int32, "case": np.int32 }
 
-    # Load CSV
-    df = pd.DataFrame()
+    # Load CSV, Concatenate Once
+    dfs = []
     for ifname, fname in enumerate(fnames):
         try:
-            dfx = pd.read_csv(fname, \
-                              sep=" ", \
-                              header=None, names=names_cols, \
-                              dtype=types_cols, \
-                              usecols=touse_cols)
-            dfx['ifname'] = \
-                pd.DataFrame({'ifname': np.ones(len(dfx)) * ifname})
+            dfx = _read_genga_table(fname, names_cols, touse_cols, \
+                                    types_cols)
+            dfx['ifname'] = np.ones(len(dfx)) * ifname
             if len(dfx) > 0:
-                df = df.append(dfx, ignore_index=True)
+                dfs.append(dfx)
         except IOError:
             raise Exception("File Not Found: %s" % fname)
 
     # Empty?
-    if len(df) == 0:
+    if len(dfs) > 0:
+        df = pd.concat(dfs, ignore_index=True)
+    else:
         df = pd.DataFrame({'time': [], \
                            'pid': [], 'm': [], 'case': [], \
                            'ifname': []})
@@ -4,6 +4,9 @@ Various Helper Function for Kepler Orbits.
 They usually break down for inc=0 and/or ecc=0.
 Might need to upgrade to Regular Equations some day
 cf. http://server.faia.upm.es/moda/curso1112/kepler.pdf
+
+The modified equinoctial conversions (cart2equX, equ2cartX, kep2equX,
+equ2kepX) are non-singular there.
 """
 
 import numpy as np
@@ -49,9 +52,143 @@ def bary2helio(r_b, v_b, m, return_barycenter=False, central_mass=1.0):
     else:
         return r, v
 
+def group_index(keys, n):
+    """
+    Integer Group Labels (0..ngroups-1) for Stacked Snapshots.
+
+    Rows sharing all keys (e.g. ifname and nstep) form one group. Labels
+    follow the sorted order of the keys.
+
+    @param: keys - Group Keys (None = One Group) [Array or List of Arrays]
+    @param: n - Number of Rows [Int]
+    @return: igroup - Group Label per Row [Numpy Int Array]
+    @return: ngroups - Number of Groups [Int]
+    """
+
+    # One Group
+    if keys is None:
+        return np.zeros(n, dtype=np.int64), 1
+    if not isinstance(keys, (list, tuple)):
+        keys = [ keys ]
+
+    # Combine Per-Key Labels (Mixed Radix), Relabel Densely
+    igroup = np.zeros(n, dtype=np.int64)
+    for key in keys:
+        _, ikey = np.unique(np.asarray(key), return_inverse=True)
+        igroup = igroup * ( ikey.max() + 1 if n > 0 else 1 ) + ikey
+    _, igroup = np.unique(igroup, return_inverse=True)
+    return igroup, ( igroup.max() + 1 if n > 0 else 0 )
+
+def group_sums(igroup, ngroups, cols):
+    """
+    Segmented Sum of Several Columns in One Reduction.
+
+    Stacked snapshots are usually contiguous, so the rows are only sorted
+    (stable) when they are not. The columns are reduced together with
+    np.add.reduceat.
+
+    @param: igroup - Group Label per Row (cf. group_index) [Numpy Int Array]
+    @param: ngroups - Number of Groups [Int]
+    @param: cols - Columns to Sum [List of Numpy Arrays]
+    @return: sums - Sums per Group (ngroups, len(cols)) [Numpy Array]
+    """
+
+    # Stack Columns
+    w = np.column_stack(cols)
+    if len(igroup) == 0:
+        return np.zeros((ngroups, w.shape[1]))
+
+    # Sort Rows (Only If Groups Are Not Contiguous and Ascending)
+    if np.any(igroup[1:] < igroup[:-1]):
+        order = np.argsort(igroup, kind="mergesort")
+        igroup = igroup[order]
+        w = w[order]
+
+    # Reduce Segments
+    istart = np.flatnonzero(np.r_[True, igroup[1:] != igroup[:-1]])
+    return np.add.reduceat(w, istart, axis=0)
+
+def helio2baryX(x, y, z, vx, vy, vz, m, keys=None, return_sun=False, \
+                central_mass=1.0):
+    """
+    Grouped, Vectorized Version of helio2bary (All Three Axes).
+
+    Stacked snapshots (e.g. from io_helpers.read_output_and_stack) each
+    get their own barycentre. Rows are grouped by keys, e.g.
+    [ df.ifname, df.nstep ]; keys=None treats everything as one snapshot
+    (like helio2bary).
+
+    @params
+    x, y, z, vx, vy, vz - Heliocentric Positions/Velocities
+    m - Particle Masses
+    keys - Group Keys (None = One Snapshot) [Array or List of Arrays]
+    return_sun - Also Return Barycentric Sun Position/Velocity per Row
+    central_mass - Mass of Central Object
+
+    @returns
+    x, y, z, vx, vy, vz - Barycentric Positions/Velocities
+    (sx, sy, sz, svx, svy, svz - Barycentric Sun per Row, If return_sun)
+    """
+
+    # Mass and Momentum Sums per Group
+    m = np.asarray(m)
+    igroup, ngroups = group_index(keys, len(m))
+    sums = group_sums(igroup, ngroups, \
+                      [ m, m * x, m * y, m * z, m * vx, m * vy, m * vz ])
+
+    # Barycentre Offsets per Group => Row
+    offsets = ( sums[:,1:] / ( sums[:,:1] + central_mass ) )[igroup]
+
+    # New Coordinates
+    out = [ np.asarray(col) - offsets[:,icol] for icol, col in \
+            enumerate([ x, y, z, vx, vy, vz ]) ]
+
+    if return_sun:
+        return out + [ -offsets[:,icol] for icol in range(6) ]
+    else:
+        return out
+
+def bary2helioX(x, y, z, vx, vy, vz, m, keys=None, return_barycenter=False, \
+                central_mass=1.0):
+    """
+    Grouped, Vectorized Version of bary2helio (All Three Axes).
+    Cf. helio2baryX.
+
+    @params
+    x, y, z, vx, vy, vz - Barycentric Positions/Velocities
+    m - Particle Masses
+    keys - Group Keys (None = One Snapshot) [Array or List of Arrays]
+    return_barycenter - Also Return Heliocentric Barycentre per Row
+    central_mass - Mass of Central Object
+
+    @returns
+    x, y, z, vx, vy, vz - Heliocentric Positions/Velocities
+    (bx, by, bz, bvx, bvy, bvz - Heliocentric Barycentre per Row,
+     If return_barycenter)
+    """
+
+    # Momentum Sums per Group
+    m = np.asarray(m)
+    igroup, ngroups = group_index(keys, len(m))
+    sums = group_sums(igroup, ngroups, \
+                      [ m * x, m * y, m * z, m * vx, m * vy, m * vz ])
+
+    # Heliocentre Offsets per Group => Row
+    offsets = ( - sums / central_mass )[igroup]
+
+    # New Coordinates
+    out = [ np.asarray(col) - offsets[:,icol] for icol, col in \
+            enumerate([ x, y, z, vx, vy, vz ]) ]
+
+    if return_barycenter:
+        return out + [ -offsets[:,icol] for icol in range(6) ]
+    else:
+        return out
+
 def cart2kepX(x, y, z, vx, vy, vz, mass, central_mass=1.0):
     """
     Vectorized version of cart2kep. Much love for many particles.
+    Wrapper around cart2kepqQX (which also returns q, Q).
 
     @params
     r - (x,y,z) Cartesian Positions
@@ -70,62 +207,391 @@ def cart2kepX(x, y, z, vx, vy, vz, mass, central_mass=1.0):
     Cf. http://www.bruce-shapiro.com/pair/ElementConversionRecipes.pdf
     """
 
+    return cart2kepqQX(x, y, z, vx, vy, vz, mass, \
+                       central_mass=central_mass)[:6]
+
+def cart2kepqQX(x, y, z, vx, vy, vz, mass, central_mass=1.0, out=None):
+    """
+    Cartesian to Keplerian Elements plus Peri-/Apocentre. Vectorized.
+
+    Single pass with a fixed set of work buffers: each dot/cross product is
+    computed once, angles come from arctan2 (no arccos + flip masks), and
+    the eccentric/hyperbolic anomaly comes straight from the state vector
+    (e cos E = 1 - r/a, e sin E = r.v / sqrt(mu a)).
+
+    Special cases (same pass)
+    inc=0 (Planar) - Omega = 0, omega Measured from the x-Axis
+    ecc=0 (Circular) - omega = 0, M = Argument of Latitude
+    ecc>1 (Hyperbolic) - M = ecc * sinh(H) - H (H<0 Before Pericentre)
+    Angles are in [0,2pi), except hyperbolic M.
+
+    @params
+    r - (x,y,z) Cartesian Positions
+    v - (vx,vy,vz) Cartesian Velocities
+    mass - Particle Mass
+    central_mass - Mass of Central Object
+    out - Output Arrays (a, ecc, inc, Omega, omega, M, q, Q) [List]
+
+    @returns
+    a - Semi-Major Axis
+    ecc - Eccentricity
+    inc - Inclination
+    Omega - Longitude of the Ascending Node
+    omega - Argument of Periapsis
+    M - Mean Anomaly at Epoch
+    q - Pericentre Distance, a * (1 - ecc)
+    Q - Apocentre Distance, a * (1 + ecc)
+    """
+
+    # Inputs, Outputs
+    x, y, z, vx, vy, vz = [ np.asarray(xx, dtype=np.float64) \
+                            for xx in [ x, y, z, vx, vy, vz ] ]
+    if out is None:
+        out = [ np.empty(x.shape, dtype=np.float64) for ii in range(8) ]
+    a, ecc, inc, Omega, omega, M, q, Q = out
+
+    # Gravitational Parameter
+    G = 1.0
+    mu = G * ( central_mass + np.asarray(mass, dtype=np.float64) )
+
+    # Work Buffers
+    hx, hy, hz, ex, ey, ez, r, rv, t1, t2 = \
+        [ np.empty(x.shape, dtype=np.float64) for ii in range(10) ]
+
+    # Angular Momentum Vector
+    np.multiply(y, vz, out=hx); hx -= np.multiply(z, vy, out=t1)
+    np.multiply(z, vx, out=hy); hy -= np.multiply(x, vz, out=t1)
+    np.multiply(x, vy, out=hz); hz -= np.multiply(y, vx, out=t1)
+
+    # Distance, Radial Velocity, Speed (t2)
+    np.multiply(x, x, out=r); r += np.multiply(y, y, out=t1)
+    r += np.multiply(z, z, out=t1); np.sqrt(r, out=r)
+    np.multiply(x, vx, out=rv); rv += np.multiply(y, vy, out=t1)
+    rv += np.multiply(z, vz, out=t1)
+    np.multiply(vx, vx, out=t2); t2 += np.multiply(vy, vy, out=t1)
+    t2 += np.multiply(vz, vz, out=t1)
+
+    # Laplace-Runge-Lenz Vector (v x h / mu - r / |r|)
+    # e = [ ( v^2 - mu / r ) r - ( r.v ) v ] / mu
+    np.divide(mu, r, out=t1); np.subtract(t2, t1, out=t2); t2 /= mu
+    np.divide(rv, mu, out=t1)
+    np.multiply(t2, x, out=ex); ex -= t1 * vx
+    np.multiply(t2, y, out=ey); ey -= t1 * vy
+    np.multiply(t2, z, out=ez); ez -= t1 * vz
+
+    # Scalar Eccentricity
+    np.multiply(ex, ex, out=ecc); ecc += np.multiply(ey, ey, out=t1)
+    ecc += np.multiply(ez, ez, out=t1); np.sqrt(ecc, out=ecc)
+
+    # Semi-Major Axis (t2 = h^2)
+    np.multiply(hx, hx, out=t2); t2 += np.multiply(hy, hy, out=t1)
+    t2 += np.multiply(hz, hz, out=t1)
+    np.multiply(ecc, ecc, out=t1); np.subtract(1.0, t1, out=t1); t1 *= mu
+    np.divide(t2, t1, out=a)
+
+    # Peri-/Apocentre
+    np.subtract(1.0, ecc, out=q); q *= a
+    np.add(1.0, ecc, out=Q); Q *= a
+
+    # Inclination (t2 = |h|, t1 = |n| = sqrt(hx^2 + hy^2))
+    np.sqrt(t2, out=t2)
+    np.multiply(hx, hx, out=t1); t1 += np.multiply(hy, hy, out=M)
+    np.sqrt(t1, out=t1)
+    np.arctan2(t1, hz, out=inc)
+    planar = t1 == 0.0
+
+    # Longitude of the Ascending Node (n = z x h = (-hy, hx, 0))
+    np.negative(hy, out=M)
+    np.arctan2(hx, M, out=Omega)
+    Omega[planar] = 0.0
+
+    # Argument of Perigee (cos ~ n.e, sin ~ |h| e_z)
+    np.multiply(M, ex, out=omega); omega += np.multiply(hx, ey, out=M)
+    np.multiply(t2, ez, out=M)
+    np.arctan2(M, omega, out=omega)
+    if np.any(planar):
+        omega[planar] = np.arctan2(ey[planar], ex[planar])
+
+    # Eccentric Anomaly (Elliptic, Circular)
+    # e cos E = 1 - r / a, e sin E = r.v / sqrt(mu a)
+    ell = ecc < 1.0
+    np.multiply(mu, np.abs(a, out=t1), out=t1); np.sqrt(t1, out=t1)
+    np.divide(rv, t1, out=t1)
+    np.divide(r, a, out=t2); np.subtract(1.0, t2, out=t2)
+    np.arctan2(t1, t2, out=M)
+    M -= t1
+
+    # Hyperbolic Anomaly (e sinh H = r.v / sqrt(-mu a))
+    hyp = ~ell
+    if np.any(hyp):
+        H = np.arcsinh(t1[hyp] / ecc[hyp])
+        M[hyp] = t1[hyp] - H
+
+    # Circular: Argument of Latitude (Angle from Node to r)
+    circ = ecc == 0.0
+    if np.any(circ):
+        omega[circ] = 0.0
+        hxc = hx[circ]; hyc = hy[circ]
+        hc = np.sqrt(hxc**2.0 + hyc**2.0 + hz[circ]**2.0)
+        M[circ] = np.where(planar[circ], \
+                           np.arctan2(y[circ], x[circ]), \
+                           np.arctan2(hc * z[circ], \
+                                      - hyc * x[circ] + hxc * y[circ]))
+
+    # Wrap Angles to [0,2pi)
+    for angle in [ Omega, omega ]:
+        np.mod(angle, 2.0 * np.pi, out=angle)
+    M[ell] = np.mod(M[ell], 2.0 * np.pi)
+
+    # Return Set
+    return a, ecc, inc, Omega, omega, M, q, Q
+
+def cart2aeX(x, y, z, vx, vy, vz, mass, central_mass=1.0):
+    """
+    Semi-Major Axis and Eccentricity Only. Vectorized.
+    Same recipe as cart2kepX, without the angles.
+
+    @params
+    r - (x,y,z) Cartesian Positions
+    v - (vx,vy,vz) Cartesian Velocities
+    mass - Particle Mass
+    central_mass - Mass of Central Object
+
+    @returns
+    a - Semi-Major Axis
+    ecc - Eccentricity
+    """
+
     # Gravitational Parameter
     G = 1.0
     mu = G * ( central_mass + mass )
 
+    # Work Buffers
+    x, y, z, vx, vy, vz = [ np.asarray(xx, dtype=np.float64) \
+                            for xx in [ x, y, z, vx, vy, vz ] ]
+    hx, hy, hz, tx, ty, tz, r = \
+        [ np.empty(x.shape, dtype=np.float64) for ii in range(7) ]
+
     # Angular Momentum Vector
-    hx, hy, hz = vh.cross(x, y, z, vx, vy, vz)
+    vh.cross(x, y, z, vx, vy, vz, out=[ hx, hy, hz ])
 
     # Laplace-Runge-Lenz Vector
     # Scalar Eccentricity
-    tmp_x, tmp_y, tmp_z = vh.cross(vx, vy, vz, hx, hy, hz)
-    r_norm = vh.norm(x, y, z)
-    lrl_x = tmp_x / mu - x / r_norm
-    lrl_y = tmp_y / mu - y / r_norm
-    lrl_z = tmp_z / mu - z / r_norm
-    ecc = vh.norm(lrl_x, lrl_y, lrl_z)
+    vh.cross(vx, vy, vz, hx, hy, hz, out=[ tx, ty, tz ])
+    vh.norm(x, y, z, out=r)
+    for tt, xx in [ [ tx, x ], [ ty, y ], [ tz, z ] ]:
+        tt /= mu
+        tt -= xx / r
+    ecc = vh.norm(tx, ty, tz)
 
     # Semi-Major Axis
-    a = vh.dot(hx, hy, hz, hx, hy, hz) / ( mu * ( 1.0 - ecc**2.0 ) )
+    a = vh.dot(hx, hy, hz, hx, hy, hz, out=r)
+    a /= mu * ( 1.0 - ecc**2.0 )
+
+    # Return Set
+    return a, ecc
+
+def cart2incX(x, y, z, vx, vy, vz):
+    """
+    Inclination Only. Vectorized.
+
+    @params
+    r - (x,y,z) Cartesian Positions
+    v - (vx,vy,vz) Cartesian Velocities
+
+    @returns
+    inc - Inclination
+    """
+
+    # Angular Momentum Vector
+    hx, hy, hz = vh.cross(x, y, z, vx, vy, vz)
 
     # Inclination
+    return np.arccos(hz / vh.norm(hx, hy, hz))
+
+def cart2equX(x, y, z, vx, vy, vz, mass, central_mass=1.0):
+    """
+    Cartesian to Modified Equinoctial Elements. Vectorized.
+    Non-singular for ecc=0 and inc=0 (only inc=pi is singular).
+
+    p = a (1 - ecc^2)
+    f, g = ecc cos(varpi), ecc sin(varpi); varpi = Omega + omega
+    h, k = tan(inc/2) cos(Omega), tan(inc/2) sin(Omega)
+    L = varpi + theta (True Longitude)
+
+    Cf. Walker et al. (1985), CeMDA 36, 409
+
+    @params
+    r - (x,y,z) Cartesian Positions
+    v - (vx,vy,vz) Cartesian Velocities
+    mass - Particle Mass
+    central_mass - Mass of Central Object
+
+    @returns
+    p, f, g, h, k, L - Modified Equinoctial Elements (L in [0,2pi))
+    """
+
+    # Gravitational Parameter
+    G = 1.0
+    mu = G * ( central_mass + mass )
+
+    # Angular Momentum, Semi-Latus Rectum
+    hx, hy, hz = vh.cross(x, y, z, vx, vy, vz)
     h_norm = vh.norm(hx, hy, hz)
-    inc = np.arccos(vh.dot(0.0, 0.0, 1.0, hx, hy, hz) / h_norm)
+    p = h_norm**2.0 / mu
+
+    # Node Vector Components
+    denom = h_norm + hz
+    h = -hy / denom
+    k = hx / denom
+
+    # Equinoctial Frame (f, g Unit Vectors)
+    s2 = 1.0 + h**2.0 + k**2.0
+    fx = ( 1.0 - k**2.0 + h**2.0 ) / s2
+    fy = 2.0 * k * h / s2
+    fz = -2.0 * k / s2
+    gx = 2.0 * k * h / s2
+    gy = ( 1.0 + k**2.0 - h**2.0 ) / s2
+    gz = 2.0 * h / s2
+
+    # Eccentricity Vector => f, g
+    r_norm = vh.norm(x, y, z)
+    tx, ty, tz = vh.cross(vx, vy, vz, hx, hy, hz)
+    ex = tx / mu - x / r_norm
+    ey = ty / mu - y / r_norm
+    ez = tz / mu - z / r_norm
+    f = vh.dot(ex, ey, ez, fx, fy, fz)
+    g = vh.dot(ex, ey, ez, gx, gy, gz)
 
-    # Longitude of the Ascending Node
-    nx, ny, nz = vh.cross(0.0, 0.0, 1.0, hx, hy, hz)
-    n_norm = vh.norm(nx, ny, nz)
-    tmp0 = 0.0
-    tmpX = np.arccos(vh.dot(1.0, 0.0, 0.0, nx, ny, nz) / n_norm)
-    Omega = np.where(inc==0.0, tmp0, tmpX)
-    Omega[vh.dot(nx, ny, nz, 0.0, 1.0, 0.0) < 0.0] = \
-        2.0 * np.pi - Omega[vh.dot(nx, ny, nz, 0.0, 1.0, 0.0) < 0.0]
+    # True Longitude
+    L = np.mod(np.arctan2(vh.dot(x, y, z, gx, gy, gz), \
+                          vh.dot(x, y, z, fx, fy, fz)), 2.0 * np.pi)
 
-    # Argument of Perigee
-    # For Zero Inclination, Fall Back to 2D Case
-    # http://en.wikipedia.org/wiki/Argument_of_periapsis
-    tmp0 = np.arctan2(lrl_y/ecc, lrl_x/ecc)
-    tmpX = np.arccos(vh.dot(nx, ny, nz, lrl_x, lrl_y, lrl_z) / (n_norm * ecc))
-    omega = np.where(inc==0.0, tmp0, tmpX)
-    omega[vh.dot(lrl_x, lrl_y, lrl_z, 0.0, 0.0, 1.0) < 0.0] = \
-        2.0 * np.pi - omega[vh.dot(lrl_x, lrl_y, lrl_z, 0.0, 0.0, 1.0) < 0.0]
+    # Return
+    return p, f, g, h, k, L
 
-    # True Anomaly
-    theta = np.arccos(vh.dot(lrl_x, lrl_y, lrl_z, x, y, z) / (ecc * r_norm))
-    theta[vh.dot(x, y, z, vx, vy, vz) < 0.0] = \
-        2.0 * np.pi - theta[vh.dot(x, y, z, vx, vy, vz) < 0.0]
+def equ2cartX(p, f, g, h, k, L, mass, central_mass=1.0):
+    """
+    Modified Equinoctial Elements to Cartesian. Vectorized.
+    Velocities in code units (inverse of cart2equX; unlike kep2cartX,
+    no conversion to km/s).
 
-    # Eccentric Anomaly
-    E = np.arccos((ecc + np.cos(theta)) / (1 + ecc * np.cos(theta)))
-    E[np.logical_and(np.pi < theta, theta < 2.0 * np.pi)] = \
-        2.0 * np.pi - E[np.logical_and(np.pi < theta, theta < 2.0 * np.pi)]
+    Cf. Walker et al. (1985), CeMDA 36, 409
 
-    # Mean Anomaly
-    M = E - ecc * np.sin(E)
+    @params
+    p, f, g, h, k, L - Modified Equinoctial Elements
+    mass - Particle Mass
+    central_mass - Mass of Central Object
 
-    # Return Set
-    return a, ecc, inc, Omega, omega, M
+    @returns
+    x, y, z, vx, vy, vz - Cartesian Positions/Velocities
+    """
+
+    # Gravitational Parameter
+    G = 1.0
+    mu = G * ( central_mass + mass )
+
+    # Helpers
+    cosL = np.cos(L)
+    sinL = np.sin(L)
+    alpha2 = h**2.0 - k**2.0
+    s2 = 1.0 + h**2.0 + k**2.0
+    hk2 = 2.0 * h * k
+    r = p / ( 1.0 + f * cosL + g * sinL )
+    sqmup = np.sqrt(mu / p)
+
+    # Positions
+    x = r / s2 * ( cosL + alpha2 * cosL + hk2 * sinL )
+    y = r / s2 * ( sinL - alpha2 * sinL + hk2 * cosL )
+    z = 2.0 * r / s2 * ( h * sinL - k * cosL )
+
+    # Velocities
+    vx = -sqmup / s2 * ( sinL + alpha2 * sinL - hk2 * cosL + g - \
+                         hk2 * f + alpha2 * g )
+    vy = -sqmup / s2 * ( -cosL + alpha2 * cosL + hk2 * sinL - f + \
+                         hk2 * g + alpha2 * f )
+    vz = 2.0 * sqmup / s2 * ( h * cosL + k * sinL + f * h + g * k )
+
+    # Return
+    return x, y, z, vx, vy, vz
+
+def kep2equX(a, ecc, inc, Omega, omega, M):
+    """
+    Keplerian to Modified Equinoctial Elements. Vectorized.
+    The true anomaly comes from solve_kepler (elliptic and hyperbolic).
+    Omega (inc = 0) and omega (ecc = 0) are ignored, as in kep2cartX.
+
+    @params
+    a, ecc, inc, Omega, omega, M - Keplerian Elements (a < 0 for ecc > 1)
+
+    @returns
+    p, f, g, h, k, L - Modified Equinoctial Elements (L in [0,2pi))
+    """
+
+    # Undefined Angles as in kep2cartX
+    Omega = np.where(inc == 0.0, 0.0, Omega)
+    omega = np.where(ecc == 0.0, 0.0, omega)
+
+    # Anomaly => True Anomaly
+    E = solve_kepler(M, ecc)
+    with np.errstate(invalid="ignore"):
+        theta = np.where(ecc < 1.0, \
+                         2.0 * np.arctan2(np.sqrt(1.0 + ecc) * \
+                                          np.sin(0.5 * E), \
+                                          np.sqrt(np.abs(1.0 - ecc)) * \
+                                          np.cos(0.5 * E)), \
+                         2.0 * np.arctan2(np.sqrt(ecc + 1.0) * \
+                                          np.tanh(0.5 * E), \
+                                          np.sqrt(np.abs(ecc - 1.0))))
+
+    # Elements
+    varpi = Omega + omega
+    tan_half_inc = np.tan(0.5 * inc)
+    return a * ( 1.0 - ecc**2.0 ), \
+        ecc * np.cos(varpi), ecc * np.sin(varpi), \
+        tan_half_inc * np.cos(Omega), tan_half_inc * np.sin(Omega), \
+        np.mod(varpi + theta, 2.0 * np.pi)
+
+def equ2kepX(p, f, g, h, k, L):
+    """
+    Modified Equinoctial to Keplerian Elements. Vectorized.
+    Undefined angles follow cart2kepqQX: Omega = 0 for inc = 0, omega = 0
+    and M = argument of latitude for ecc = 0.
+
+    @params
+    p, f, g, h, k, L - Modified Equinoctial Elements
+
+    @returns
+    a, ecc, inc, Omega, omega, M (Angles in [0,2pi), except hyperbolic M)
+    """
+
+    # Shape, Size
+    ecc = np.sqrt(f**2.0 + g**2.0)
+    with np.errstate(divide="ignore"):
+        a = p / ( 1.0 - ecc**2.0 )
+    inc = 2.0 * np.arctan(np.sqrt(h**2.0 + k**2.0))
+
+    # Orientation
+    Omega = np.where(h**2.0 + k**2.0 > 0.0, np.arctan2(k, h), 0.0)
+    varpi = np.where(ecc > 0.0, np.arctan2(g, f), Omega)
+    omega = varpi - Omega
+    theta = L - varpi
+
+    # True => Mean Anomaly
+    with np.errstate(invalid="ignore"):
+        E = np.where(ecc < 1.0, \
+                     np.arctan2(np.sqrt(np.abs(1.0 - ecc**2.0)) * \
+                                np.sin(theta), ecc + np.cos(theta)), \
+                     2.0 * np.arctanh(np.sqrt(np.abs(ecc - 1.0) / \
+                                              ( ecc + 1.0 )) * \
+                                      np.tan(0.5 * theta)))
+    M = np.where(ecc < 1.0, \
+                 np.mod(E - ecc * np.sin(E), 2.0 * np.pi), \
+                 ecc * np.sinh(E) - E)
+
+    # Return
+    return a, ecc, inc, np.mod(Omega, 2.0 * np.pi), \
+        np.mod(omega, 2.0 * np.pi), M
 
 def cart2kep(r, v, mass, central_mass=1.0):
     """
@@ -247,7 +713,7 @@ def kep2cart(a, ecc, inc, Omega, omega, M, mass, central_mass=1.0):
         omega = 0.0
 
     # Mean Anomaly -> Eccentric/Hyperbolic Anomaly
-    E = nr(M, ecc)
+    E = solve_kepler(M, ecc)
         
     # Eccentric, Circular
     if ecc < 1.0:
@@ -307,6 +773,90 @@ def kep2cart(a, ecc, inc, Omega, omega, M, mass, central_mass=1.0):
     # Return
     return r, v
 
+def kep2cartX(a, ecc, inc, Omega, omega, M, mass, central_mass=1.0):
+    """
+    Vectorized version of kep2cart. Elliptic and hyperbolic orbits may be
+    mixed; parabolic orbits are unsupported.
+
+    @params
+    a - Semi-Major Axis
+    ecc - Eccentricity
+    inc - Inclination
+    Omega - Longitude of the Ascending Node
+    omega - Argument of Periapsis
+    M - Mean Anomaly at Epoch
+    mass - Particle Mass
+    central_mass - Mass of Central Object
+
+    @returns
+    r - (x,y,z) Cartesian Positions, Shape (3,N)
+    v - (vx,vy,vz) Cartesian Velocities, Shape (3,N)
+
+    Cf. http://www.bruce-shapiro.com/pair/ElementConversionRecipes.pdf
+    """
+
+    # Broadcast Inputs
+    a, ecc, inc, Omega, omega, M, mass = \
+        np.broadcast_arrays(*[ np.asarray(xx, dtype=np.float64) \
+                               for xx in [ a, ecc, inc, Omega, omega, \
+                                           M, mass ] ])
+    if np.any(ecc == 1.0):
+        raise Exception("Parabolic Orbits Unsupported.")
+
+    # Zero Inclination = No Line of Nodes
+    # Ciruclar Orbit = No Argument of Perigee
+    Omega = np.where(inc == 0.0, 0.0, Omega)
+    omega = np.where(ecc == 0.0, 0.0, omega)
+
+    # Mean Anomaly -> Eccentric/Hyperbolic Anomaly
+    E = solve_kepler(M, ecc)
+
+    # Gravitational Parameter, Mean Motion
+    G = 1.0; mu = G * ( central_mass + mass )
+    absa = np.abs(a)
+    n = np.sqrt(mu / absa**3.0)
+
+    # Compute XY, VX, VY in Orbit Frame
+    X = np.empty_like(E); Y = np.empty_like(E)
+    Vx = np.empty_like(E); Vy = np.empty_like(E)
+
+    # Eccentric, Circular
+    ell = ecc < 1.0
+    if np.any(ell):
+        Ee = E[ell]; ee = ecc[ell]; ae = a[ell]
+        cosE = np.cos(Ee); sinE = np.sin(Ee)
+        sqe = np.sqrt(1.0 - ee**2.0)
+        Edot = n[ell] / ( 1.0 - ee * cosE )
+        X[ell] = ae * ( cosE - ee )
+        Y[ell] = ae * sqe * sinE
+        Vx[ell] = - ae * sinE * Edot
+        Vy[ell] = ae * sqe * Edot * cosE
+
+    # Hyperbolic
+    hyp = ecc > 1.0
+    if np.any(hyp):
+        Hh = E[hyp]; eh = ecc[hyp]; ah = absa[hyp]
+        coshH = np.cosh(Hh); sinhH = np.sinh(Hh)
+        sqe = np.sqrt(eh**2.0 - 1.0)
+        Hdot = n[hyp] / ( eh * coshH - 1.0 )
+        X[hyp] = ah * ( eh - coshH )
+        Y[hyp] = ah * sqe * sinhH
+        Vx[hyp] = - ah * Hdot * sinhH
+        Vy[hyp] = ah * sqe * Hdot * coshH
+
+    # Rotation Matrix Components
+    Px, Py, Pz, Qx, Qy, Qz = PQW(Omega, omega, inc)
+
+    # Rotate Positions, Velocities
+    r = np.array([ X * Px + Y * Qx, X * Py + Y * Qy, X * Pz + Y * Qz ])
+    v = np.array([ Vx * Px + Vy * Qx, Vx * Py + Vy * Qy, Vx * Pz + Vy * Qz ])
+
+    # Fix Units
+    v *= C.genga_to_kms
+
+    # Return
+    return r, v
+
 def PQW(Omega, omega, inc):
     """
     Rotation Matrix Components (Orbit Frame => Inertial Frame)
@@ -359,82 +909,422 @@ def nr(M, ecc, epsilon_target=1.0e-5):
     # print "Found E=%.2f" % Ei1
     return Ei1
 
-def compute_ellipseX(a, ecc, inc, Omega, omega):
+def _reduce_mean_anomaly(M):
     """
-    Compute XYZ Sequence for a Kepler Ellipse.
-    Vectorized Version. Expects 1D Arrays Passed.
+    Reduce Mean Anomaly to [-pi,pi]. Values already in range are passed
+    through untouched (M + pi would lose the low bits of small M, which
+    matter for near-parabolic orbits).
+    """
+
+    return np.where(np.abs(M) > np.pi, \
+                    np.mod(M + np.pi, 2.0 * np.pi) - np.pi, M)
+
+# Taylor Coefficients for x - sin(x), sinh(x) - x: 1/3!, 1/5!, ..., 1/17!
+_x_minus_sin_coeffs = [ 1.0 / np.prod(np.arange(1.0, 2.0 * k + 4.0)) \
+                        for k in range(8) ]
+
+def _x_minus_sin(x, hyperbolic=False):
+    """
+    x - sin(x), or sinh(x) - x if hyperbolic, without cancellation.
+    Taylor series (8 terms) for |x| < 0.5, direct evaluation otherwise.
+    x^3 * sum_k s^k x^(2k) / (2k+3)!, s = -1 (sin) or +1 (sinh)
+    """
+
+    # Direct
+    if np.isscalar(x) and abs(x) < 0.5:
+        direct = 0.0
+    elif hyperbolic:
+        direct = np.sinh(x) - x
+    else:
+        direct = x - np.sin(x)
+    if np.isscalar(x) and abs(x) >= 0.5:
+        return direct
+
+    # Series
+    s = 1.0 if hyperbolic else -1.0
+    x2 = x * x
+    series = 0.0
+    for coeff in _x_minus_sin_coeffs[::-1]:
+        series = coeff + s * x2 * series
+    series = series * x2 * x
+    if np.isscalar(x):
+        return series
+    return np.where(np.abs(x) < 0.5, series, direct)
+
+def _kepler_f(E, M, ecc, hyperbolic=False):
+    """
+    Kepler Function and its First Three Derivatives at E.
+    f and f' are evaluated without cancellation for near-parabolic orbits
+    and small E.
+
+    Elliptic   - f = E - ecc * sin(E) - M
+    Hyperbolic - f = ecc * sinh(H) - H - M
+    """
+
+    if hyperbolic:
+        f0 = ( ecc - 1.0 ) * E + ecc * _x_minus_sin(E, True) - M
+        f1 = ( ecc - 1.0 ) + 2.0 * ecc * np.sinh(0.5 * E)**2.0
+        f2 = ecc * np.sinh(E)
+        f3 = ecc * np.cosh(E)
+    else:
+        f0 = ( 1.0 - ecc ) * E + ecc * _x_minus_sin(E) - M
+        f1 = ( 1.0 - ecc ) + 2.0 * ecc * np.sin(0.5 * E)**2.0
+        f2 = ecc * np.sin(E)
+        f3 = ecc * np.cos(E)
+    return f0, f1, f2, f3
+
+def _kepler_starter_elliptic(M, ecc):
+    """
+    Markley (1995) Starter for Kepler's Equation, 0 <= M <= pi.
+    Cf. http://adsabs.harvard.edu/abs/1995CeMDA..63..101M
     """
 
-    # Some Reshaping
-    a = a[:,np.newaxis]
-    ecc = ecc[:,np.newaxis]
-    inc = inc[:,np.newaxis]
-    Omega = Omega[:,np.newaxis]
-    omega = omega[:,np.newaxis]
+    alpha = ( 3.0 * np.pi**2.0 + 1.6 * np.pi * ( np.pi - M ) / ( 1.0 + ecc ) ) \
+        / ( np.pi**2.0 - 6.0 )
+    d = 3.0 * ( 1.0 - ecc ) + alpha * ecc
+    q = 2.0 * alpha * d * ( 1.0 - ecc ) - M**2.0
+    r = 3.0 * alpha * d * ( d - 1.0 + ecc ) * M + M**3.0
+    w = ( np.abs(r) + np.sqrt(q**3.0 + r**2.0) )**(2.0/3.0)
+    return ( 2.0 * r * w / ( w**2.0 + w * q + q**2.0 ) + M ) / d
 
-    # Eccentric Anomaly
-    E = np.linspace(0.0, 2.*np.pi, 128)
-    E = E[np.newaxis,:]
+def _kepler_starter_hyperbolic(M, ecc):
+    """
+    Starter for the Hyperbolic Kepler Equation, M >= 0.
+    Picks the better (smaller residual) of
+    - Danby (1988): H0 = log(2 * M / ecc + 1.8), good for large M,
+    - Root of the cubic (ecc - 1) * H + ecc * H**3 / 6 = M, good for small H.
+    """
+
+    # Danby
+    H1 = np.log(2.0 * M / ecc + 1.8)
+
+    # Cubic (Cardano; One Real Root)
+    p = 6.0 * ( ecc - 1.0 ) / ecc
+    q = - 6.0 * M / ecc
+    s = np.sqrt(q**2.0 / 4.0 + p**3.0 / 27.0)
+    H2 = np.cbrt(- q / 2.0 + s) + np.cbrt(- q / 2.0 - s)
+
+    # Pick (For Large M, sinh(H2) Overflows; Inf Residual Picks Danby)
+    with np.errstate(over="ignore"):
+        f1 = np.abs(ecc * np.sinh(H1) - H1 - M)
+        f2 = np.abs(ecc * np.sinh(H2) - H2 - M)
+    if np.isscalar(M):
+        return H2 if f2 < f1 else H1
+    return np.where(f2 < f1, H2, H1)
+
+def _kepler_correct(E, f0, f1, f2, f3, f4):
+    """
+    Fifth-Order Householder-Type Correction (Markley 1995, Eq. 20-22).
+    f0..f4 are the Kepler function and its first four derivatives at E.
+    """
+
+    d3 = - f0 / ( f1 - 0.5 * f0 * f2 / f1 )
+    d4 = - f0 / ( f1 + 0.5 * d3 * f2 + d3**2.0 * f3 / 6.0 )
+    d5 = - f0 / ( f1 + 0.5 * d4 * f2 + d4**2.0 * f3 / 6.0 + \
+                  d4**3.0 * f4 / 24.0 )
+    return E + d5
+
+def _kepler_prepare(M, ecc):
+    """
+    Broadcast, Split into Elliptic/Hyperbolic, Fold onto M >= 0.
+    Kepler's equation is odd in M (and E); elliptic M is reduced to
+    [-pi,pi] first.
+
+    @returns
+    E - Output Array (Uninitialised)
+    [ [ mask, |M|, sign, offset, ecc, hyperbolic ], ... ] (Non-Empty Only)
+    """
+
+    M, ecc = np.broadcast_arrays(np.asarray(M, dtype=np.float64), \
+                                 np.asarray(ecc, dtype=np.float64))
+    if np.any(ecc == 1.0):
+        raise Exception("Parabolic Orbits Unsupported.")
+    E = np.empty(M.shape, dtype=np.float64)
+
+    branches = []
+    for hyperbolic, mask in [ [ False, ecc < 1.0 ], [ True, ecc > 1.0 ] ]:
+        if not np.any(mask):
+            continue
+        Mb = M[mask]
+        if hyperbolic:
+            Mr = Mb
+        else:
+            Mr = _reduce_mean_anomaly(Mb)
+        sign = np.where(Mr < 0.0, -1.0, 1.0)
+        branches.append([ mask, np.abs(Mr), sign, Mb - Mr, ecc[mask], \
+                          hyperbolic ])
+    return E, branches
+
+def nrX(M, ecc, epsilon_target=1.0e-12, max_iter=32):
+    """
+    Vectorized version of nr (Halley's Method, Masked per Element).
+    Computes Eccentric (ecc<1) or Hyperbolic (ecc>1) Anomaly from Mean
+    Anomaly; both may be mixed. Iterates only elements not yet converged.
+
+    Uses the starters of solve_kepler. An element has converged once the
+    step drops below epsilon_target * max(|E|,1), or stops shrinking (the
+    round-off floor of near-parabolic orbits).
+
+    @params
+    M - Mean Anomaly
+    ecc - Eccentricity
+    epsilon_target - Relative Tolerance on E
+    max_iter - Maximum Number of Iterations
+
+    @returns
+    E - Eccentric/Hyperbolic Anomaly (Elliptic: Same Revolution as M)
+    """
+
+    E, branches = _kepler_prepare(M, ecc)
+    for mask, Ma, sign, offset, eb, hyperbolic in branches:
+        if hyperbolic:
+            Eb = _kepler_starter_hyperbolic(Ma, eb)
+        else:
+            Eb = _kepler_starter_elliptic(Ma, eb)
+        idx = np.arange(len(Eb))
+        dE_last = np.inf * np.ones(len(Eb))
+        for ii in range(max_iter):
+            Ei = Eb[idx]
+            f0, f1, f2, f3 = _kepler_f(Ei, Ma[idx], eb[idx], hyperbolic)
+            dE = f0 / ( f1 - 0.5 * f0 * f2 / f1 )
+            Eb[idx] = Ei - dE
+            dE = np.abs(dE)
+            active = np.logical_and(dE > epsilon_target * \
+                                    np.maximum(np.abs(Ei), 1.0), \
+                                    dE < dE_last[idx])
+            dE_last[idx] = dE
+            idx = idx[active]
+            if len(idx) == 0:
+                break
+        if len(idx) > 0:
+            raise Exception("NR Iteration Failed To Converge.")
+        E[mask] = sign * Eb + offset
+
+    # Return
+    return E
+
+def solve_kepler(M, ecc, niter=2):
+    """
+    Solve Kepler's Equation with a Fixed Number of Iterations.
+    Computes Eccentric (ecc<1) or Hyperbolic (ecc>1) Anomaly from Mean
+    Anomaly. Scalars or arrays (elliptic and hyperbolic may be mixed).
+
+    No convergence test, no branching on the data: a high-quality starter
+    (Markley 1995 for ecc<1; Danby 1988 or cubic for ecc>1) is refined by
+    niter fifth-order corrections. One correction reaches machine precision
+    for ecc<1; the default of two also covers ecc>1. Cf.
+    Benchmarks/bench_kepler_solvers.py.
+
+    @params
+    M - Mean Anomaly
+    ecc - Eccentricity
+    niter - Number of Fifth-Order Corrections
+
+    @returns
+    E - Eccentric/Hyperbolic Anomaly (Elliptic: Same Revolution as M)
+    """
+
+    # Scalar Path (Same Kernels on Floats, No Masking)
+    if np.isscalar(M) and np.isscalar(ecc):
+        M = float(M); ecc = float(ecc)
+        if ecc == 1.0:
+            raise Exception("Parabolic Orbits Unsupported.")
+        hyperbolic = ecc > 1.0
+        if hyperbolic or abs(M) <= np.pi:
+            Mr = M
+        else:
+            Mr = ( M + np.pi ) % ( 2.0 * np.pi ) - np.pi
+        branches = [ [ None, abs(Mr), -1.0 if Mr < 0.0 else 1.0, M - Mr, \
+                       ecc, hyperbolic ] ]
+        E = None
+    else:
+        E, branches = _kepler_prepare(M, ecc)
+
+    # Starter, Fixed Corrections
+    for mask, Ma, sign, offset, eb, hyperbolic in branches:
+        if hyperbolic:
+            Eb = _kepler_starter_hyperbolic(Ma, eb)
+        else:
+            Eb = _kepler_starter_elliptic(Ma, eb)
+        for ii in range(niter):
+            f0, f1, f2, f3 = _kepler_f(Eb, Ma, eb, hyperbolic)
+            f4 = f2 if hyperbolic else -f2
+            Eb = _kepler_correct(Eb, f0, f1, f2, f3, f4)
+        if E is None:
+            return float(sign * Eb + offset)
+        E[mask] = sign * Eb + offset
+
+    # Return
+    return E
+
+def _orbit_sample_counts(ecc, nsamples, adaptive, max_samples):
+    """
+    Samples per Orbit. Adaptive: nsamples / sqrt(|1-ecc|), Capped.
+    """
+
+    if not adaptive:
+        return np.ones(len(ecc), dtype=np.int64) * nsamples
+    max_samples = max(max_samples, nsamples)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scale = np.minimum(1.0 / np.sqrt(np.abs(1.0 - ecc)), max_samples)
+    return np.clip(np.ceil(nsamples * np.nan_to_num(scale)), \
+                   nsamples, max_samples).astype(np.int64)
+
+def _orbit_chunk(a, ecc, inc, Omega, omega, counts, ncols, adaptive, hmax):
+    """
+    Sample One Chunk of Orbits. Rows with fewer than ncols samples repeat
+    their last point. Parabolic (and NaN) rows are NaN.
+
+    Ellipses run over E in [0, 2pi] (adaptive: [-pi, pi]), hyperbolas over
+    H in [-hmax, hmax]. Adaptive grids average a uniform grid in E (or H)
+    with a grid of uniform tangent direction (tan E = b/a tan phi, tanh H =
+    b/a tan phi), which packs samples where the curve turns fast, i.e.
+    around the pericentre (and apocentre) of eccentric orbits.
+    """
+
+    # Normalised Parameter in [0, 1]
+    n = counts[:,np.newaxis]
+    u = np.minimum(np.arange(ncols)[np.newaxis,:], n - 1) / \
+        np.maximum(n - 1, 1).astype(np.float64)
+
+    # Orbit Frame
+    X = np.ones((len(a), ncols)) * np.nan
+    Y = np.ones((len(a), ncols)) * np.nan
+
+    # Ellipses
+    iell = np.flatnonzero(ecc < 1.0)
+    if len(iell) > 0:
+        ae = a[iell,np.newaxis]; ee = ecc[iell,np.newaxis]
+        if adaptive:
+            E = 2.0 * np.pi * u[iell] - np.pi
+            E = 0.5 * ( E + np.arctan2(np.sqrt(1.0 - ee**2.0) * np.sin(E), \
+                                       np.cos(E)) )
+        else:
+            E = 2.0 * np.pi * u[iell]
+        X[iell] = ae * ( np.cos(E) - ee )
+        Y[iell] = ae * np.sqrt(1.0 - ee**2.0) * np.sin(E)
+
+    # Hyperbolas
+    ihyp = np.flatnonzero(ecc > 1.0)
+    if len(ihyp) > 0:
+        ah = np.abs(a[ihyp,np.newaxis]); eh = ecc[ihyp,np.newaxis]
+        H = hmax * ( 2.0 * u[ihyp] - 1.0 )
+        if adaptive:
+            ba = np.sqrt(eh**2.0 - 1.0)
+            phi = np.arctan(np.tanh(hmax) / ba) * ( 2.0 * u[ihyp] - 1.0 )
+            H = 0.5 * ( H + np.arctanh(ba * np.tan(phi)) )
+        X[ihyp] = ah * ( eh - np.cosh(H) )
+        Y[ihyp] = ah * np.sqrt(eh**2.0 - 1.0) * np.sinh(H)
 
     # Rotation Matrix Components
-    Px, Py, Pz, Qx, Qy, Qz = PQW(Omega, omega, inc)
+    Px, Py, Pz, Qx, Qy, Qz = PQW(Omega[:,np.newaxis], \
+                                 omega[:,np.newaxis], \
+                                 inc[:,np.newaxis])
+
+    # Rotate Positions
+    return X * Px + Y * Qx, X * Py + Y * Qy, X * Pz + Y * Qz
+
+def _orbit_arrays(a, ecc, inc, Omega, omega):
+    """
+    Elements as 1D Float64 Arrays.
+    """
+
+    return [ np.atleast_1d(np.asarray(el, dtype=np.float64)) \
+             for el in [ a, ecc, inc, Omega, omega ] ]
+
+def iterate_orbitsX(a, ecc, inc, Omega, omega, nsamples=128, \
+                    adaptive=False, max_samples=1024, hmax=np.pi/2.0, \
+                    dtype=np.float64, chunksize=4096):
+    """
+    Generator Version of compute_orbitsX. Yields chunks of at most
+    chunksize orbits, so memory stays bounded for many bodies (e.g. draw
+    and discard each chunk). Each chunk is as wide as its widest orbit.
+
+    @params: cf. compute_orbitsX
+    @yield: sl - Rows of This Chunk [Slice]
+    @yield: x, y, z - Chunk Coordinates (len(sl), ncols) [Numpy Arrays]
+    """
+
+    a, ecc, inc, Omega, omega = _orbit_arrays(a, ecc, inc, Omega, omega)
+    counts = _orbit_sample_counts(ecc, nsamples, adaptive, max_samples)
+    for istart in range(0, len(a), chunksize):
+        sl = slice(istart, min(istart + chunksize, len(a)))
+        x, y, z = _orbit_chunk(a[sl], ecc[sl], inc[sl], Omega[sl], \
+                               omega[sl], counts[sl], counts[sl].max(), \
+                               adaptive, hmax)
+        yield sl, x.astype(dtype), y.astype(dtype), z.astype(dtype)
+
+def compute_orbitsX(a, ecc, inc, Omega, omega, nsamples=128, \
+                    adaptive=False, max_samples=1024, hmax=np.pi/2.0, \
+                    dtype=np.float64, chunksize=4096):
+    """
+    Compute XYZ Sequences for Kepler Ellipses and Hyperbolas (Mixed).
+    Vectorized Version. Expects 1D Arrays Passed.
+
+    Orbits are computed in chunks (float64) and written into the output
+    arrays, so dtype=np.float32 halves the result without a full-size
+    float64 intermediate. Parabolic orbits (ecc=1) are NaN.
+
+    @params
+    a, ecc, inc, Omega, omega - Orbital Elements (a < 0 for Hyperbolas)
+    nsamples - Samples per Orbit (Minimum, if Adaptive)
+    adaptive - Scale Samples w/ 1/sqrt(|1-ecc|), Pack Where Orbits Turn
+    max_samples - Cap for Adaptive Sample Counts
+    hmax - Hyperbolic Anomaly Range [-hmax, hmax]
+    dtype - Output Type
+    chunksize - Orbits per Chunk
 
-    # Compute Ellipse
-    x = a * (np.cos(E) - ecc) * Px + \
-        a * np.sqrt(1.0 - ecc**2.) * np.sin(E) * Qx
-    y = a * (np.cos(E) - ecc) * Py + \
-        a * np.sqrt(1.0 - ecc**2.) * np.sin(E) * Qy
-    z = a * (np.cos(E) - ecc) * Pz + \
-        a * np.sqrt(1.0 - ecc**2.) * np.sin(E) * Qz
+    @returns
+    x, y, z - Coordinates (len(a), ncols); Orbits w/ Fewer Samples Repeat
+              Their Last Point
+    """
+
+    a, ecc, inc, Omega, omega = _orbit_arrays(a, ecc, inc, Omega, omega)
+    counts = _orbit_sample_counts(ecc, nsamples, adaptive, max_samples)
+    ncols = counts.max() if len(a) > 0 else nsamples
+
+    # Allocate, Fill Chunks
+    x = np.empty((len(a), ncols), dtype=dtype)
+    y = np.empty((len(a), ncols), dtype=dtype)
+    z = np.empty((len(a), ncols), dtype=dtype)
+    for istart in range(0, len(a), chunksize):
+        sl = slice(istart, min(istart + chunksize, len(a)))
+        x[sl], y[sl], z[sl] = \
+            _orbit_chunk(a[sl], ecc[sl], inc[sl], Omega[sl], omega[sl], \
+                         counts[sl], ncols, adaptive, hmax)
 
     # Return
     return x, y, z
 
+def compute_ellipseX(a, ecc, inc, Omega, omega):
+    """
+    Compute XYZ Sequence for a Kepler Ellipse.
+    Vectorized Version. Expects 1D Arrays Passed.
+    Wrapper around compute_orbitsX (128 Samples; Hyperbolas Supported).
+    """
+
+    return compute_orbitsX(a, ecc, inc, Omega, omega)
+
 def compute_ellipse(a, ecc, inc, Omega, omega):
     """
     Compute XYZ Sequence for a Kepler Ellipses/Hyperbolas.
+    Wrapper around compute_orbitsX.
     """
-  
-    # Eccentric, Circular
-    if ecc < 1.0:
-        
-        # Eccentric Anomaly
-        E = np.linspace(0.0, 2.*np.pi, 128)
-        
-        # Compute XY in Orbit Frame
-        X = a * (np.cos(E) - ecc)
-        Y = a * np.sqrt(1.0 - ecc**2.) * np.sin(E)
-    
-    # Hyperbolic
-    elif ecc > 1.0:
-        
-        # Hyperbolic Anomaly
-        H = np.linspace(-np.pi/2.0, np.pi/2.0, 128)
-        
-        # Compute XY in Orbit Frame
-        X = np.abs(a) * ( ecc - np.cosh(H) )
-        Y = np.abs(a) * np.sqrt(ecc**2.0 - 1.0) * np.sinh(H)
-    
+
     # Parabolic
-    elif ecc == 1.0:
+    if ecc == 1.0:
         raise Exception("Parabolic Orbits Unsupported.")
 
-    # Rotation Matrix Components
-    Px, Py, Pz, Qx, Qy, Qz = PQW(Omega, omega, inc)
-
-    # Rotate Positions
-    x = X * Px + Y * Qx
-    y = X * Py + Y * Qy
-    z = X * Pz + Y * Qz
-    
-    # Return
-    return x, y, z
+    # Compute, Return
+    x, y, z = compute_orbitsX(a, ecc, inc, Omega, omega)
+    return x[0], y[0], z[0]
 
 def kep2del(a, e, i, Omega, omega, M):
     """
     Keper to Delaunay Elements.
     Cf. (a) Joachim's Unpublished Paper
         (b) http://www.bourbaphy.fr/chenciner.pdf
+    Fixed masses; cf. kep2delX for actual particle masses.
     """
 
     Msolar = 1.99e30 # kg
@@ -445,6 +1335,68 @@ def kep2del(a, e, i, Omega, omega, M):
     Lz = L * np.cos(i)
     return Lambda, L, Lz, Omega, omega, M
 
+def _delaunay_actions(a, e, i, mass, central_mass, specific):
+    """
+    Lambda, Lambda - L, L, L - Lz (Differences w/o Cancellation).
+    """
+
+    G = 1.0
+    mu = G * ( central_mass + mass )
+    Lambda = np.sqrt(mu * a)
+    if not specific:
+        Lambda = Lambda * mass
+    sqrt_1me2 = np.sqrt(1.0 - e**2.0)
+    L = Lambda * sqrt_1me2
+    return Lambda, Lambda * e**2.0 / ( 1.0 + sqrt_1me2 ), \
+        L, 2.0 * L * np.sin(0.5 * i)**2.0
+
+def kep2delX(a, e, i, Omega, omega, M, mass, central_mass=1.0, \
+             specific=False):
+    """
+    Kepler to Delaunay Elements. Vectorized, Actual Masses (G = 1, Masses
+    in Solar Masses, cf. cart2kepX). Unlike kep2del, no constants are
+    hardcoded.
+
+    @params
+    a, e, i, Omega, omega, M - Orbital Elements
+    mass - Particle Masses
+    central_mass - Mass of Central Object
+    specific - Actions per Unit Mass (e.g. for Test Particles)
+
+    @returns
+    Lambda, L, Lz, Omega, omega, M - Delaunay Elements
+    """
+
+    Lambda, _, L, dLz = _delaunay_actions(a, e, i, mass, central_mass, \
+                                          specific)
+    return Lambda, L, L - dLz, Omega, omega, M
+
+def kep2poiX(a, e, i, Omega, omega, M, mass, central_mass=1.0, \
+             specific=False):
+    """
+    Kepler to Poincare Elements. Vectorized, Actual Masses. Same
+    conventions as kep2del + del2poi, but Lambda - L and L - Lz are
+    evaluated without cancellation (small e, i).
+
+    @params
+    a, e, i, Omega, omega, M - Orbital Elements
+    mass - Particle Masses
+    central_mass - Mass of Central Object
+    specific - Actions per Unit Mass (e.g. for Test Particles)
+
+    @returns
+    Lambda, lambda_small, xi_real, xi_imag, eta_real, eta_imag
+    """
+
+    Lambda, dL, _, dLz = _delaunay_actions(a, e, i, mass, central_mass, \
+                                           specific)
+    lambda_small = ( M + omega + Omega ) % ( 2.0 * np.pi )
+    xi = np.sqrt(2.0 * dL)
+    eta = np.sqrt(2.0 * dLz)
+    return Lambda, lambda_small, \
+        xi * np.cos(omega + Omega), xi * np.sin(omega + Omega), \
+        eta * np.cos(Omega), eta * np.sin(Omega)
+
 def del2poi(Lambda, L, Lz, Omega, omega, M):
     """
     Delaunay to Poincare Elements.
@@ -516,6 +1468,9 @@ def cart2metricX(x1, y1, z1, vx1, vy1, vz1, \
     """
     Computes Metric Distance.
     Cf. Kholshevnikov 2007, Sec. 3, Eq. (4)
+
+    Pairwise only. For neighbour searches among many bodies, see
+    metric_helpers (embedding + KD-tree).
     """
     # Gravitational Constant
     mu = 1.0
@@ -526,14 +1481,14 @@ def cart2metricX(x1, y1, z1, vx1, vy1, vz1, \
     hx1, hy1, hz1 = vh.cross(x1, y1, z1, vx1, vy1, vz1)
     hx2, hy2, hz2 = vh.cross(x2, y2, z2, vx2, vy2, vz2)
     # Laplace-Runge-Lenz Vectors / Eccentricity Vectors
-    vx1, vy1, vz1 = vh.cross(vx1, vy1, vz1, hx1, hy1, hz1)
-    vx2, vy2, vz2 = vh.cross(vx2, vy2, vz2, hx2, hy2, hz2)
-    ex1 = vx1 / mu - x1 / vh.norm(x1, y1, z1)
-    ey1 = vy1 / mu - y1 / vh.norm(x1, y1, z1)
-    ez1 = vz1 / mu - z1 / vh.norm(x1, y1, z1)
-    ex2 = vx2 / mu - x2 / vh.norm(x2, y2, z2)
-    ey2 = vy2 / mu - y2 / vh.norm(x2, y2, z2)
-    ez2 = vz2 / mu - z2 / vh.norm(x2, y2, z2)
+    tx1, ty1, tz1 = vh.cross(vx1, vy1, vz1, hx1, hy1, hz1)
+    tx2, ty2, tz2 = vh.cross(vx2, vy2, vz2, hx2, hy2, hz2)
+    ex1 = tx1 / mu - x1 / vh.norm(x1, y1, z1)
+    ey1 = ty1 / mu - y1 / vh.norm(x1, y1, z1)
+    ez1 = tz1 / mu - z1 / vh.norm(x1, y1, z1)
+    ex2 = tx2 / mu - x2 / vh.norm(x2, y2, z2)
+    ey2 = ty2 / mu - y2 / vh.norm(x2, y2, z2)
+    ez2 = tz2 / mu - z2 / vh.norm(x2, y2, z2)
     # Energy Constants
     E1 = vh.dot(vx1, vy1, vz1, vx1, vy1, vz1) / 2.0 - mu / vh.norm(x1, y1, z1)
     E2 = vh.dot(vx2, vy2, vz2, vx2, vy2, vz2) / 2.0 - mu / vh.norm(x2, y2, z2)
@@ -0,0 +1,228 @@
+"""
+Helpers for Neighbour Searches in Orbit Space.
+
+The Kholshevnikov metric (cf. kepler_helpers.cart2metricX) is a Euclidean
+distance between (h, e-vector, energy) embeddings,
+
+  rho2 = |h1 - h2|^2 / (mu L) + |e1 - e2|^2 (+ L1^2 / mu^2 (E1 - E2)^2),
+
+so every body is embedded once (cart2embeddingX) and k-nearest-neighbour,
+radius and pair queries run on a spatial index over the embedding instead of
+an O(N^2) loop over pairs. The index is a scipy cKDTree if scipy is
+available, otherwise queries fall back to a chunked brute-force search in
+numpy (same results, much slower for large N).
+
+Distances returned by queries are rho (not rho2).
+"""
+
+import numpy as np
+import vector_helpers as vh
+
+# Optional KD-Tree
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+# Brute-Force Fallback: Max. Pair Distances per Chunk
+_brute_chunk = 2**22
+
+
+def cart2embeddingX(x, y, z, vx, vy, vz, energy=False, \
+                    mu=1.0, L=1.0, L1=1.0):
+    """
+    Metric Embedding of State Vectors.
+
+    @params
+    x, y, z, vx, vy, vz - Cartesian Positions/Velocities
+    energy - Include Energy Dimension (=> rho2e of cart2metricX)
+    mu, L, L1 - Gravitational Parameter, Scale Factors (cf. cart2metricX)
+
+    @returns
+    emb - Embedding (N, 6), or (N, 7) w/ Energy [Numpy Array]
+    """
+
+    # Specific Angular Momentum Vectors
+    hx, hy, hz = vh.cross(x, y, z, vx, vy, vz)
+
+    # Laplace-Runge-Lenz Vectors / Eccentricity Vectors
+    r = vh.norm(x, y, z)
+    tx, ty, tz = vh.cross(vx, vy, vz, hx, hy, hz)
+    cols = [ hx, hy, hz ]
+    cols = [ col / np.sqrt(mu * L) for col in cols ] + \
+           [ tx / mu - x / r, ty / mu - y / r, tz / mu - z / r ]
+
+    # Energy Constants
+    if energy:
+        E = vh.dot(vx, vy, vz, vx, vy, vz) / 2.0 - mu / r
+        cols.append(L1 / mu * E)
+
+    # Return
+    return np.column_stack(cols)
+
+def build_index(emb, leafsize=16):
+    """
+    Spatial Index over an Embedding.
+
+    @param: emb - Embedding (cf. cart2embeddingX) [Numpy Array]
+    @param: leafsize - KD-Tree Leaf Size [Int]
+    @return: index - { "emb": Embedding, "tree": cKDTree or None } [Dict]
+    """
+
+    emb = np.ascontiguousarray(emb, dtype=np.float64)
+    if cKDTree is not None:
+        tree = cKDTree(emb, leafsize=leafsize)
+    else:
+        tree = None
+    return { "emb": emb, "tree": tree }
+
+def _brute_chunks(emb, query):
+    """
+    Query Chunks and Their Squared Distances to All Points (Brute Force).
+    """
+
+    nchunk = max(1, _brute_chunk // max(1, len(emb)))
+    for istart in range(0, len(query), nchunk):
+        q = query[istart:istart+nchunk]
+        d2 = np.zeros((len(q), len(emb)))
+        for idim in range(emb.shape[1]):
+            d2 += ( q[:,idim,np.newaxis] - emb[np.newaxis,:,idim] )**2.0
+        yield istart, d2
+
+def query_knn(index, query, k=1):
+    """
+    k Nearest Neighbours in Orbit Space.
+
+    Querying the indexed embedding itself returns each body as its own
+    nearest neighbour (distance 0); use k+1 and drop the first column.
+
+    @param: index - Index (cf. build_index) [Dict]
+    @param: query - Query Embedding (M, D) [Numpy Array]
+    @param: k - Number of Neighbours [Int]
+    @return: rho - Distances, Ascending (M, k) [Numpy Array]
+    @return: idx - Indices into the Indexed Embedding (M, k) [Numpy Array]
+    """
+
+    query = np.atleast_2d(np.asarray(query, dtype=np.float64))
+    emb = index["emb"]
+    k = min(k, len(emb))
+
+    # KD-Tree
+    if index["tree"] is not None:
+        rho, idx = index["tree"].query(query, k=k)
+        return rho.reshape(len(query), k), idx.reshape(len(query), k)
+
+    # Brute Force
+    rho = np.empty((len(query), k))
+    idx = np.empty((len(query), k), dtype=np.int64)
+    for istart, d2 in _brute_chunks(emb, query):
+        sl = slice(istart, istart + len(d2))
+        rows = np.arange(len(d2))[:,np.newaxis]
+        ipart = np.argpartition(d2, k - 1, axis=1)[:,:k]
+        dpart = d2[rows,ipart]
+        iorder = np.argsort(dpart, axis=1, kind="mergesort")
+        idx[sl] = ipart[rows,iorder]
+        rho[sl] = np.sqrt(dpart[rows,iorder])
+    return rho, idx
+
+def query_radius(index, query, radius):
+    """
+    All Neighbours within Metric Distance radius.
+
+    @param: index - Index (cf. build_index) [Dict]
+    @param: query - Query Embedding (M, D) [Numpy Array]
+    @param: radius - Metric Distance rho [Float]
+    @return: iquery - Query Row per Match [Numpy Int Array]
+    @return: idx - Indexed Row per Match [Numpy Int Array]
+    @return: rho - Distance per Match [Numpy Array]
+    """
+
+    query = np.atleast_2d(np.asarray(query, dtype=np.float64))
+    emb = index["emb"]
+
+    # KD-Tree
+    if index["tree"] is not None:
+        hits = index["tree"].query_ball_point(query, radius)
+        counts = np.array([ len(hit) for hit in hits ], dtype=np.int64)
+        iquery = np.repeat(np.arange(len(query)), counts)
+        if counts.sum() > 0:
+            idx = np.concatenate([ np.asarray(hit, dtype=np.int64) \
+                                   for hit in hits ])
+        else:
+            idx = np.zeros(0, dtype=np.int64)
+        rho = np.sqrt(np.sum(( query[iquery] - emb[idx] )**2.0, axis=1))
+
+    # Brute Force
+    else:
+        iquery, idx, rho = [], [], []
+        for istart, d2 in _brute_chunks(emb, query):
+            iq, ie = np.nonzero(d2 <= radius**2.0)
+            iquery.append(iq + istart)
+            idx.append(ie)
+            rho.append(np.sqrt(d2[iq,ie]))
+        iquery = np.concatenate(iquery + [ np.zeros(0, dtype=np.int64) ])
+        idx = np.concatenate(idx + [ np.zeros(0, dtype=np.int64) ])
+        rho = np.concatenate(rho + [ np.zeros(0) ])
+
+    # Sort by Query Row, Distance
+    order = np.lexsort((rho, iquery))
+    return iquery[order], idx[order], rho[order]
+
+def query_pairs(index, radius):
+    """
+    All Pairs (i < j) of Indexed Bodies within Metric Distance radius.
+
+    @param: index - Index (cf. build_index) [Dict]
+    @param: radius - Metric Distance rho [Float]
+    @return: i, j - Pair Indices [Numpy Int Arrays]
+    @return: rho - Pair Distances [Numpy Array]
+    """
+
+    emb = index["emb"]
+    if index["tree"] is not None:
+        pairs = np.asarray(list(index["tree"].query_pairs(radius)), \
+                           dtype=np.int64).reshape(-1, 2)
+        i, j = np.sort(pairs, axis=1).T
+    else:
+        i, j, _ = query_radius(index, emb, radius)
+        i, j = i[i < j], j[i < j]
+
+    # Sort Pairs
+    order = np.lexsort((j, i))
+    i, j = i[order], j[order]
+    return i, j, np.sqrt(np.sum(( emb[i] - emb[j] )**2.0, axis=1))
+
+def cluster_labels(n, i, j):
+    """
+    Connected Components (Friends-of-Friends) from Pairs.
+
+    @param: n - Number of Bodies [Int]
+    @param: i, j - Pair Indices (cf. query_pairs) [Numpy Int Arrays]
+    @return: labels - Cluster Label per Body (Smallest Member Index)
+                      [Numpy Int Array]
+    """
+
+    # Label Propagation w/ Pointer Jumping
+    labels = np.arange(n, dtype=np.int64)
+    while True:
+        lmin = np.minimum(labels[i], labels[j])
+        new = labels.copy()
+        np.minimum.at(new, i, lmin)
+        np.minimum.at(new, j, lmin)
+        new = new[new]
+        if np.array_equal(new, labels):
+            return labels
+        labels = new
+
+def metric_clusters(index, radius):
+    """
+    Friends-of-Friends Clusters in Orbit Space (e.g. Families, Clones).
+
+    @param: index - Index (cf. build_index) [Dict]
+    @param: radius - Linking Length rho [Float]
+    @return: labels - Cluster Label per Body (Smallest Member Index)
+                      [Numpy Int Array]
+    """
+
+    i, j, _ = query_pairs(index, radius)
+    return cluster_labels(len(index["emb"]), i, j)
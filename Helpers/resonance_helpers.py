@@ -6,238 +6,497 @@ Helpers for Solar System Resonances.
 - f_{1,2}: JS Line of nodes (Omega) precession, inclination pumping.
 """
 
+import os
+import math
+import hashlib
 import numpy as np
 import constants as C
-import potential_helpers as ph
+import gas_helpers as gh
 
+# Gas Disk Potential: Compiled (f2py, cf. Makefile) or NumPy Fallback
+try:
+    import potential_helpers as ph
+except ImportError:
+    ph = None
 
-def laplace_coefficient(s, j, alpha):
+
+# Laplace Coefficients: Max. Quadrature Nodes x Alphas per Chunk
+_laplace_chunk = 2**22
+
+
+def _laplace_nodes(alpha, jmax, p, tol):
+    """
+    Number of Trapezoid Intervals on [0, pi] for Laplace Coefficients.
+
+    The integrand is periodic and analytic, so the trapezoid rule with M
+    intervals on [0, pi] only aliases the coefficient of order 2M - j, which
+    decays like alpha^k k^p (p = s - 1 + derivative order). M is rounded up
+    to a power of two so alphas can share nodes.
+    """
+
+    alpha = np.maximum(np.abs(alpha), 1.0e-3)
+    k = np.ones_like(alpha)
+    for ii in range(4):
+        k = ( np.log(tol) - p * np.log(np.maximum(k, 1.0)) ) / np.log(alpha)
+    M = np.ceil(( jmax + np.maximum(k, 1.0) ) / 2.0) + 2
+    return 2**np.ceil(np.log2(M)).astype(np.int64)
+
+def _laplace_integrand(s, n, logD, dD):
+    """
+    n-th alpha-Derivative of D^-s, D = 1 - 2 alpha cos(psi) + alpha^2.
+
+    D is quadratic in alpha (D'' = 2), so Faa di Bruno's formula reduces to
+      sum_m n! / (m! (n-2m)!) (-1)^(n-m) (s)_(n-m) D^(-s-n+m) D'^(n-2m).
     """
-    Compute Laplace Coefficoents beta_s^j(alpha) from Series Expansion.
-    
-    Cf. Murray & Dermott (1999), Eq. (6.67), Page 237
+
+    F = np.zeros_like(logD)
+    for m in range(n // 2 + 1):
+        k = n - m
+        coef = (-1.0)**k * math.factorial(n) / \
+               ( math.factorial(m) * math.factorial(n - 2 * m) )
+        for ii in range(k):
+            coef *= s + ii
+        F += coef * np.exp(-(s + k) * logD) * dD**(n - 2 * m)
+    return F
+
+def laplace_coefficientX(s, j, alpha, der=0, tol=1.0e-14, max_nodes=2**20):
+    """
+    Laplace Coefficients b_s^j(alpha) and Their alpha-Derivatives.
+
+    Evaluates the integral definition
+
+      b_s^j(alpha) = 1/pi int_0^2pi cos(j psi) dpsi / 
+                                    (1 - 2 alpha cos(psi) + alpha^2)^s
+
+    with the trapezoid rule, which converges geometrically for periodic,
+    analytic integrands (aliasing error ~ alpha^(2M-j) for M intervals on
+    [0, pi]). M follows from tol and the largest alpha, so the result stays
+    accurate as alpha approaches 1 (unlike a truncated power series);
+    alphas are grouped by M, so small alphas stay cheap.
+    Derivatives d^n b / dalpha^n are integrated directly. All (s, j) pairs,
+    derivative orders and alphas share one set of quadrature nodes.
+
+    Cf. Murray & Dermott (1999), Eqs. (6.67) - (6.71), Pages 237, 238
         http://adsabs.harvard.edu/abs/1999ssd..book.....M
-    Cf. Mardling (2013), App C., Fig. C1
-        http://arxiv.org/pdf/1308.0607.pdf
-    Cf. Predictability, Stability, and Chaos in N-Body Dynamical Systems,
-        Annex A
-        https://books.google.ch/books?id=zV_TBwAAQBAJ
 
-    NB: Series convergence is guaranteed for alpha < 1.
+    See Murray & Dermott (1999), Eq. (7.33), Page 280 for Test Case.
+
+    NB: Returns NaN for |alpha| >= 1.
+
+    @param: s - Half Integer(s) (1/2, 3/2, ...) [Float or Array]
+    @param: j - Integer(s) (0, 1, 2, ...) [Int or Array]
+    @param: alpha - Semi-Major Axis Ratio(s) (alpha < 1) [Float or Array]
+    @param: der - Derivative Order(s) (0 = b_s^j itself) [Int or Array]
+    @param: tol - Quadrature Tolerance [Float]
+    @param: max_nodes - Max. Number of Quadrature Intervals [Int]
+    @return: b - Shape shape(der) + shape(s, j broadcast) + shape(alpha)
+                 [Numpy Array]
+    """
+
+    # Flatten (s, j) Pairs, Derivative Orders, Alphas
+    s, j = np.broadcast_arrays(np.asarray(s, dtype=np.float64), \
+                               np.asarray(j, dtype=np.int64))
+    pshape = s.shape
+    s, j = s.ravel(), np.abs(j.ravel())
+    der = np.asarray(der, dtype=np.int64)
+    dshape = der.shape
+    der = der.ravel()
+    alpha = np.asarray(alpha, dtype=np.float64)
+    ashape = alpha.shape
+    alpha = alpha.ravel()
+    b = np.zeros((len(der), len(s), len(alpha))) * np.nan
+
+    # Valid Alphas
+    ivalid = np.nonzero(np.abs(alpha) < 1.0)[0]
+    if len(ivalid) == 0 or len(s) == 0 or len(der) == 0:
+        return b.reshape(dshape + pshape + ashape)
+
+    # Trapezoid Intervals per Alpha
+    M = _laplace_nodes(alpha[ivalid], j.max(), \
+                       max(s.max() - 1.0, 0.0) + der.max(), tol)
+    M = np.minimum(M, max_nodes)
+
+    # Loop Alphas w/ Same Nodes
+    for MM in np.unique(M):
+        igroup = ivalid[M == MM]
+
+        # Trapezoid Nodes on [0, pi]; Weights Include 2/pi
+        psi = np.linspace(0.0, np.pi, MM + 1)
+        weights = np.ones(MM + 1) * 2.0 / MM
+        weights[[0, -1]] /= 2.0
+        wcos = weights[np.newaxis,:] * \
+               np.cos(j[:,np.newaxis] * psi[np.newaxis,:])
+        cos_psi = np.cos(psi)[:,np.newaxis]
+        sin2_psi = np.sin(psi / 2.0)[:,np.newaxis]**2.0
+
+        # Loop Chunks
+        nchunk = max(1, _laplace_chunk // (MM + 1))
+        for istart in range(0, len(igroup), nchunk):
+            ia = igroup[istart:istart+nchunk]
+            a = alpha[ia][np.newaxis,:]
+
+            # Denominator (No Cancellation Near alpha = 1), Derivative
+            logD = np.log(( 1.0 - a )**2.0 + 4.0 * a * sin2_psi)
+            dD = 2.0 * ( a - cos_psi )
+
+            # Integrate All Pairs w/ Same s at Once
+            for ss in np.unique(s):
+                ipair = np.nonzero(s == ss)[0]
+                for ider, n in enumerate(der):
+                    F = _laplace_integrand(ss, n, logD, dD)
+                    b[ider,ipair[:,np.newaxis],ia[np.newaxis,:]] = \
+                        np.dot(wcos[ipair], F)
+
+    # Return
+    return b.reshape(dshape + pshape + ashape)
+
+def laplace_table(s, j, der=0, alpha_min=0.0, alpha_max=0.995, nalpha=2048, \
+                  tol=1.0e-14):
+    """
+    Tabulate Laplace Coefficients for Repeated Lookups.
+
+    Stores b_s^j and its derivatives up to der + 1 on a grid uniform in
+    u = -log(1 - alpha), which resolves the steep rise towards alpha = 1
+    (b_s^j ~ (1 - alpha)^(1 - 2s)) with a constant relative error, so
+    laplace_interpolate can use piecewise cubic Hermite interpolation.
+
+    @param: s, j, der - Cf. laplace_coefficientX
+    @param: alpha_min, alpha_max, nalpha - Alpha Grid [Float, Float, Int]
+    @param: tol - Quadrature Tolerance [Float]
+    @return: table - { "s", "j", "der", "alpha", "values" } [Dict]
+    """
+
+    s, j = np.broadcast_arrays(np.asarray(s, dtype=np.float64), \
+                               np.asarray(j, dtype=np.int64))
+    der = np.asarray(der, dtype=np.int64)
+    u = np.linspace(-np.log1p(-alpha_min), -np.log1p(-alpha_max), nalpha)
+    alpha = -np.expm1(-u)
+    values = laplace_coefficientX(s, j, alpha, \
+                                  der=np.arange(der.max() + 2), tol=tol)
+    return { "s": s, "j": j, "der": der, "alpha": alpha, "values": values }
+
+def laplace_interpolate(table, alpha):
+    """
+    Look Up Laplace Coefficients in a Table (cf. laplace_table).
+
+    @param: table - Table (cf. laplace_table) [Dict]
+    @param: alpha - Semi-Major Axis Ratio(s) Within Table Range
+                    [Float or Array]
+    @return: b - Shape shape(der) + shape(s, j) + shape(alpha) [Numpy Array]
+    """
+
+    # Grid (Uniform in u = -log(1 - alpha)), Flattened Values
+    grid = table["alpha"]
+    u_grid = -np.log1p(-grid)
+    h = ( u_grid[-1] - u_grid[0] ) / ( len(grid) - 1 )
+    pshape, dshape = table["s"].shape, table["der"].shape
+    values = table["values"].reshape(len(table["values"]), -1, len(grid))
+
+    # Alphas
+    alpha = np.asarray(alpha, dtype=np.float64)
+    ashape = alpha.shape
+    alpha = alpha.ravel()
+    if np.any(alpha < grid[0]) or np.any(alpha > grid[-1]):
+        raise Exception("alpha Outside Table Range [%.4f, %.4f]" % \
+                        (grid[0], grid[-1]))
+
+    # Cubic Hermite Basis (Slopes d/du = (1 - alpha) d/dalpha)
+    u = -np.log1p(-alpha)
+    ii = np.clip(( ( u - u_grid[0] ) / h ).astype(np.int64), \
+                 0, len(grid) - 2)
+    t = ( u - u_grid[ii] ) / h
+    h00 = ( 1.0 + 2.0 * t ) * ( 1.0 - t )**2.0
+    h10 = t * ( 1.0 - t )**2.0 * h * ( 1.0 - grid[ii] )
+    h01 = t**2.0 * ( 3.0 - 2.0 * t )
+    h11 = t**2.0 * ( t - 1.0 ) * h * ( 1.0 - grid[ii+1] )
+
+    # Interpolate
+    b = np.zeros((table["der"].size, values.shape[1], len(alpha)))
+    for ider, n in enumerate(table["der"].ravel()):
+        y, dy = values[n], values[n+1]
+        b[ider] = h00 * y[:,ii] + h10 * dy[:,ii] + \
+                  h01 * y[:,ii+1] + h11 * dy[:,ii+1]
+
+    # Return
+    return b.reshape(dshape + pshape + ashape)
+
+def laplace_coefficient(s, j, alpha):
+    """
+    Compute Laplace Coefficients b_s^j(alpha) (cf. laplace_coefficientX).
 
     See Murray & Dermott (1999), Eq. (7.33), Page 280 for Test Case.
 
     @param: s - Half Integer (1/2, 3/2, ...)
-    @param: j - Integer (1, 2, 3, ...)
-    @param: alpha - Semi-Major Axis Ratio (alpha < 1)
-    @return: beta_s^j(alpha) - [Float]
-    """
-    
-    # Leading Term
-    if j == 0:
-        ss = 1.0
-    else:
-        ss = s
-        for jj in range(1,j):
-            ss *= (s+jj)    
-    term_01 = ss / np.math.factorial(j) * alpha**j
-    
-    # Cast
-    j = float(j)
-    
-    # Terms in Square Brackets
-    term_02 = s * ( s + j ) / \
-                  ( j + 1.0 ) * alpha**2.0 
-    
-    term_03 = s * ( s + 1.0 ) * \
-                  ( s + j ) * \
-                  ( s + j + 1.0 ) \
-                  / \
-                  ( 2.0 * \
-                    ( j + 1.0 ) * \
-                    ( j + 2.0 ) ) * alpha**4.0
-
-    term_04 = s * ( s + 1.0 ) * \
-                ( s + 2.0 ) * \
-                ( s + j ) * \
-                ( s + j + 1.0 ) * \
-                ( s + j + 2.0 ) \
-                / \
-                ( 2.0 * \
-                  3.0 * \
-                  ( j + 1.0 ) * \
-                  ( j + 2.0 ) * \
-                  ( j + 3.0 ) ) * alpha**6.0
-        
-    term_05 = s * ( s + 1.0 ) * \
-                  ( s + 2.0 ) * \
-                  ( s + 3.0 ) * \
-                  ( s + j ) * \
-                  ( s + j + 1.0 ) * \
-                  ( s + j + 2.0 ) * \
-                  ( s + j + 3.0 ) \
-                  / \
-                  ( 2.0 * \
-                    3.0 * \
-                    4.0 * \
-                    ( j + 1.0 ) * \
-                    ( j + 2.0 ) * \
-                    ( j + 3.0 ) * \
-                    ( j + 4.0 ) ) * alpha**8.0
-        
-    term_06 = s * ( s + 1.0 ) * \
-                  ( s + 2.0 ) * \
-                  ( s + 3.0 ) * \
-                  ( s + 4.0 ) * \
-                  ( s + j ) * \
-                  ( s + j + 1.0 ) * \
-                  ( s + j + 2.0 ) * \
-                  ( s + j + 3.0 ) * \
-                  ( s + j + 4.0 ) \
-                  / \
-                  ( \
-                    2.0 * \
-                    3.0 * \
-                    4.0 * \
-                    5.0 * \
-                    ( j + 1.0 ) * \
-                    ( j + 2.0 ) * \
-                    ( j + 3.0 ) * \
-                    ( j + 4.0 ) * \
-                    ( j + 5.0 ) ) * alpha**10.0
-        
-    term_07 = s * ( s + 1.0 ) * \
-                  ( s + 2.0 ) * \
-                  ( s + 3.0 ) * \
-                  ( s + 4.0 ) * \
-                  ( s + 5.0 ) * \
-                  ( s + j ) * \
-                  ( s + j + 1.0 ) * \
-                  ( s + j + 2.0 ) * \
-                  ( s + j + 3.0 ) * \
-                  ( s + j + 4.0 ) * \
-                  ( s + j + 5.0 ) \
-                  / \
-                  ( \
-                    2.0 * \
-                    3.0 * \
-                    4.0 * \
-                    5.0 * \
-                    6.0 * \
-                    ( j + 1.0 ) * \
-                    ( j + 2.0 ) * \
-                    ( j + 3.0 ) * \
-                    ( j + 4.0 ) * \
-                    ( j + 5.0 ) * \
-                    ( j + 6.0 ) ) * alpha**12.0
-    
-    term_08 = s * ( s + 1.0 ) * \
-                  ( s + 2.0 ) * \
-                  ( s + 3.0 ) * \
-                  ( s + 4.0 ) * \
-                  ( s + 5.0 ) * \
-                  ( s + 6.0 ) * \
-                  ( s + j ) * \
-                  ( s + j + 1.0 ) * \
-                  ( s + j + 2.0 ) * \
-                  ( s + j + 3.0 ) * \
-                  ( s + j + 4.0 ) * \
-                  ( s + j + 5.0 ) * \
-                  ( s + j + 6.0 ) \
-                  / \
-                  ( \
-                    2.0 * \
-                    3.0 * \
-                    4.0 * \
-                    5.0 * \
-                    6.0 * \
-                    7.0 * \
-                    ( j + 1.0 ) * \
-                    ( j + 2.0 ) * \
-                    ( j + 3.0 ) * \
-                    ( j + 4.0 ) * \
-                    ( j + 5.0 ) * \
-                    ( j + 6.0 ) * \
-                    ( j + 7.0 ) ) * alpha**14.0
-        
-    term_09 = s * ( s + 1.0 ) * \
-                  ( s + 2.0 ) * \
-                  ( s + 3.0 ) * \
-                  ( s + 4.0 ) * \
-                  ( s + 5.0 ) * \
-                  ( s + 6.0 ) * \
-                  ( s + 7.0 ) * \
-                  ( s + j ) * \
-                  ( s + j + 1.0 ) * \
-                  ( s + j + 2.0 ) * \
-                  ( s + j + 3.0 ) * \
-                  ( s + j + 4.0 ) * \
-                  ( s + j + 5.0 ) * \
-                  ( s + j + 6.0 ) * \
-                  ( s + j + 7.0 ) \
-                  / \
-                  ( \
-                    2.0 * \
-                    3.0 * \
-                    4.0 * \
-                    5.0 * \
-                    6.0 * \
-                    7.0 * \
-                    8.0 * \
-                    ( j + 1.0 ) * \
-                    ( j + 2.0 ) * \
-                    ( j + 3.0 ) * \
-                    ( j + 4.0 ) * \
-                    ( j + 5.0 ) * \
-                    ( j + 6.0 ) * \
-                    ( j + 7.0 ) * \
-                    ( j + 8.0 ) ) * alpha**16.0
-        
-    term_10 = s * ( s + 1.0 ) * \
-                  ( s + 2.0 ) * \
-                  ( s + 3.0 ) * \
-                  ( s + 4.0 ) * \
-                  ( s + 5.0 ) * \
-                  ( s + 6.0 ) * \
-                  ( s + 7.0 ) * \
-                  ( s + 8.0 ) * \
-                  ( s + j ) * \
-                  ( s + j + 1.0 ) * \
-                  ( s + j + 2.0 ) * \
-                  ( s + j + 3.0 ) * \
-                  ( s + j + 4.0 ) * \
-                  ( s + j + 5.0 ) * \
-                  ( s + j + 6.0 ) * \
-                  ( s + j + 7.0 ) * \
-                  ( s + j + 8.0 ) \
-                  / \
-                  ( \
-                    2.0 * \
-                    3.0 * \
-                    4.0 * \
-                    5.0 * \
-                    6.0 * \
-                    7.0 * \
-                    8.0 * \
-                    9.0 * \
-                    ( j + 1.0 ) * \
-                    ( j + 2.0 ) * \
-                    ( j + 3.0 ) * \
-                    ( j + 4.0 ) * \
-                    ( j + 5.0 ) * \
-                    ( j + 6.0 ) * \
-                    ( j + 7.0 ) * \
-                    ( j + 8.0 ) * \
-                    ( j + 9.0 ) ) * alpha**18.0
-
-    # Laplace Coefficient
-    beta = term_01 * ( 1.0 + term_02 + term_03 + term_04 + \
-                             term_05 + term_06 + term_07 + \
-                             term_08 + term_09 + term_10 )
-    beta *= 2.0
-    
+    @param: j - Integer (0, 1, 2, ...)
+    @param: alpha - Semi-Major Axis Ratio (alpha < 1) [Float or Array]
+    @return: b_s^j(alpha) - [Float or Array]
+    """
+
+    return laplace_coefficientX(s, j, alpha)[()]
+
+
+def secular_matrices(a, m, G=1.0, M=1.0, S=None, T=None):
+    """
+    Laplace-Lagrange Secular Matrices A (e, varpi) and B (i, Omega) for N
+    Planets.
+
+    Symmetric form (cf. Nagasawa 2000); same eigenvalues as Murray & Dermott
+    (1999), Eqs. (7.9) - (7.12). With x_jk = a_< / (8 a_>^2) b_3/2^x(a_< / a_>),
+
+      A_jj = 2 / (n_j a_j^2) ( G sum_k m_k N_jk + T_j )
+      A_jk = - 2 G P_jk / (a_j a_k) sqrt(m_j m_k / (n_j n_k))
+      B_jj = - 2 / (n_j a_j^2) ( G sum_k m_k N_jk + S_j )
+      B_jk = 2 G N_jk / (a_j a_k) sqrt(m_j m_k / (n_j n_k))
+
+    where P (N) uses b_3/2^2 (b_3/2^1). Units are set by G and M (G = M = 1
+    for AU/Solar Masses; cf. secular_frequencies_planets_gas for CGS).
+
+    Cf. Murray & Dermott (1999), Sect. 7.3, Pages 274 - 276
+        http://adsabs.harvard.edu/abs/1999ssd..book.....M
+    Cf. Nagasawa (2000), Sect. 2.1, Appendix
+        http://adsabs.harvard.edu/abs/2000AJ....119.1480N
+
+    @param: a - Planet Semi-Major Axes (N) [Array]
+    @param: m - Planet Masses (N) [Array]
+    @param: G, M - Gravitational Constant, Central Mass [Float]
+    @param: S, T - Gas Disk Terms per Planet (N) (cf. s_and_t) [Array]
+    @returns: A, B - Secular Matrices (N x N) (Rad / Time Unit)
+    """
+
+    # Planets
+    a = np.asarray(a, dtype=np.float64)
+    m = np.asarray(m, dtype=np.float64)
+    n = np.sqrt(G * ( M + m ) / a**3.0)
+
+    # Pairwise Laplace Coefficients (Diagonal Masked)
+    a_in = np.minimum(a[:,np.newaxis], a[np.newaxis,:])
+    a_out = np.maximum(a[:,np.newaxis], a[np.newaxis,:])
+    b_1, b_2 = laplace_coefficientX(1.5, [ 1, 2 ], a_in / a_out)
+    offdiag = ~np.eye(len(a), dtype=bool)
+    N_jk = np.where(offdiag, a_in / 8.0 / a_out**2.0 * b_1, 0.0)
+    P_jk = np.where(offdiag, a_in / 8.0 / a_out**2.0 * b_2, 0.0)
+
+    # Diagonal Terms (Planets, Gas)
+    diag = G * np.dot(N_jk, m)
+    A_diag, B_diag = diag.copy(), diag.copy()
+    if T is not None:
+        A_diag += T
+    if S is not None:
+        B_diag += S
+
+    # Matrices
+    cross = np.sqrt(np.outer(m, m) / np.outer(n, n)) / np.outer(a, a)
+    A = - 2.0 * G * P_jk * cross
+    B = 2.0 * G * N_jk * cross
+    A[np.diag_indices(len(a))] = 2.0 / n / a**2.0 * A_diag
+    B[np.diag_indices(len(a))] = - 2.0 / n / a**2.0 * B_diag
+
+    # Return
+    return A, B
+
+def secular_frequencies(a, m, G=1.0, M=1.0, S=None, T=None):
+    """
+    Compute secular eigenfrequencies g_k and f_k for N planets.
+
+    g_k: Perigee (omega) precession frequencies, ascending.
+    f_k: Line of nodes (Omega) precession frequencies, descending (f_1 = 0
+         without gas).
+
+    @param: a, m, G, M, S, T - Cf. secular_matrices
+    @returns: g, f - Eigenfrequencies (N) (Rad / Time Unit) [Numpy Arrays]
+    """
+
+    A, B = secular_matrices(a, m, G=G, M=M, S=S, T=T)
+    g = np.linalg.eigvalsh(A)
+    f = np.linalg.eigvalsh(B)[::-1]
+    return g, f
+
+def secular_frequencies_test_particle(a_p, m_p, a_ast, G=1.0, M=1.0, \
+                                      S=None, T=None):
+    """
+    Compute free secular frequencies g and f of test particles (asteroids)
+    perturbed by N planets, for any number of test particles at once.
+
+      g = 2 / (n a^2) ( G sum_k m_k N_k + T )
+      f = - 2 / (n a^2) ( G sum_k m_k N_k + S )
+
+    with N_k = a_< / (8 a_>^2) b_3/2^1(a_< / a_>), so interior and exterior
+    test particles are both covered (NaN where a equals a planet's a).
+
+    Cf. Murray & Dermott (1999), Eqs. (7.55), (7.56), Page 290
+
+    @param: a_p, m_p - Planet Semi-Major Axes, Masses (N) [Array]
+    @param: a_ast - Test Particle Semi-Major Axes [Float or Array]
+    @param: G, M - Gravitational Constant, Central Mass [Float]
+    @param: S, T - Gas Disk Terms at a_ast (cf. s_and_t) [Float or Array]
+    @returns: g, f - Frequencies, Shape of a_ast (Rad / Time Unit)
+    """
+
+    # Test Particles, Planets
+    a_ast = np.asarray(a_ast, dtype=np.float64)
+    a_p = np.asarray(a_p, dtype=np.float64)
+    m_p = np.asarray(m_p, dtype=np.float64)
+    n_ast = np.sqrt(G * M / a_ast**3.0)
+
+    # Laplace Coefficients (Test Particles x Planets)
+    a_in = np.minimum(a_ast[...,np.newaxis], a_p)
+    a_out = np.maximum(a_ast[...,np.newaxis], a_p)
+    N_k = a_in / 8.0 / a_out**2.0 * laplace_coefficientX(1.5, 1, a_in / a_out)
+
+    # Frequencies
+    planets = G * np.dot(N_k, m_p)
+    g = 2.0 / n_ast / a_ast**2.0 * ( planets + ( 0.0 if T is None else T ) )
+    f = - 2.0 / n_ast / a_ast**2.0 * ( planets + ( 0.0 if S is None else S ) )
+
+    # Return
+    return g, f
+
+
+# Gas Disk S/T Table: Disk Cache (Home Directory), Per-Process Memo
+gas_table_fname = os.path.join(os.path.expanduser("~"), ".g3cache", \
+                               "GasST_%s_%.4f_%.4f_%i.npz")
+_gas_tables = {}
+
+# Gas Disk S/T Table: Model Version. Bump when the integration grids of
+# s_and_t change (the disk constants are hashed, cf. gas_table_model).
+gas_table_version = 1
+
+# Gas Disk S/T Table: Default Range. The radial grid of s_and_t switches
+# branches where 0.98 a = r_in (0.1 AU) and 1.02 a = r_out (35 AU).
+gas_table_amin = 0.1 / 0.98 * 1.001
+gas_table_amax = 35.0 / 1.02 * 0.999
+
+
+def gas_table_model():
+    """
+    Disk Model Tag of the S/T Table: Hash of the Disk Constants (cf.
+    gas_helpers.st_*, which mirror potential_helpers.f90) and of
+    gas_table_version. Tables of another model are never reused.
+
+    @return: model - Tag (8 Hex Digits) [String]
+    """
+
+    model = ( gas_table_version, gh.st_pi, gh.st_G, gh.st_au, \
+              gh.st_sigma_0, gh.st_r_in, gh.st_r_out, gh.st_alpha, \
+              gh.st_h_0 )
+    return hashlib.md5(repr(model)).hexdigest()[:8]
+
+def build_gas_table(a_min=gas_table_amin, a_max=gas_table_amax, na=512):
+    """
+    Tabulate Gas Disk Terms S, T at t/tau = 0 (Uniform Grid in log a).
+
+    S and T are linear in the surface density, which decays as exp(-t/tau)
+    (cf. potential_helpers.f90), so one table serves all times. The default
+    range stays between the points where the radial grid of s_and_t changes
+    branch (0.102 and 34.3 AU), so S and T are smooth on the table.
+
+    @param: a_min, a_max, na - Semi-Major Axis Grid (AU) [Float, Float, Int]
+    @return: table - { "a", "S", "T" } (AU; CGS) [Dict]
+    """
+
+    a = np.exp(np.linspace(np.log(a_min), np.log(a_max), na))
+    S, T = gas_terms(a, 0.0, tabulated=False)
+    return { "a": a, "S": S, "T": T }
+
+def load_gas_table(a_min=gas_table_amin, a_max=gas_table_amax, na=512, \
+                   cache=True):
+    """
+    Gas Disk S/T Table (cf. build_gas_table). Memoized per process and, if
+    cache is set, stored in gas_table_fname, so the integrals are only done
+    once per machine. File name and file carry the disk model tag (cf.
+    gas_table_model); a cached table of another model is rebuilt. Writing
+    the cache fails silently.
+
+    @param: a_min, a_max, na - Cf. build_gas_table
+    @param: cache - Use/Maintain Disk Cache [Bool]
+    @return: table - { "a", "S", "T" } (AU; CGS) [Dict]
+    """
+
+    # Memo
+    key = (gas_table_model(), a_min, a_max, na)
+    if key in _gas_tables:
+        return _gas_tables[key]
+
+    # Disk Cache (Check Model)
+    fname = gas_table_fname % key
+    table = None
+    if cache and os.path.isfile(fname):
+        try:
+            data = np.load(fname)
+            if str(data["model"]) == key[0]:
+                table = dict((col, data[col]) for col in [ "a", "S", "T" ])
+        except (IOError, ValueError, KeyError):
+            table = None
+
+    # Build, Write (Atomic Rename)
+    if table is None:
+        table = build_gas_table(a_min=a_min, a_max=a_max, na=na)
+        if cache:
+            try:
+                if not os.path.isdir(os.path.dirname(fname)):
+                    os.makedirs(os.path.dirname(fname))
+                ftmp = "%s.%i.tmp.npz" % (fname[:-4], os.getpid())
+                np.savez(ftmp, model=key[0], **table)
+                os.rename(ftmp, fname)
+            except (IOError, OSError):
+                pass
+
+    # Return
+    _gas_tables[key] = table
+    return table
+
+def gas_terms(a_ast, t_over_tau, tabulated=True):
+    """
+    Gas Disk Terms S, T at Semi-Major Axes a_ast (AU; CGS Output).
+
+    Tabulated: cubic (4-point Lagrange) interpolation in log a of the table
+    (cf. load_gas_table), scaled by exp(-t/tau). With the default grid,
+    the relative error is < 1e-5 from 0.15 to 34 AU (up to ~1e-3 within
+    0.01 AU of the inner table edge). Points outside the table are
+    integrated directly.
+    Direct: one potential_helpers.s_and_t integral per a_ast, or
+    gas_helpers.s_and_tX if the f2py module is not built.
+
+    @param: a_ast - Semi-Major Axes (AU) [Float or Array]
+    @param: t_over_tau - Exponential Decay Factor for Gas Density (-)
+    @param: tabulated - Use Table [Bool]
+    @returns: S, T - Gas Disk Terms, Shape of a_ast (CGS)
+    """
+
+    a_ast = np.asarray(a_ast, dtype=np.float64)
+    a = a_ast.ravel()
+    S_ast = np.zeros(a.size) * np.nan
+    T_ast = np.zeros(a.size) * np.nan
+
+    # Table Lookup
+    idirect = np.arange(a.size)
+    if tabulated:
+        table = load_gas_table()
+        u_grid = np.log(table["a"])
+        h = ( u_grid[-1] - u_grid[0] ) / ( len(u_grid) - 1 )
+        inside = ( a >= table["a"][0] ) & ( a <= table["a"][-1] )
+        u = np.log(a[inside])
+        ii = np.clip(np.floor(( u - u_grid[0] ) / h).astype(np.int64) - 1, \
+                     0, len(u_grid) - 4)
+        t = ( u - u_grid[ii] ) / h
+        w = [ - ( t - 1.0 ) * ( t - 2.0 ) * ( t - 3.0 ) / 6.0, \
+              t * ( t - 2.0 ) * ( t - 3.0 ) / 2.0, \
+              - t * ( t - 1.0 ) * ( t - 3.0 ) / 2.0, \
+              t * ( t - 1.0 ) * ( t - 2.0 ) / 6.0 ]
+        decay = np.exp(-t_over_tau)
+        S_ast[inside] = decay * sum(w[k] * table["S"][ii+k] for k in range(4))
+        T_ast[inside] = decay * sum(w[k] * table["T"][ii+k] for k in range(4))
+        idirect = np.nonzero(~inside)[0]
+
+    # Direct Integration
+    if ph is not None:
+        for ia in idirect:
+            S_ast[ia], T_ast[ia] = ph.s_and_t(a[ia], t_over_tau)
+    elif len(idirect) > 0:
+        S_ast[idirect], T_ast[idirect] = gh.s_and_tX(a[idirect], t_over_tau)
+
     # Return
-    return beta
+    return S_ast.reshape(a_ast.shape), T_ast.reshape(a_ast.shape)
 
 
 def secular_frequencies_planets(a_1, a_2, m_1, m_2):
@@ -263,35 +522,9 @@ def secular_frequencies_planets(a_1, a_2, m_1, m_2):
     """
 
     # Solar System Units
-    G = 1.0; M = 1.0
-
-    # Mean Motion
-    n_1 = np.sqrt(G * (M + m_1) / a_1**3.0)
-    n_2 = np.sqrt(G * (M + m_2) / a_2**3.0)
-
-    # Debug
-    # print "n_j = %.6f deg/yr" % (n_j * C.r2d * C.twopi)
-    # print "n_s = %.6f deg/yr" % (n_s * C.r2d * C.twopi)
-
-    # What are these called?
-    P_12 = a_1 / 8.0 / a_2**2.0 * laplace_coefficient(1.5, 2, a_1 / a_2)
-    N_12 = a_1 / 8.0 / a_2**2.0 * laplace_coefficient(1.5, 1, a_1 / a_2)
-
-    # Matrix Elements
-    A_11 = 2.0 / n_1 / a_1**2.0 * ( G * m_2 * N_12 )
-    A_22 = 2.0 / n_2 / a_2**2.0 * ( G * m_1 * N_12 )
-    A_12 = - 2.0 * G * P_12 / a_1 / a_2 * np.sqrt( m_1 * m_2 / n_1 / n_2 )
-
-    B_11 = - 2.0 / n_1 / a_1**2.0 * ( G * m_2 * N_12 )
-    B_22 = - 2.0 / n_2 / a_2**2.0 * ( G * m_1 * N_12 )
-    B_12 = - 2.0 * G * N_12 / a_1 / a_2 * np.sqrt( m_1 * m_2 / n_1 / n_2 )
-
-    # Frequencies (Rad/Twopi) = Eigenvalues of Matrices A and B
-    # Converstion: Multiply (* C.r2d * 3600.0 * C.twopi) [Arcsec/Year]
-    g_1 = 0.5 * (A_11 + A_22 - np.sqrt( (A_11 - A_22)**2.0 + 4.0 * A_12**2.0 ))
-    g_2 = 0.5 * (A_11 + A_22 + np.sqrt( (A_11 - A_22)**2.0 + 4.0 * A_12**2.0 ))
-    f_1 = 0.5 * (B_11 + B_22 + np.sqrt( (B_11 - B_22)**2.0 + 4.0 * B_12**2.0 ))
-    f_2 = 0.5 * (B_11 + B_22 - np.sqrt( (B_11 - B_22)**2.0 + 4.0 * B_12**2.0 ))
+    g, f = secular_frequencies([ a_1, a_2 ], [ m_1, m_2 ])
+    g_1, g_2 = g
+    f_1, f_2 = f
 
     # Return Frequencies
     return g_1, g_2, f_1, f_2
@@ -321,39 +554,19 @@ def secular_frequencies_planets_gas(a_1, a_2, m_1, m_2, t_over_tau):
     """
 
     # Gas Terms (Internal CGS Conversion - Needs AU!)
-    S_1, T_1 = ph.s_and_t(a_1, t_over_tau)
-    S_2, T_2 = ph.s_and_t(a_2, t_over_tau)
+    S_p, T_p = gas_terms([ a_1, a_2 ], t_over_tau)
 
     # CGS 
     G = C.G_cgs; Msun = C.msun * 1000.0
-    m_1 *= Msun
-    m_2 *= Msun
-    a_1 *= C.au2km * 1000.0 * 100.0
-    a_2 *= C.au2km * 1000.0 * 100.0
-
-    # What are these called?
-    P_12 = a_1 / 8.0 / a_2**2.0 * laplace_coefficient(1.5, 2, a_1 / a_2)
-    N_12 = a_1 / 8.0 / a_2**2.0 * laplace_coefficient(1.5, 1, a_1 / a_2)
-
-    # Mean Motion
-    n_1 = np.sqrt(G * (Msun + m_1) / a_1**3.0)
-    n_2 = np.sqrt(G * (Msun + m_2) / a_2**3.0)
-
-    # Matrix Elements
-    A_11 = 2.0 / n_1 / a_1**2.0 * ( G * m_2 * N_12 + T_1 )
-    A_22 = 2.0 / n_2 / a_2**2.0 * ( G * m_1 * N_12 + T_2 )
-    A_12 = - 2.0 * G * P_12 / a_1 / a_2 * np.sqrt( m_1 * m_2 / n_1 / n_2 )
-
-    B_11 = - 2.0 / n_1 / a_1**2.0 * ( G * m_2 * N_12 + S_1 )
-    B_22 = - 2.0 / n_2 / a_2**2.0 * ( G * m_1 * N_12 + S_2 )
-    B_12 = - 2.0 * G * N_12 / a_1 / a_2 * np.sqrt( m_1 * m_2 / n_1 / n_2 )
+    au2cm = C.au2km * 1000.0 * 100.0
 
     # Frequencies (Rad/Second) = Eigenvalues of Matrices A and B
     # Conversion: Multiply (C.r2d*3600.0) * (3600.0*365.25*24.0) [Arcsec/Year]
-    g_1 = 0.5 * (A_11 + A_22 - np.sqrt( (A_11 - A_22)**2.0 + 4.0 * A_12**2.0 ))
-    g_2 = 0.5 * (A_11 + A_22 + np.sqrt( (A_11 - A_22)**2.0 + 4.0 * A_12**2.0 ))
-    f_1 = 0.5 * (B_11 + B_22 + np.sqrt( (B_11 - B_22)**2.0 + 4.0 * B_12**2.0 ))
-    f_2 = 0.5 * (B_11 + B_22 - np.sqrt( (B_11 - B_22)**2.0 + 4.0 * B_12**2.0 ))
+    g, f = secular_frequencies(np.array([ a_1, a_2 ]) * au2cm, \
+                               np.array([ m_1, m_2 ]) * Msun, \
+                               G=G, M=Msun, S=S_p, T=T_p)
+    g_1, g_2 = g
+    f_1, f_2 = f
 
     # Return Frequencies
     return g_1, g_2, f_1, f_2
@@ -379,12 +592,13 @@ def secular_frequencies_js_today():
     g_1, g_2, f_1, f_2 = secular_frequencies_planets(a_j, a_s, m_j, m_s)
 
     # Debug
-    # For the 9-th order series expansion of the Laplace coefficients, we
+    # With converged Laplace coefficients (the former 9-th order series
+    # expansion gave g_1 = 9.637822, g_2 = 6.100148, f_2 = -7.063930), we
     # should get the following frequencies
-    # g_1 = 9.637822 10^-4 deg/yr
-    # g_2 = 6.100148 10^-3 deg/yr
+    # g_1 = 9.638274 10^-4 deg/yr
+    # g_2 = 6.100371 10^-3 deg/yr
     # f_1 = 0.000000
-    # f_2 = -7.063930 10^-3 deg/yr
+    # f_2 = -7.064198 10^-3 deg/yr
     # print "g_1 = %.6f 10^-4 deg/yr" % (g_1 * C.r2d * C.twopi * 1.0e4)
     # print "g_2 = %.6f 10^-3 deg/yr" % (g_2 * C.r2d * C.twopi * 1.0e3)
     # print "f_1 = %.6f" % (f_1 * C.r2d * C.twopi)
@@ -406,21 +620,10 @@ def secular_frequencies_planets_and_asteroid(a_1, a_2, m_1, m_2, a_ast):
     @returns: f - Asteroid Line of Nodes Precession Frequencies (Rad/Twopi)
     """
 
-    # Solar System Units
-    G = M = GM = 1.0
-
-    # Mean Motion
-    n_ast = np.sqrt(GM/a_ast**3.0)
-
-    # What are these called?
-    N_1 = a_ast / 8.0 / a_1**2.0 * laplace_coefficient(1.5, 1, a_ast / a_1)
-    N_2 = a_ast / 8.0 / a_2**2.0 * laplace_coefficient(1.5, 1, a_ast / a_2)
-
     # Frequencies (Rad/Twopi)
     # Converstion: Multiply (* C.r2d * 3600.0 * C.twopi) [Arcsec/Year]
-    g = 2.0 * G / n_ast / a_ast**2.0 * ( m_1 * N_1 + m_2 * N_2 )
-    # f = - 2.0 * G / n_ast / a_ast**2.0 * ( m_1 * N_1 + m_2 * N_2 )
-    f = -g
+    g, f = secular_frequencies_test_particle([ a_1, a_2 ], [ m_1, m_2 ], \
+                                             a_ast)
 
     # Return Frequencies 
     return g, f
@@ -432,9 +635,8 @@ def secular_frequencies_planets_and_asteroid_gas(a_1, a_2, m_1, m_2, \
     Compute secular frequencies g and f for an asteroid (massless test
     particles) in the presence of two massive planets.
 
-    Be careful if you request too many (>~10) samples for a_ast. The code
-    runs a for-loop (in Fortran) to integrate the disk potential for each
-    value of a_ast, which can take a long time if you request many samples.
+    The disk terms come from the S/T table (cf. gas_terms), so many samples
+    of a_ast are cheap once the table exists.
 
     @param: a_1, a_2 - Planet Semi-Major Axis of Planets (AU)
     @param: m_1, m_2 - Planet Masses (Solar Masses)
@@ -445,215 +647,203 @@ def secular_frequencies_planets_and_asteroid_gas(a_1, a_2, m_1, m_2, \
     """
 
     # Gas Terms (Internal CGS Conversion - Needs AU!)
-    if np.isscalar(a_ast):
-        S_ast, T_ast = ph.s_and_t(a_ast, t_over_tau)
-    else:
-        S_ast = np.zeros_like(a_ast) * np.nan
-        T_ast = np.zeros_like(a_ast) * np.nan
-        for ia, a_ast_loc in enumerate(a_ast):
-            S_ast[ia], T_ast[ia] = ph.s_and_t(a_ast_loc, t_over_tau)
+    S_ast, T_ast = gas_terms(a_ast, t_over_tau)
 
     # CGS 
     G = C.G_cgs; Msun = C.msun * 1000.0
-    m_1 *= Msun
-    m_2 *= Msun
-    a_1 *= C.au2km * 1000.0 * 100.0
-    a_2 *= C.au2km * 1000.0 * 100.0
-    a_ast *= C.au2km * 1000.0 * 100.0
-
-    # Mean Motion
-    n_ast = np.sqrt(G*Msun/a_ast**3.0)
-
-    # What are these called?
-    N_1 = a_ast / 8.0 / a_1**2.0 * laplace_coefficient(1.5, 1, a_ast / a_1)
-    N_2 = a_ast / 8.0 / a_2**2.0 * laplace_coefficient(1.5, 1, a_ast / a_2)
+    au2cm = C.au2km * 1000.0 * 100.0
 
     # Frequencies (Rad/s)
     # Conversion: Multiply (C.r2d*3600.0) * (3600.0*365.25*24.0) [Arcsec/Year]
-    g = 2.0 * G / n_ast / a_ast**2.0 * ( m_1 * N_1 + m_2 * N_2 ) + \
-        2.0 / n_ast / a_ast**2.0 * T_ast
-    f = - 2.0 * G / n_ast / a_ast**2.0 * ( m_1 * N_1 + m_2 * N_2 ) - \
-        2.0 / n_ast / a_ast**2.0 * S_ast
+    g, f = secular_frequencies_test_particle(np.array([ a_1, a_2 ]) * au2cm, \
+                                             np.array([ m_1, m_2 ]) * Msun, \
+                                             np.asarray(a_ast) * au2cm, \
+                                             G=G, M=Msun, S=S_ast, T=T_ast)
 
     # Return Frequencies 
     return g, f
 
 
-def secular_resonance_location(a_1, a_2, m_1, m_2):
+# Secular Resonances: Result Layout
+resonance_dtype = [ ("name", "S8"), ("kind", "S1"), ("k", np.int64), \
+                    ("a", np.float64), ("freq", np.float64) ]
+
+# Optional Brent Solver
+try:
+    from scipy.optimize import brentq
+except ImportError:
+    brentq = None
+
+
+def _bracket_roots(y):
+    """
+    Grid Intervals [i, i+1] Containing a Sign Change (or a Zero at i) of y.
     """
-    Compute Location of Secular Resonances.
 
-    @param: a_1, a_2 - Planet Semi-Major Axis of Planets (AU)
-    @param: m_1, m_2 - Planet Masses (Solar Masses)
-    @returns: a_nu_5, a_nu_6 - Perigee (omega) Precession Res. (AU)
-    @returns: a_nu_15, a_nu_16 - Line of Nodes (Omega) Precession Res. (AU)
+    with np.errstate(invalid='ignore'):
+        return np.nonzero(( y[:-1] * y[1:] < 0.0 ) | ( y[:-1] == 0.0 ))[0]
+
+def _refine_roots(func, lo, hi, tol, maxiter=100):
+    """
+    Refine Bracketed Roots of func to Absolute Tolerance tol.
+
+    Uses Brent's method (scipy.optimize.brentq) per bracket if scipy is
+    available, otherwise bisection of all brackets at once.
     """
 
-    # Scanning Range, Semi-Major Axis
-    a_ast = np.mgrid[0.1:5.0:0.01]
+    lo, hi = np.asarray(lo, dtype=np.float64), np.asarray(hi, dtype=np.float64)
+    if len(lo) == 0:
+        return lo
+
+    # Brent
+    if brentq is not None:
+        return np.array([ brentq(lambda x: float(func(x)), l, h, \
+                                 xtol=tol, maxiter=maxiter) \
+                          for l, h in zip(lo, hi) ])
+
+    # Bisection Fallback
+    y_lo = func(lo)
+    for ii in range(maxiter):
+        if np.all(hi - lo <= 2.0 * tol):
+            break
+        mid = 0.5 * ( lo + hi )
+        y_mid = func(mid)
+        left = np.sign(y_mid) == np.sign(y_lo)
+        lo, y_lo = np.where(left, mid, lo), np.where(left, y_mid, y_lo)
+        hi = np.where(left, hi, mid)
+    return 0.5 * ( lo + hi )
+
+def locate_secular_resonances(func, g_k, f_k, a_min=0.1, a_max=5.0, \
+                              da=0.1, tol=1.0e-6, first_g=5, first_f=15):
+    """
+    Locate Secular Resonances g(a) = g_k and f(a) = f_k of Test Particles.
+
+    Sweeps a coarse grid in one vectorized call to func, brackets every sign
+    change of g - g_k and f - f_k, and refines each root to tol (Brent). All
+    roots are returned, e.g. both locations of nu_16 with a gas disk. Roots
+    closer than da to each other (or touching without a sign change) can be
+    missed; use a finer da in that case.
+
+    @param: func - Test Particle Frequencies, func(a) -> g, f [Callable]
+    @param: g_k, f_k - Planetary Eigenfrequencies [Arrays]
+    @param: a_min, a_max, da - Coarse Grid (AU) [Float]
+    @param: tol - Absolute Tolerance on Locations (AU) [Float]
+    @param: first_g, first_f - Name Index of First Mode (nu_5, nu_15) [Int]
+    @returns: res - Resonances (name, kind, k, a, freq), Sorted by Name and
+                    Location [Numpy Structured Array]
+    """
+
+    # Coarse Sweep
+    a_coarse = np.arange(a_min, a_max + 0.5 * da, da)
+    g, f = func(a_coarse)
+
+    # Bracket & Refine
+    res = []
+    for kind, first, freqs, y in [ ("g", first_g, g_k, g), \
+                                   ("f", first_f, f_k, f) ]:
+        iy = 0 if kind == "g" else 1
+        for k, freq in enumerate(freqs):
+            ib = _bracket_roots(y - freq)
+            roots = _refine_roots(lambda x: func(x)[iy] - freq, \
+                                  a_coarse[ib], a_coarse[ib+1], tol)
+            for root in roots:
+                res.append(("nu_%i" % (first + k), kind, k, root, freq))
 
-    # Compute Planetary Frequencies
-    g_1, g_2, f_1, f_2 = secular_frequencies_planets(a_1, a_2, m_1, m_2)
+    # Return
+    return np.array(res, dtype=resonance_dtype)
 
-    # Compute Asteroid (Massless Test Particle) Frequencies
-    g, f = secular_frequencies_planets_and_asteroid(a_1, a_2, m_1, m_2, a_ast)
+def secular_resonances(a_p, m_p, t_over_tau=None, a_min=0.1, a_max=5.0, \
+                       da=0.1, tol=1.0e-6, tabulated=True):
+    """
+    Locate Secular Resonances of N Planets, Optionally w/ Gas Disk.
+
+    @param: a_p, m_p - Planet Semi-Major Axes (AU), Masses (Solar Masses)
+    @param: t_over_tau - Exponential Decay Factor for Gas Density (None for
+                         No Gas) (-)
+    @param: a_min, a_max, da, tol - Cf. locate_secular_resonances (AU)
+    @param: tabulated - Gas Terms from Table (cf. gas_terms) [Bool]
+    @returns: res - Resonances (cf. locate_secular_resonances); freq in
+                    Rad/Twopi (No Gas) or Rad/Second (Gas)
+    """
+
+    a_p = np.asarray(a_p, dtype=np.float64)
+    m_p = np.asarray(m_p, dtype=np.float64)
+
+    # No Gas (Solar System Units)
+    if t_over_tau is None:
+        g_k, f_k = secular_frequencies(a_p, m_p)
+        func = lambda a: secular_frequencies_test_particle(a_p, m_p, a)
+
+    # Gas (CGS)
+    else:
+        G = C.G_cgs; Msun = C.msun * 1000.0
+        au2cm = C.au2km * 1000.0 * 100.0
+        S_p, T_p = gas_terms(a_p, t_over_tau, tabulated=tabulated)
+        g_k, f_k = secular_frequencies(a_p * au2cm, m_p * Msun, \
+                                       G=G, M=Msun, S=S_p, T=T_p)
+        def func(a):
+            S_ast, T_ast = gas_terms(a, t_over_tau, tabulated=tabulated)
+            return secular_frequencies_test_particle(a_p * au2cm, \
+                                                     m_p * Msun, \
+                                                     np.asarray(a) * au2cm, \
+                                                     G=G, M=Msun, \
+                                                     S=S_ast, T=T_ast)
 
     # Locate
-    arg_nu_5 = np.argwhere(np.diff(np.sign(g-g_1))**2.0 > 1.0e-16).squeeze()
-    arg_nu_6 = np.argwhere(np.diff(np.sign(g-g_2))**2.0 > 1.0e-16).squeeze()
-    arg_nu_15 = np.argwhere(np.diff(np.sign(f-f_1))**2.0 > 1.0e-16).squeeze()
-    arg_nu_16 = np.argwhere(np.diff(np.sign(f-f_2))**2.0 > 1.0e-16).squeeze()
-
-    a_nu_5  = a_ast[arg_nu_5]
-    a_nu_6  = a_ast[arg_nu_6]
-    a_nu_15  = a_ast[arg_nu_15]
-    a_nu_16  = a_ast[arg_nu_16]
-
-    # Write NaN for Non-Existing Resonances
-    if (not np.isscalar(a_nu_5)) and len(a_nu_5) == 0:
-        a_nu_5 = np.nan
-    if (not np.isscalar(a_nu_6)) and len(a_nu_6) == 0:
-        a_nu_6 = np.nan
-    if (not np.isscalar(a_nu_15)) and len(a_nu_15) == 0:
-        a_nu_15 = np.nan
-    if (not np.isscalar(a_nu_16)) and len(a_nu_16) == 0:
-        a_nu_16 = np.nan
+    return locate_secular_resonances(func, g_k, f_k, a_min=a_min, \
+                                     a_max=a_max, da=da, tol=tol)
 
-    # Return
-    return a_nu_5, a_nu_6, a_nu_15, a_nu_16
+def _resonance_tuple(res, names):
+    """
+    Locations per Name: NaN if Absent, Float if Unique, Array Otherwise.
+    """
 
+    out = []
+    for name in names:
+        a = res["a"][res["name"] == name]
+        if len(a) == 0:
+            out.append(np.nan)
+        elif len(a) == 1:
+            out.append(a[0])
+        else:
+            out.append(a)
+    return tuple(out)
 
-def secular_resonance_location_gas(a_1, a_2, m_1, m_2, t_over_tau):
+
+def secular_resonance_location(a_1, a_2, m_1, m_2):
     """
     Compute Location of Secular Resonances.
 
     @param: a_1, a_2 - Planet Semi-Major Axis of Planets (AU)
     @param: m_1, m_2 - Planet Masses (Solar Masses)
-    @param: t_over_tau - Exponential Decay Factor for Gas Density (-)
     @returns: a_nu_5, a_nu_6 - Perigee (omega) Precession Res. (AU)
     @returns: a_nu_15, a_nu_16 - Line of Nodes (Omega) Precession Res. (AU)
     """
 
-    # Compute Planetary Frequencies
-    g_1, g_2, f_1, f_2 = \
-        secular_frequencies_planets_gas(a_1, a_2, m_1, m_2, t_over_tau)
+    # Scan at 0.01 AU, Refine
+    res = secular_resonances([ a_1, a_2 ], [ m_1, m_2 ], da=0.01)
 
-    #
-    # #########################################################################
-    #
-    # Coarse Grid
-    #
-    # #########################################################################
-    #
+    # Return
+    return _resonance_tuple(res, [ "nu_5", "nu_6", "nu_15", "nu_16" ])
 
-    # Grid at 0.1 AU Resolution
-    a_coarse = np.mgrid[0.1:5.0:0.1]
 
-    # Compute Asteroid (Massless Test Particle) Frequencies
-    g = np.zeros_like(a_coarse)
-    f = np.zeros_like(a_coarse)
-    for ii, a_loc in enumerate(a_coarse):
-        g[ii], f[ii] = \
-            secular_frequencies_planets_and_asteroid_gas(a_1, a_2, m_1, m_2, \
-                                                         a_loc.copy(), \
-                                                         t_over_tau)
+def secular_resonance_location_gas(a_1, a_2, m_1, m_2, t_over_tau):
+    """
+    Compute Location of Secular Resonances.
 
-    # Locate
-    arg_nu_5 = np.argwhere(np.diff(np.sign(g-g_1))**2.0 > 1.0e-16).squeeze()
-    arg_nu_6 = np.argwhere(np.diff(np.sign(g-g_2))**2.0 > 1.0e-16).squeeze()
-    arg_nu_15 = np.argwhere(np.diff(np.sign(f-f_1))**2.0 > 1.0e-16).squeeze()
-    arg_nu_16 = np.argwhere(np.diff(np.sign(f-f_2))**2.0 > 1.0e-16).squeeze()
-
-    a_nu_5  = a_coarse[arg_nu_5]
-    a_nu_6  = a_coarse[arg_nu_6]
-    a_nu_15  = a_coarse[arg_nu_15]
-    a_nu_16  = a_coarse[arg_nu_16]
-
-    # Write NaN for Non-Existing Resonances
-    if (not np.isscalar(a_nu_5)) and len(a_nu_5) == 0:
-        a_nu_5 = np.nan
-    if (not np.isscalar(a_nu_6)) and len(a_nu_6) == 0:
-        a_nu_6 = np.nan
-    if (not np.isscalar(a_nu_15)) and len(a_nu_15) == 0:
-        a_nu_15 = np.nan
-    if (not np.isscalar(a_nu_16)) and len(a_nu_16) == 0:
-        a_nu_16 = np.nan
-
-    #
-    # #########################################################################
-    #
-    # Refined Grid
-    #
-    # #########################################################################
-    #
-
-    # Fine Grid @ 0.01 AU Resolution
-    a_fine = np.array([])
-
-    if not np.isnan(a_nu_5):
-        a_fine = \
-            np.concatenate([a_fine, np.mgrid[a_nu_5-0.1:a_nu_5+0.11:0.01]])
-
-    if not np.isnan(a_nu_6):
-        a_fine = \
-            np.concatenate([a_fine, np.mgrid[a_nu_6-0.1:a_nu_6+0.11:0.01]])
-
-    if not np.isnan(a_nu_15):
-        a_fine = \
-            np.concatenate([a_fine, np.mgrid[a_nu_15-0.1:a_nu_15+0.11:0.01]])
-
-    # Can occur twice!
-    if np.isscalar(a_nu_16):
-        if not np.isnan(a_nu_16):
-            a_fine = \
-                np.concatenate([a_fine, \
-                                np.mgrid[a_nu_16-0.11:a_nu_16+0.11:0.01]])
-    else:
-        for a_nu_16_loc in a_nu_16:
-            a_fine = \
-                np.concatenate([a_fine, \
-                                np.mgrid[a_nu_16_loc - 0.11:\
-                                         a_nu_16_loc + 0.11:\
-                                         0.01]])
-
-    # Reorder
-    a_fine = np.sort(a_fine)
-
-    # Inner Cutoff
-    a_fine = a_fine[a_fine>0.1]
-
-    # Compute Asteroid (Massless Test Particle) Frequencies
-    g = np.zeros_like(a_fine)
-    f = np.zeros_like(a_fine)
-    for ii, a_loc in enumerate(a_fine):
-        g[ii], f[ii] = \
-            secular_frequencies_planets_and_asteroid_gas(a_1, a_2, m_1, m_2, \
-                                                         a_loc.copy(), \
-                                                         t_over_tau)
+    @param: a_1, a_2 - Planet Semi-Major Axis of Planets (AU)
+    @param: m_1, m_2 - Planet Masses (Solar Masses)
+    @param: t_over_tau - Exponential Decay Factor for Gas Density (-)
+    @returns: a_nu_5, a_nu_6 - Perigee (omega) Precession Res. (AU)
+    @returns: a_nu_15, a_nu_16 - Line of Nodes (Omega) Precession Res. (AU)
+    """
 
-    # Locate
-    arg_nu_5 = np.argwhere(np.diff(np.sign(g-g_1))**2.0 > 1.0e-16).squeeze()
-    arg_nu_6 = np.argwhere(np.diff(np.sign(g-g_2))**2.0 > 1.0e-16).squeeze()
-    arg_nu_15 = np.argwhere(np.diff(np.sign(f-f_1))**2.0 > 1.0e-16).squeeze()
-    arg_nu_16 = np.argwhere(np.diff(np.sign(f-f_2))**2.0 > 1.0e-16).squeeze()
-
-    a_nu_5  = a_fine[arg_nu_5]
-    a_nu_6  = a_fine[arg_nu_6]
-    a_nu_15  = a_fine[arg_nu_15]
-    a_nu_16  = a_fine[arg_nu_16]
-
-    # Write NaN for Non-Existing Resonances
-    if (not np.isscalar(a_nu_5)) and len(a_nu_5) == 0:
-        a_nu_5 = np.nan
-    if (not np.isscalar(a_nu_6)) and len(a_nu_6) == 0:
-        a_nu_6 = np.nan
-    if (not np.isscalar(a_nu_15)) and len(a_nu_15) == 0:
-        a_nu_15 = np.nan
-    if (not np.isscalar(a_nu_16)) and len(a_nu_16) == 0:
-        a_nu_16 = np.nan
+    # Scan at 0.1 AU, Refine
+    res = secular_resonances([ a_1, a_2 ], [ m_1, m_2 ], \
+                             t_over_tau=t_over_tau, da=0.1)
 
     # Return
-    return a_nu_5, a_nu_6, a_nu_15, a_nu_16
+    return _resonance_tuple(res, [ "nu_5", "nu_6", "nu_15", "nu_16" ])
 
 
 def secular_resonance_location_js_today():
@@ -0,0 +1,629 @@
+"""
+Helpers for Coordinate Stores (Coordinates_XX.hdf5).
+
+Stores are written in the (appendable, queryable) PyTables table format with
+indexed nstep and pid columns, so single steps or step ranges are fetched
+without materialising the whole run. Legacy (fixed format) stores are still
+readable, but must be loaded in full. Use convert_coordinates to upgrade.
+Scripts that loop over steps load them once with preload_fixed.
+
+Alternatively, write_columns derives a memory-mapped layout from a store
+(Coordinates_XX.cols/, one .npy file per column, rows sorted by nstep, plus
+an offset table). read_columns returns numpy views into it, so only the pages
+of the requested steps are touched.
+"""
+
+import os
+import shutil
+import numpy as np
+import pandas as pd
+import io_helpers as ioh
+import kepler_helpers as kh
+import constants as C
+
+# Store Layout
+store_key = "df"
+index_cols = [ "nstep", "pid" ]
+
+
+def _is_table(store):
+    """
+    Table (Queryable) or Fixed (Legacy) Format?
+    """
+
+    return store.get_storer(store_key).is_table
+
+
+def write_coordinates(fname, df, append=False, schema=None):
+    """
+    Write (Append) Coordinates to Store in Table Format.
+
+    The running row index of the store is continued on append, so the index
+    matches what a single write of the stacked dataframe would produce.
+    Column indices are (re)built by index_coordinates once all snapshots are
+    written; building them during appends is wasted effort.
+
+    On append, df is projected and cast to the columns and types of the
+    store, whatever the schema. Raises ValueError if df lacks a stored column
+    (cf. check_append).
+
+    @param: fname - Coordinate Store [String]
+    @param: df - Coordinates (One or More Snapshots) [Pandas Dataframe]
+    @param: append - Append to Existing Store [Bool]
+    @param: schema - Storage Schema (Cf. io_helpers.schemas) [String]
+    """
+
+    df = ioh.apply_schema(df, schema)
+
+    mode = "a" if append else "w"
+    with pd.HDFStore(fname, mode) as store:
+        if append and store_key in store:
+            nrows = store.get_storer(store_key).nrows
+            dtypes = store.select(store_key, start=0, stop=0).dtypes
+            missing = [ col for col in dtypes.index if not col in df.columns ]
+            if len(missing) > 0:
+                raise ValueError("%s: Columns %s Missing, Append with " \
+                                 "Schema %s" % (fname, ", ".join(missing), \
+                                                _schema_of(dtypes)))
+            df = df[list(dtypes.index)].astype(dict(dtypes))
+        else:
+            nrows = 0
+        df = df.reset_index(drop=True)
+        df.index += nrows
+        store.append(store_key, df, format="table", \
+                     data_columns=index_cols, index=False)
+
+
+def coordinates_dtypes(fname):
+    """
+    Columns and Types of a Store (Nothing Else is Read from Table Format).
+
+    @param: fname - Coordinate Store [String]
+    @return: dtypes - Column => Type [Pandas Series]
+    """
+
+    with pd.HDFStore(fname, "r") as store:
+        if _is_table(store):
+            return store.select(store_key, start=0, stop=0).dtypes
+        return store[store_key].dtypes
+
+def _schema_of(dtypes):
+    """
+    Name of the Schema (Cf. io_helpers.schemas) Matching Stored Columns and
+    Types. Projecting Schemas are Tried First. None if Nothing Matches.
+    """
+
+    names = sorted(ioh.schemas.keys(), \
+                   key=lambda name: ( ioh.schemas[name]["columns"] is None, \
+                                      name ))
+    for name in names:
+        schema = ioh.schemas[name]
+        if schema["columns"] is not None and \
+           not set(dtypes.index) <= set(schema["columns"]):
+            continue
+        match = True
+        for col, dtype in dtypes.iteritems():
+            if col in schema["types"]:
+                match &= dtype == np.dtype(schema["types"][col])
+            elif dtype.kind == "f":
+                match &= dtype == np.float64
+        if match:
+            return name
+    return None
+
+def check_append(fname, schema=None):
+    """
+    Can Outputs Parsed with a Schema be Appended to a Store? Checks the
+    columns only, so it runs before any output is parsed. Types are matched
+    by write_coordinates.
+
+    @param: fname - Coordinate Store [String]
+    @param: schema - Storage Schema (Cf. io_helpers.schemas) [String]
+    @return: ok, schema_store - Appendable?, Schema of Store [Bool, String]
+    """
+
+    dtypes = coordinates_dtypes(fname)
+    columns = ioh._get_schema("full" if schema is None else schema)["columns"]
+    ok = columns is None or set(dtypes.index) <= set(columns)
+    return ok, _schema_of(dtypes)
+
+def index_coordinates(fname):
+    """
+    Build Full (Completely Sorted) Indices on nstep and pid.
+
+    @param: fname - Coordinate Store [String]
+    """
+
+    with pd.HDFStore(fname, "a") as store:
+        store.create_table_index(store_key, columns=index_cols, \
+                                 optlevel=9, kind="full")
+
+
+def convert_coordinates(fname):
+    """
+    Convert Legacy (Fixed Format) Store to Table Format. In Place.
+
+    @param: fname - Coordinate Store [String]
+    """
+
+    with pd.HDFStore(fname, "r") as store:
+        if _is_table(store):
+            return
+        df = store[store_key]
+    write_coordinates(fname, df)
+    index_coordinates(fname)
+
+
+def is_fixed(fname):
+    """
+    Legacy (Fixed Format) Store without an Up-to-Date Column Layout?
+    Every read of such a store loads it in full.
+
+    @param: fname - Coordinate Store [String]
+    @return: True/False [Bool]
+    """
+
+    if has_columns(fname):
+        return False
+    with pd.HDFStore(fname, "r") as store:
+        return not _is_table(store)
+
+def preload_fixed(fnames):
+    """
+    Load Legacy (Fixed Format) Stores Once, Rows Grouped by Step.
+
+    Per-step reads of a fixed store load all of it, every step. Scripts
+    looping over steps pass the result to coordinates_nsteps and
+    read_coordinates_and_stack instead, which then pick steps from memory.
+    Other stores are skipped. Prints the upgrade path for each fixed store.
+
+    @param: fnames - Coordinate Stores [List of Strings]
+    @return: fixed - { fname: (df, { nstep: rows }) } [Dict]
+    """
+
+    fixed = {}
+    for fname in fnames:
+        if fname in fixed or not is_fixed(fname):
+            continue
+        print "!! Fixed Format Store, Loading in Full: %s" % fname
+        print "!! Upgrade: store_helpers.convert_coordinates or " + \
+              "Post/coordinates2columns.py"
+        df = read_coordinates(fname)
+        fixed[fname] = (df, df.groupby("nstep").indices)
+    return fixed
+
+def coordinates_nsteps(fnames, fixed=None):
+    """
+    Return Sorted Unique Steps in One or More Stores.
+    Only the nstep column is read from table format stores, and only the
+    offset table if the column layout is up to date.
+
+    @param: fnames - Coordinate Store(s) [String or List of Strings]
+    @param: fixed - Preloaded Fixed Format Stores (Cf. preload_fixed) [Dict]
+    @return: nsteps - Steps [Numpy Array]
+    """
+
+    if np.isscalar(fnames):
+        fnames = [ fnames ]
+    nsteps = []
+    for fname in fnames:
+        if fixed is not None and fname in fixed:
+            nsteps.append(np.unique(fixed[fname][0].nstep))
+            continue
+        if has_columns(fname):
+            nsteps.append(columns_nsteps(columns_dirname(fname)))
+            continue
+        with pd.HDFStore(fname, "r") as store:
+            if _is_table(store):
+                nsteps.append(np.unique(store.select_column(store_key, \
+                                                            "nstep")))
+            else:
+                nsteps.append(np.unique(store[store_key].nstep))
+    return np.unique(np.concatenate(nsteps)).astype(np.int64)
+
+
+def read_coordinates(fname, nstep=None, nstep_range=None, pids=None, \
+                     columns=None):
+    """
+    Read Coordinates for a Single Step, a Step Range, and/or Particle IDs.
+
+    @param: fname - Coordinate Store [String]
+    @param: nstep - Step [Integer]
+    @param: nstep_range - Step Range (Inclusive) [List of 2 Integers]
+    @param: pids - Particle IDs [List of Integers]
+    @param: columns - Columns to Load (None = All) [List of Strings]
+    @return: df - Coordinates [Pandas Dataframe]
+    """
+
+    # Build Query
+    where = []
+    if nstep is not None:
+        where.append("nstep == %i" % nstep)
+    if nstep_range is not None:
+        where.append("nstep >= %i & nstep <= %i" % \
+                     (nstep_range[0], nstep_range[1]))
+    if pids is not None:
+        where.append("pid in [ %s ]" % ", ".join([ "%i" % pid \
+                                                   for pid in pids ]))
+
+    # Load
+    with pd.HDFStore(fname, "r") as store:
+        if _is_table(store):
+            if len(where) > 0:
+                df = store.select(store_key, where=" & ".join(where), \
+                                  columns=columns)
+            else:
+                df = store.select(store_key, columns=columns)
+        else:
+            df = _select_coordinates(store[store_key], nstep=nstep, \
+                                     nstep_range=nstep_range, pids=pids, \
+                                     columns=columns)
+
+    # Return
+    return df
+
+def _select_coordinates(df, nstep=None, nstep_range=None, pids=None, \
+                        columns=None):
+    """
+    Select Rows/Columns of a Dataframe in Memory (Cf. read_coordinates).
+    """
+
+    mask = np.ones(len(df), dtype=bool)
+    if nstep is not None:
+        mask &= np.asarray(df.nstep == nstep)
+    if nstep_range is not None:
+        mask &= np.asarray(df.nstep >= nstep_range[0])
+        mask &= np.asarray(df.nstep <= nstep_range[1])
+    if pids is not None:
+        mask &= np.asarray(df.pid.isin(pids))
+    df = df[mask]
+    if columns is not None:
+        df = df[columns]
+    return df
+
+
+# Memory-Mapped Column Layout (Coordinates_XX.cols/)
+columns_suffix = ".cols"
+columns_offsets = "offsets.npy"
+columns_names = "columns.txt"
+dtype_offsets = np.dtype([ ("nstep", np.int64), \
+                           ("start", np.int64), ("stop", np.int64) ])
+
+def columns_dirname(fname):
+    """
+    In : /some/dir/Coordinates_01.hdf5
+    Out: /some/dir/Coordinates_01.cols
+    """
+
+    return "%s%s" % (os.path.splitext(fname)[0], columns_suffix)
+
+def has_columns(fname):
+    """
+    Column Layout Exists and is Newer than the Store?
+
+    @param: fname - Coordinate Store [String]
+    @return: True/False [Bool]
+    """
+
+    oname = os.path.join(columns_dirname(fname), columns_offsets)
+    return os.path.isfile(oname) and \
+        os.path.getmtime(oname) >= os.path.getmtime(fname)
+
+def write_columns(fname, chunksize=1000000):
+    """
+    Write Memory-Mapped Column Layout for a Coordinate Store.
+
+    Table format stores are copied in chunks of rows, so peak memory is one
+    chunk plus the nstep column (and the sort permutation, should the store
+    not be in nstep order). The layout is written to a temporary directory
+    and moved into place when complete.
+
+    @param: fname - Coordinate Store [String]
+    @param: chunksize - Rows per Chunk [Integer]
+    @return: dname - Column Layout Directory [String]
+    """
+
+    dname = columns_dirname(fname)
+    dname_tmp = "%s.tmp%i" % (dname, os.getpid())
+    if os.path.isdir(dname_tmp):
+        shutil.rmtree(dname_tmp)
+    os.makedirs(dname_tmp)
+
+    with pd.HDFStore(fname, "r") as store:
+
+        # Chunks of Rows
+        if _is_table(store):
+            nrows = store.get_storer(store_key).nrows
+            nstep = np.asarray(store.select_column(store_key, "nstep"))
+            df_tmpl = store.select(store_key, start=0, stop=0)
+            chunks = ( store.select(store_key, start=irow, \
+                                    stop=irow+chunksize) \
+                       for irow in range(0, nrows, chunksize) )
+        else:
+            df = store[store_key]
+            nrows = len(df)
+            nstep = np.asarray(df.nstep)
+            df_tmpl = df.iloc[:0]
+            chunks = [ df ]
+        columns = list(df_tmpl.columns)
+
+        # Sort by Step (Stable), Row Destinations
+        if np.all(nstep[1:] >= nstep[:-1]):
+            dest = None
+        else:
+            order = np.argsort(nstep, kind="mergesort")
+            nstep = nstep[order]
+            dest = np.empty(nrows, dtype=np.int64)
+            dest[order] = np.arange(nrows)
+            del order
+
+        # Offset Table
+        nsteps, starts, counts = np.unique(nstep, return_index=True, \
+                                           return_counts=True)
+        offsets = np.zeros(len(nsteps), dtype=dtype_offsets)
+        offsets["nstep"] = nsteps
+        offsets["start"] = starts
+        offsets["stop"] = starts + counts
+        del nstep
+
+        # One File per Column
+        if nrows == 0:
+            for col in columns:
+                np.save(os.path.join(dname_tmp, "%s.npy" % col), \
+                        np.asarray(df_tmpl[col]))
+        else:
+            maps = {}
+            for col in columns:
+                maps[col] = np.lib.format.open_memmap( \
+                    os.path.join(dname_tmp, "%s.npy" % col), mode="w+", \
+                    dtype=df_tmpl[col].dtype, shape=(nrows,))
+            irow = 0
+            for chunk in chunks:
+                nchunk = len(chunk)
+                for col in columns:
+                    if dest is None:
+                        maps[col][irow:irow+nchunk] = np.asarray(chunk[col])
+                    else:
+                        maps[col][dest[irow:irow+nchunk]] = \
+                            np.asarray(chunk[col])
+                irow += nchunk
+            for col in columns:
+                maps[col].flush()
+            del maps
+
+    # Write Offsets, Columns Last (Marks Layout Complete)
+    with open(os.path.join(dname_tmp, columns_names), "w") as f:
+        f.write("\n".join(columns) + "\n")
+    np.save(os.path.join(dname_tmp, columns_offsets), offsets)
+
+    # Move into Place
+    if os.path.isdir(dname):
+        shutil.rmtree(dname)
+    os.rename(dname_tmp, dname)
+
+    # Return
+    return dname
+
+def _load_offsets(dname):
+    """
+    Load Offset Table and Column Names of a Column Layout.
+    """
+
+    offsets = np.load(os.path.join(dname, columns_offsets))
+    with open(os.path.join(dname, columns_names), "r") as f:
+        columns = f.read().split()
+    return offsets, columns
+
+def columns_nsteps(dname):
+    """
+    Return Steps in a Column Layout (From the Offset Table).
+
+    @param: dname - Column Layout Directory [String]
+    @return: nsteps - Steps [Numpy Array]
+    """
+
+    offsets, _ = _load_offsets(dname)
+    return np.asarray(offsets["nstep"], dtype=np.int64)
+
+def read_columns(dname, nstep=None, nstep_range=None, columns=None):
+    """
+    Read Columns as Read-Only Views into Memory-Mapped Files.
+    Rows of a step (or a step range) are contiguous; no data is copied.
+
+    @param: dname - Column Layout Directory [String]
+    @param: nstep - Step [Integer]
+    @param: nstep_range - Step Range (Inclusive) [List of 2 Integers]
+    @param: columns - Columns to Load (None = All) [List of Strings]
+    @return: cols - Column Name => View [Dict of Numpy Arrays]
+    """
+
+    offsets, columns_all = _load_offsets(dname)
+    if columns is None:
+        columns = columns_all
+
+    # Row Range from Offset Table
+    start, stop = 0, offsets["stop"][-1] if len(offsets) > 0 else 0
+    if nstep is not None:
+        iloc = np.searchsorted(offsets["nstep"], nstep)
+        if iloc < len(offsets) and offsets["nstep"][iloc] == nstep:
+            start, stop = max(start, offsets["start"][iloc]), \
+                          min(stop, offsets["stop"][iloc])
+        else:
+            start, stop = 0, 0
+    if nstep_range is not None:
+        ilo = np.searchsorted(offsets["nstep"], nstep_range[0], side="left")
+        ihi = np.searchsorted(offsets["nstep"], nstep_range[1], side="right")
+        if ihi > ilo:
+            start, stop = max(start, offsets["start"][ilo]), \
+                          min(stop, offsets["stop"][ihi-1])
+        else:
+            start, stop = 0, 0
+    stop = max(start, stop)
+
+    # Map, Slice
+    cols = {}
+    for col in columns:
+        if not col in columns_all:
+            raise Exception("Unknown Column: %s" % col)
+        x = np.load(os.path.join(dname, "%s.npy" % col), mmap_mode="r")
+        cols[col] = x[start:stop]
+
+    # Return
+    return cols
+
+def read_coordinates_and_stack(fnames, nstep=None, nstep_range=None, \
+                               pids=None, columns=None, fixed=None):
+    """
+    Read Coordinates from Multiple Stores (Runs), Stack.
+    Cf. read_coordinates.
+
+    Uses the memory-mapped column layout where it is up to date (cf.
+    has_columns), so only the requested rows are read (and copied into the
+    returned dataframe). Stores in fixed are read from memory.
+
+    @param: fnames - Coordinate Stores [List of Strings]
+    @param: fixed - Preloaded Fixed Format Stores (Cf. preload_fixed) [Dict]
+    @return: df - Coordinates [Pandas Dataframe]
+    """
+
+    dfs = []
+    for fname in fnames:
+        if fixed is not None and fname in fixed:
+            df, rows = fixed[fname]
+            if nstep is not None:
+                df = df.iloc[rows.get(nstep, np.zeros(0, dtype=np.int64))]
+            df = _select_coordinates(df, nstep_range=nstep_range, \
+                                     pids=pids, columns=columns)
+        elif has_columns(fname):
+            cols = read_columns(columns_dirname(fname), nstep=nstep, \
+                                nstep_range=nstep_range, columns=columns)
+            if columns is None:
+                _, columns_all = _load_offsets(columns_dirname(fname))
+                df = pd.DataFrame(cols, columns=columns_all)
+            else:
+                df = pd.DataFrame(cols, columns=columns)
+            if pids is not None:
+                df = df[df.pid.isin(pids)]
+        else:
+            df = read_coordinates(fname, nstep=nstep, \
+                                  nstep_range=nstep_range, \
+                                  pids=pids, columns=columns)
+        dfs.append(df)
+    df = pd.concat(dfs)
+    df.reset_index(drop=True, inplace=True)
+    return df
+
+
+# Canonical Elements (Coordinates_XX.canonical.hdf5)
+# Same table layout as the coordinate store (read with read_coordinates).
+canonical_suffix = ".canonical.hdf5"
+names_canonical = [ "Lambda", "L", "Lz", "lambda_small", \
+                    "xi_real", "xi_imag", "eta_real", "eta_imag" ]
+_canonical_keep = [ "time", "pid", "nstep", "ifname" ]
+_canonical_elements = [ "a", "e", "i", "Omega", "omega", "M" ]
+
+def canonical_fname(fname):
+    """
+    In : /some/dir/Coordinates_01.hdf5
+    Out: /some/dir/Coordinates_01.canonical.hdf5
+    """
+
+    return "%s%s" % (os.path.splitext(fname)[0], canonical_suffix)
+
+def compute_canonical(df, central_mass=1.0, specific=False):
+    """
+    Delaunay Actions and Poincare Variables from Element Columns.
+    Uses each particle's mass (Earth masses, as written by io_helpers).
+    Cf. kepler_helpers.kep2delX, kep2poiX. Canonical variables are NaN for
+    unbound orbits (a <= 0 or e >= 1, e.g. ejected bodies).
+
+    @param: df - Coordinates w/ mass, a, e, i, Omega, omega, M
+                 [Pandas Dataframe]
+    @param: central_mass - Mass of Central Object (Solar Masses) [Float]
+    @param: specific - Actions per Unit Mass [Bool]
+    @return: dfc - time, pid, nstep, (ifname) + names_canonical
+                   [Pandas Dataframe]
+    """
+
+    for col in _canonical_elements:
+        if not col in df.columns:
+            raise Exception("Missing Element Column: %s" % col)
+
+    # Elements, Mass in Solar Masses
+    el = [ np.asarray(df[col], dtype=np.float64) \
+           for col in _canonical_elements ]
+    m = np.asarray(df.mass, dtype=np.float64) * C.mearth/C.msun
+
+    # Bound Orbits Only (Unbound Rows Stay NaN)
+    with np.errstate(invalid="ignore"):
+        bound = ( el[0] > 0.0 ) & ( el[1] < 1.0 )
+        elb = [ x[bound] for x in el ] + [ m[bound] ]
+
+        # Convert
+        Lambda, L, Lz, _, _, _ = kh.kep2delX(*elb, \
+                                             central_mass=central_mass, \
+                                             specific=specific)
+        _, lambda_small, xi_real, xi_imag, eta_real, eta_imag = \
+            kh.kep2poiX(*elb, central_mass=central_mass, specific=specific)
+
+    # Assemble
+    dfc = df[[ col for col in _canonical_keep if col in df.columns ]].copy()
+    for col, x in zip(names_canonical, \
+                      [ Lambda, L, Lz, lambda_small, \
+                        xi_real, xi_imag, eta_real, eta_imag ]):
+        y = np.zeros(len(m)) * np.nan
+        y[bound] = x
+        dfc[col] = y
+    return dfc
+
+def write_canonical(fname, nsteps_per_chunk=100, central_mass=1.0, \
+                    specific=False):
+    """
+    Compute Canonical Elements for All Snapshots of a Coordinate Store and
+    Write Them Alongside (cf. canonical_fname). Table format stores are
+    processed in step ranges of nsteps_per_chunk steps.
+
+    @param: fname - Coordinate Store (w/ Angles, i.e. Not Schema minimal)
+                    [String]
+    @param: nsteps_per_chunk - Steps per Chunk [Integer]
+    @param: central_mass - Mass of Central Object (Solar Masses) [Float]
+    @param: specific - Actions per Unit Mass [Bool]
+    @return: cname - Canonical Element Store [String]
+    """
+
+    cname = canonical_fname(fname)
+
+    # Columns to Read
+    with pd.HDFStore(fname, "r") as store:
+        table = _is_table(store)
+        if table:
+            columns_all = list(store.select(store_key, start=0, \
+                                            stop=0).columns)
+    if table:
+        columns = [ col for col in _canonical_keep + [ "mass" ] + \
+                    _canonical_elements if col in columns_all ]
+
+    # Chunks of Steps (Ranges), Legacy Stores in One Go
+    if table:
+        nsteps = coordinates_nsteps(fname)
+        ranges = [ [ nsteps[istep], \
+                     nsteps[min(istep + nsteps_per_chunk, len(nsteps)) - 1] ] \
+                   for istep in range(0, len(nsteps), nsteps_per_chunk) ]
+    else:
+        ranges = [ None ]
+
+    # Convert, Write
+    for ichunk, nstep_range in enumerate(ranges):
+        if table:
+            df = read_coordinates(fname, nstep_range=nstep_range, \
+                                  columns=columns)
+        else:
+            df = read_coordinates(fname)
+        write_coordinates(cname, compute_canonical(df, \
+                                                   central_mass=central_mass, \
+                                                   specific=specific), \
+                          append=ichunk > 0)
+    index_coordinates(cname)
+
+    # Return
+    return cname
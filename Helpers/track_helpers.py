@@ -0,0 +1,321 @@
+"""
+Helpers for Per-Particle Element Time Series (Tracks).
+
+build_tracks streams over the outputs of a run once and fills a
+(pid x nstep) cube per column (orbital elements, mass, ...). Rows are
+particles (sorted pid index), columns are steps; particles missing from a
+step (not yet present, removed) are NaN. write_tracks stores the cubes as
+one .npy file per column (e.g. Tracks_XX.tracks/, float32 by default; cf.
+Post/outputs2tracks.py), so read_tracks can memory-map them and a
+trajectory is one contiguous row.
+
+Derived quantities are vectorized over all particles (precession rates)
+or all clone pairs (divergence, Lyapunov-style growth rates).
+"""
+
+import os
+import shutil
+import numpy as np
+import pandas as pd
+import io_helpers as ioh
+import kepler_helpers as kh
+
+# Track Layout
+tracks_suffix = ".tracks"
+tracks_pids = "pids.npy"
+tracks_nsteps = "nsteps.npy"
+tracks_time = "time.npy"
+tracks_names = "columns.txt"
+
+# Default Columns
+columns_default = [ "a", "e", "i", "Omega", "omega", "M", "mass" ]
+
+
+def _insert_pids(tracks, pids_new):
+    """
+    Add Rows (NaN) for Particles Not Yet in the Pid Index.
+    """
+
+    pids = np.union1d(tracks["pids"], pids_new)
+    irows = np.searchsorted(pids, tracks["pids"])
+    for col, cube in tracks["columns"].items():
+        cube_new = np.ones((len(pids), cube.shape[1]), dtype=cube.dtype) * \
+            np.nan
+        cube_new[irows] = cube
+        tracks["columns"][col] = cube_new
+    tracks["pids"] = pids
+
+def build_tracks(fnames, frame, columns=None, pids=None, dtype=np.float32, \
+                 nofail=False, cache=True):
+    """
+    Build (pid x nstep) Cubes in One Streaming Pass over a Run.
+
+    Only the elements among the requested columns are computed. With pids
+    given, the cubes hold exactly these particles; otherwise the pid index
+    grows whenever a new particle shows up.
+
+    @param: fnames - Genga Outputs of One Run, in Step Order [List of Strings]
+    @param: frame - "heliocentric" or "barycentric" [String]
+    @param: columns - Columns to Track (None = a, e, i, Omega, omega, M,
+                      mass) [List of Strings]
+    @param: pids - Particles to Track (None = All) [List of Integers]
+    @param: dtype - Cube Type [Numpy Type]
+    @param: nofail - Skip Missing Files (Steps Stay NaN) [Bool]
+    @param: cache - Use/Maintain Sidecar Cache [Bool]
+    @return: tracks - { "pids", "nsteps", "time",
+                        "columns": { Column => Cube } } [Dict]
+    """
+
+    if columns is None:
+        columns = columns_default
+    elements = [ col for col in columns if col in ioh.names_elements ]
+
+    # Allocate
+    nsteps = np.array([ ioh.nstep_from_fname(fname) for fname in fnames ], \
+                      dtype=np.int64)
+    fixed = pids is not None
+    pids = np.unique(np.asarray(pids if fixed else [], dtype=np.int64))
+    tracks = { "pids": pids, "nsteps": nsteps, \
+               "time": np.ones(len(nsteps)) * np.nan, \
+               "columns": dict([ [ col, np.ones((len(pids), len(nsteps)), \
+                                                dtype=dtype) * np.nan ] \
+                                 for col in columns ]) }
+    isteps = dict([ [ nstep, istep ] for istep, nstep in enumerate(nsteps) ])
+
+    # Stream Snapshots
+    for df in ioh.iterate_output(fnames, frame, nofail=nofail, cache=cache, \
+                                 elements=elements):
+        if len(df) == 0:
+            continue
+        istep = isteps[int(df.nstep.iloc[0])]
+        tracks["time"][istep] = df.time.iloc[0]
+
+        # Rows in Pid Index
+        spids = np.asarray(df.pid, dtype=np.int64)
+        irows = np.searchsorted(tracks["pids"], spids)
+        irows_c = np.minimum(irows, max(len(tracks["pids"]) - 1, 0))
+        found = np.zeros(len(spids), dtype=bool)
+        if len(tracks["pids"]) > 0:
+            found = tracks["pids"][irows_c] == spids
+        if not fixed and not np.all(found):
+            _insert_pids(tracks, spids[~found])
+            irows = np.searchsorted(tracks["pids"], spids)
+            found[:] = True
+
+        # Write Step
+        for col in columns:
+            tracks["columns"][col][irows[found],istep] = \
+                np.asarray(df[col])[found]
+
+    # Return
+    return tracks
+
+def write_tracks(dname, tracks):
+    """
+    Write Tracks (One .npy per Column). Written to a temporary directory
+    and moved into place when complete.
+
+    @param: dname - Track Directory (e.g. Tracks_01.tracks) [String]
+    @param: tracks - Tracks (cf. build_tracks) [Dict]
+    @return: dname - Track Directory [String]
+    """
+
+    dname_tmp = "%s.tmp%i" % (dname, os.getpid())
+    if os.path.isdir(dname_tmp):
+        shutil.rmtree(dname_tmp)
+    os.makedirs(dname_tmp)
+
+    # Index, Cubes
+    np.save(os.path.join(dname_tmp, tracks_pids), tracks["pids"])
+    np.save(os.path.join(dname_tmp, tracks_nsteps), tracks["nsteps"])
+    np.save(os.path.join(dname_tmp, tracks_time), tracks["time"])
+    for col, cube in tracks["columns"].items():
+        np.save(os.path.join(dname_tmp, "%s.npy" % col), cube)
+    with open(os.path.join(dname_tmp, tracks_names), "w") as f:
+        f.write("\n".join(tracks["columns"].keys()) + "\n")
+
+    # Move into Place
+    if os.path.isdir(dname):
+        shutil.rmtree(dname)
+    os.rename(dname_tmp, dname)
+
+    # Return
+    return dname
+
+def read_tracks(dname, columns=None, mmap=True):
+    """
+    Read Tracks. Cubes are read-only memory maps unless mmap=False.
+
+    @param: dname - Track Directory [String]
+    @param: columns - Columns to Load (None = All) [List of Strings]
+    @param: mmap - Memory-Map Cubes [Bool]
+    @return: tracks - Tracks (cf. build_tracks) [Dict]
+    """
+
+    with open(os.path.join(dname, tracks_names), "r") as f:
+        columns_all = f.read().split()
+    if columns is None:
+        columns = columns_all
+
+    tracks = { "pids": np.load(os.path.join(dname, tracks_pids)), \
+               "nsteps": np.load(os.path.join(dname, tracks_nsteps)), \
+               "time": np.load(os.path.join(dname, tracks_time)), \
+               "columns": {} }
+    for col in columns:
+        if not col in columns_all:
+            raise Exception("Unknown Column: %s" % col)
+        tracks["columns"][col] = \
+            np.load(os.path.join(dname, "%s.npy" % col), \
+                    mmap_mode="r" if mmap else None)
+
+    return tracks
+
+def pid_rows(tracks, pids):
+    """
+    Rows of Particles in the Pid Index.
+
+    @param: tracks - Tracks (cf. build_tracks) [Dict]
+    @param: pids - Particle IDs [Integer or List of Integers]
+    @return: irows - Rows [Numpy Int Array]
+    """
+
+    pids = np.atleast_1d(np.asarray(pids, dtype=np.int64))
+    irows = np.searchsorted(tracks["pids"], pids)
+    if np.any(irows >= len(tracks["pids"])) or \
+       np.any(tracks["pids"][np.minimum(irows, len(tracks["pids"]) - 1)] != \
+              pids):
+        raise Exception("Unknown Particle ID(s): %s" % \
+                        pids[~np.in1d(pids, tracks["pids"])])
+    return irows
+
+def trajectory(tracks, pid, columns=None):
+    """
+    Extract the Trajectory of One Particle.
+
+    @param: tracks - Tracks (cf. build_tracks) [Dict]
+    @param: pid - Particle ID [Integer]
+    @param: columns - Columns (None = All) [List of Strings]
+    @return: df - time + Columns, Indexed by nstep [Pandas Dataframe]
+    """
+
+    if columns is None:
+        columns = list(tracks["columns"].keys())
+    irow = pid_rows(tracks, pid)[0]
+
+    df = pd.DataFrame({ "time": tracks["time"] }, \
+                      index=pd.Index(tracks["nsteps"], name="nstep"))
+    for col in columns:
+        df[col] = np.asarray(tracks["columns"][col][irow], dtype=np.float64)
+    return df
+
+def _angle_cube(tracks, angle, irows):
+    """
+    Angle Cube (float64), Unwrapped along Time. varpi = Omega + omega.
+    Unwrapping is not carried across NaN gaps.
+    """
+
+    if angle == "varpi":
+        x = np.asarray(tracks["columns"]["Omega"][irows], dtype=np.float64) + \
+            np.asarray(tracks["columns"]["omega"][irows], dtype=np.float64)
+    else:
+        x = np.array(tracks["columns"][angle][irows], dtype=np.float64)
+
+    # Unwrap
+    dx = np.diff(x, axis=1)
+    with np.errstate(invalid="ignore"):
+        corr = np.where(np.isfinite(dx), \
+                        np.mod(dx + np.pi, 2.0 * np.pi) - np.pi - dx, 0.0)
+    x[:,1:] += np.cumsum(corr, axis=1)
+    return x
+
+def _nan_slopes(t, y):
+    """
+    Least-Squares Slopes dy/dt per Row, Ignoring NaN.
+    """
+
+    ok = np.logical_and(np.isfinite(y), np.isfinite(t)[np.newaxis,:])
+    n = np.sum(ok, axis=1).astype(np.float64)
+    tt = np.where(ok, t[np.newaxis,:], 0.0)
+    yy = np.where(ok, y, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        tm = np.sum(tt, axis=1) / n
+        ym = np.sum(yy, axis=1) / n
+        cov = np.sum(np.where(ok, ( tt - tm[:,np.newaxis] ) * \
+                              ( yy - ym[:,np.newaxis] ), 0.0), axis=1)
+        var = np.sum(np.where(ok, ( tt - tm[:,np.newaxis] )**2.0, 0.0), \
+                     axis=1)
+        return np.where(n >= 2, cov / var, np.nan)
+
+def precession_rates(tracks, angle="varpi", pids=None, mean=False):
+    """
+    Precession Rates of Omega, omega or varpi (= Omega + omega).
+
+    Angles are unwrapped along time. Instantaneous rates are central
+    differences (np.gradient); mean rates are least-squares slopes.
+
+    @param: tracks - Tracks w/ Omega and/or omega (cf. build_tracks) [Dict]
+    @param: angle - "Omega", "omega" or "varpi" [String]
+    @param: pids - Particles (None = All) [List of Integers]
+    @param: mean - Return Mean Rate per Particle [Bool]
+    @return: rates - rad/yr (npids, nsteps), or (npids,) If mean
+                     [Numpy Array]
+    """
+
+    irows = np.arange(len(tracks["pids"])) if pids is None \
+        else pid_rows(tracks, pids)
+    t = np.asarray(tracks["time"], dtype=np.float64)
+    x = _angle_cube(tracks, angle, irows)
+
+    if mean:
+        return _nan_slopes(t, x)
+    if len(t) < 2:
+        return np.ones_like(x) * np.nan
+    return np.gradient(x, t, axis=1)
+
+def clone_pairs(tracks, base=10000, stride=100):
+    """
+    (Reference, Clone) Pairs from the Clone ID Scheme of genic_astorb.py
+    (pid = base + stride * iobj + iclone, iclone = 0 is the Reference).
+
+    @param: tracks - Tracks (cf. build_tracks) [Dict]
+    @return: pid_ref, pid_clone - Pairs [Numpy Int Arrays]
+    """
+
+    pids = tracks["pids"][tracks["pids"] >= base]
+    iclone = np.mod(pids - base, stride)
+    pid_ref = pids - iclone
+    keep = np.logical_and(iclone > 0, np.in1d(pid_ref, pids))
+    return pid_ref[keep], pids[keep]
+
+def clone_divergence(tracks, pid_ref, pid_clone):
+    """
+    Metric Distance between Pairs of Particles over Time.
+    Cf. kepler_helpers.kep2metric (needs a, e, i, Omega, omega).
+
+    @param: tracks - Tracks (cf. build_tracks) [Dict]
+    @param: pid_ref, pid_clone - Pairs (cf. clone_pairs) [Int Arrays]
+    @return: rho - Metric Distance (npairs, nsteps) [Numpy Array]
+    """
+
+    iref = pid_rows(tracks, pid_ref)
+    iclo = pid_rows(tracks, pid_clone)
+    el = [ np.asarray(tracks["columns"][col], dtype=np.float64) \
+           for col in [ "a", "e", "i", "Omega", "omega" ] ]
+    rho2 = kh.kep2metric(el[0][iref], el[0][iclo], el[1][iref], el[1][iclo], \
+                         el[2][iref], el[2][iclo], el[3][iref], el[3][iclo], \
+                         el[4][iref], el[4][iclo])
+    return np.sqrt(np.maximum(rho2, 0.0))
+
+def divergence_rates(tracks, rho):
+    """
+    Lyapunov-Style Growth Rates: Least-Squares Slope of ln(rho) vs. Time.
+    Zero Distances (Identical Pairs) are Ignored.
+
+    @param: tracks - Tracks (cf. build_tracks) [Dict]
+    @param: rho - Distances (cf. clone_divergence) [Numpy Array]
+    @return: rates - 1/yr per Pair [Numpy Array]
+    """
+
+    with np.errstate(divide="ignore"):
+        lnrho = np.where(rho > 0.0, np.log(rho), np.nan)
+    return _nan_slopes(np.asarray(tracks["time"], dtype=np.float64), lnrho)
@@ -1,42 +1,110 @@
 """
 Various Helper Functions for Vector Math.
+
+cross, dot and norm run on compiled ufuncs (numba.vectorize) if numba is
+installed, and on plain numpy otherwise (set_backend switches explicitly).
+Both backends broadcast like numpy and accept optional output arrays (out=)
+to avoid temporaries in hot loops.
 """
 
+import math
 import numpy as np
 
+# Optional JIT Backend
+try:
+    import numba
+    have_numba = True
+except ImportError:
+    have_numba = False
+
+
+# Numpy Kernels
+def _det2_numpy(a, b, c, d, out=None):
+    out = np.multiply(a, d, out=out)
+    out -= np.multiply(b, c)
+    return out
+
+def _dot3_numpy(x1, y1, z1, x2, y2, z2, out=None):
+    out = np.multiply(x1, x2, out=out)
+    out += np.multiply(y1, y2)
+    out += np.multiply(z1, z2)
+    return out
+
+def _norm3_numpy(x1, y1, z1, out=None):
+    return np.sqrt(_dot3_numpy(x1, y1, z1, x1, y1, z1, out=out), out=out)
+
+_kernels = { "numpy": [ _det2_numpy, _dot3_numpy, _norm3_numpy ] }
+
+# Compiled Kernels (One Pass, No Temporaries)
+if have_numba:
+    @numba.vectorize([ "float64(float64, float64, float64, float64)" ], \
+                     nopython=True, cache=True)
+    def _det2_numba(a, b, c, d):
+        return a * d - b * c
+
+    @numba.vectorize([ "float64(float64, float64, float64, " \
+                       "float64, float64, float64)" ], \
+                     nopython=True, cache=True)
+    def _dot3_numba(x1, y1, z1, x2, y2, z2):
+        return x1 * x2 + y1 * y2 + z1 * z2
+
+    @numba.vectorize([ "float64(float64, float64, float64)" ], \
+                     nopython=True, cache=True)
+    def _norm3_numba(x1, y1, z1):
+        return math.sqrt(x1 * x1 + y1 * y1 + z1 * z1)
+
+    _kernels["numba"] = [ _det2_numba, _dot3_numba, _norm3_numba ]
+
+def set_backend(name):
+    """
+    Select Kernels ("numba" or "numpy").
+
+    @param: name - Backend [String]
+    """
+
+    global backend, _det2, _dot3, _norm3
+    if not name in _kernels:
+        raise Exception("Backend Unavailable: %s" % name)
+    backend = name
+    _det2, _dot3, _norm3 = _kernels[name]
+
+set_backend("numba" if have_numba else "numpy")
+
+def _kwargs(out):
+    return {} if out is None else { "out": out }
+
 # Roll Our Own Cross-Product
-def cross(x1,y1,z1,x2,y2,z2):
-    xc = y1 * z2 - z1 * y2
-    yc = z1 * x2 - x1 * z2
-    zc = x1 * y2 - y1 * x2
+def cross(x1,y1,z1,x2,y2,z2,out=None):
+    if out is None:
+        out = [ None, None, None ]
+    xc = _det2(y1, z1, y2, z2, **_kwargs(out[0]))
+    yc = _det2(z1, x1, z2, x2, **_kwargs(out[1]))
+    zc = _det2(x1, y1, x2, y2, **_kwargs(out[2]))
     return xc, yc, zc
 
 # Roll Our Own Dot-Product
-def dot(x1,y1,z1,x2,y2,z2):
-    return x1*x2+y1*y2+z1*z2
+def dot(x1,y1,z1,x2,y2,z2,out=None):
+    return _dot3(x1, y1, z1, x2, y2, z2, **_kwargs(out))
 
 # Vector Norm
-def norm(x1,y1,z1):
-    return np.sqrt(dot(x1,y1,z1,x1,y1,z1))
+def norm(x1,y1,z1,out=None):
+    return _norm3(x1, y1, z1, **_kwargs(out))
 
 # Angle Between Vectors
 def compute_angle(x1,y1,z1,x2,y2,z2,vanilla=True):
-    # Dot Product -> Angle
+    x1, y1, z1, x2, y2, z2 = [ np.asarray(xx, dtype=np.float64) \
+                               for xx in [ x1, y1, z1, x2, y2, z2 ] ]
+    # Dot/Cross Product
     dots = dot(x1,y1,z1,x2,y2,z2)
-    cos_theta = dots / (norm(x1,y1,z1) * norm(x2,y2,z2))
-    theta = np.arccos(cos_theta)
-    # Cross Product -> Angle>0 for Z>0; Angle<0 for Z<0
     cx, cy, cz = cross(x1,y1,z1,x2,y2,z2)
-    theta[cz<0] = -theta[cz<0]
-    # Fix NaN; Kinda Kinky
-    # Dot product for almost parallel vectors is
-    # -1 (antiparallel) or +1 (parallel)
-    nandots = dots[np.isnan(theta)]
-    nandots[nandots<0] = np.pi
-    nandots[nandots>0] = 0.0
-    theta[np.isnan(theta)] = nandots
-    # Get Sin (Better For Small Angles, But No Orientation Info)
-    sin_theta = norm(cx,cy,cz) / (norm(x1,y1,z1) * norm(x2,y2,z2))
+    crosses = norm(cx,cy,cz)
+    # Angle>0 for Z>0; Angle<0 for Z<0
+    # arctan2 Stays Finite for (Anti-)Parallel Vectors
+    theta = np.arctan2(np.where(cz<0, -crosses, crosses), dots)
+    # Cos/Sin (Sin Better For Small Angles, But No Orientation Info)
+    norms = norm(x1,y1,z1) * norm(x2,y2,z2)
+    cos_theta = dots / norms
+    sin_theta = crosses / norms
     # Return
     if vanilla:
         return theta
@@ -74,9 +74,45 @@ if args.limit > 0:
     df = df.head(args.limit)
 
 # Generate IC Lines
+# Elements are converted in one vectorized call (kh.kep2cartX)
+def format_lines(pids, a, e, i, Omega, omega, M, Diameter):
+    """
+    Convert to Cartesian State Vectors, Format IC Lines.
+    Angles in Degrees.
+    """
+
+    x, v = \
+        kh.kep2cartX(a, e, i * C.d2r, Omega * C.d2r, omega * C.d2r, \
+                     M * C.d2r, 0.0, 1.0)
+    v *= C.kms_to_genga
+    radius = Diameter / C.au2km
+
+    lines = []
+    for kk in range(len(pids)):
+        line = "0.0 %06d %.16e %.16e " % ( pids[kk], 0.0, radius[kk] )
+        line += "%+.16e %+.16e %+.16e " % ( x[0,kk], x[1,kk], x[2,kk] )
+        line += "%+.16e %+.16e %+.16e " % ( v[0,kk], v[1,kk], v[2,kk] )
+        line += "0.0 0.0 0.0"
+        lines.append(line)
+    return lines
+
+def clone_pids(nobj, nclones):
+    """
+    Clone Particle IDs. Base 10000, 100 IDs per Object.
+    """
+
+    return ( 10000 + 100 * np.arange(nobj)[:,np.newaxis] + \
+             np.arange(nclones)[np.newaxis,:] ).flatten()
+
+def clone_column(col, nclones):
+    """
+    Repeat Column for Each Clone (Object-Major Order).
+    """
+
+    return np.repeat(np.asarray(col, dtype=np.float64), nclones)
+
 if args.clones_a:
     sys.stderr.write('// Generating Genga IC Lines, With Clones\n')
-    pid_base = 10000; lines = []
 
     # Semi-Major Axis Offsets
     # a = a * [ 1,
@@ -86,75 +122,45 @@ if args.clones_a:
     da_lo = 1.0 - np.logspace(-16, -1, 16)
     da_hi = 1.0 + np.logspace(-16, -1, 16)
     da_xx = np.concatenate([np.array([1.0]), da_lo, da_hi])
-
-    for ii, [ irow, row ] in enumerate(df.iterrows()):
-        for jj, da in enumerate(da_xx):
-            # Convert to Cartesian State Vector
-            x, v = \
-                kh.kep2cart(row.a * da, row.e, row.i * C.d2r, \
-                            row.Omega * C.d2r, row.omega * C.d2r, \
-                            row.M * C.d2r, \
-                            0.0, 1.0)
-            v *= C.kms_to_genga
-
-            # Format IC Line
-            line = "0.0 %06d %.16e %.16e " % ( pid_base + jj, 0.0, \
-                                               row.Diameter / C.au2km )
-            line += "%+.16e %+.16e %+.16e " % ( x[0], x[1], x[2] )
-            line += "%+.16e %+.16e %+.16e " % ( v[0], v[1], v[2] )
-            line += "0.0 0.0 0.0"
-            lines.append(line)
-
-        # Base Particle ID Counter
-        pid_base += 100
+    nclones = len(da_xx)
+
+    a = ( np.asarray(df.a, dtype=np.float64)[:,np.newaxis] * \
+          da_xx[np.newaxis,:] ).flatten()
+    lines = format_lines(clone_pids(len(df), nclones), a, \
+                         clone_column(df.e, nclones), \
+                         clone_column(df.i, nclones), \
+                         clone_column(df.Omega, nclones), \
+                         clone_column(df.omega, nclones), \
+                         clone_column(df.M, nclones), \
+                         clone_column(df.Diameter, nclones))
 
 elif args.clones_omega:
     sys.stderr.write('// Generating Genga IC Lines, With Clones\n')
-    pid_base = 10000; lines = []
 
     domega_all = np.concatenate([np.array([0.0]), np.logspace(-1,-15,15)])
-
-    for ii, [ irow, row ] in enumerate(df.iterrows()):
-        for jj, domega in enumerate(domega_all):
-            # Convert to Cartesian State Vector
-            x, v = \
-                kh.kep2cart(row.a, row.e, row.i * C.d2r, \
-                            row.Omega * C.d2r, (row.omega + domega) * C.d2r, \
-                            row.M * C.d2r, \
-                            0.0, 1.0)
-            v *= C.kms_to_genga
-
-            # Format IC Line
-            line = "0.0 %06d %.16e %.16e " % ( pid_base + jj, 0.0, \
-                                               row.Diameter / C.au2km )
-            line += "%+.16e %+.16e %+.16e " % ( x[0], x[1], x[2] )
-            line += "%+.16e %+.16e %+.16e " % ( v[0], v[1], v[2] )
-            line += "0.0 0.0 0.0"
-            lines.append(line)
-
-        # Base Particle ID Counter
-        pid_base += 100
+    nclones = len(domega_all)
+
+    omega = ( np.asarray(df.omega, dtype=np.float64)[:,np.newaxis] + \
+              domega_all[np.newaxis,:] ).flatten()
+    lines = format_lines(clone_pids(len(df), nclones), \
+                         clone_column(df.a, nclones), \
+                         clone_column(df.e, nclones), \
+                         clone_column(df.i, nclones), \
+                         clone_column(df.Omega, nclones), \
+                         omega, \
+                         clone_column(df.M, nclones), \
+                         clone_column(df.Diameter, nclones))
 
 else:
     sys.stderr.write('// Generating Genga IC Lines\n')
-    pid = 10000; lines = []
-    for ii, [ irow, row ] in enumerate(df.iterrows()):
-        # Convert to Cartesian State Vector
-        x, v = \
-            kh.kep2cart(row.a, row.e, row.i * C.d2r, \
-                        row.Omega * C.d2r, row.omega * C.d2r, row.M * C.d2r, \
-                        0.0, 1.0)
-        v *= C.kms_to_genga
-
-        # Format IC Line
-        line = "0.0 %06d %.16e %.16e " % ( pid, 0.0, row.Diameter / C.au2km )
-        line += "%+.16e %+.16e %+.16e " % ( x[0], x[1], x[2] )
-        line += "%+.16e %+.16e %+.16e " % ( v[0], v[1], v[2] )
-        line += "0.0 0.0 0.0"
-        lines.append(line)
-
-        # Particle IC Counter
-        pid += 1
+    lines = format_lines(10000 + np.arange(len(df)), \
+                         np.asarray(df.a, dtype=np.float64), \
+                         np.asarray(df.e, dtype=np.float64), \
+                         np.asarray(df.i, dtype=np.float64), \
+                         np.asarray(df.Omega, dtype=np.float64), \
+                         np.asarray(df.omega, dtype=np.float64), \
+                         np.asarray(df.M, dtype=np.float64), \
+                         np.asarray(df.Diameter, dtype=np.float64))
 
 # Print Lines
 sys.stderr.write('// Printing Genga IC Lines\n')
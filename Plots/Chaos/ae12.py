@@ -15,6 +15,7 @@ import numpy as np
 import pandas as pd
 import sys
 import other_helpers as oh
+import store_helpers as sh
 import argparse
 
 
@@ -46,16 +47,11 @@ for res_file in res_files:
         dfr_all.append(dfr)
         del dfr
 
-# Load Coordinates
-dfo_all = []
-for crd_file in crd_files:
-    with pd.HDFStore("%s" % (crd_file), 'r') as store:
-        dfo = store['df']
-        dfo_all.append(dfo)
-        del dfo
+# Legacy (Fixed Format) Stores: Load Once, Not per Step
+fixed = sh.preload_fixed(crd_files)
 
-# Determine Step Range
-nsteps = np.asarray(dfo_all[0].nstep.unique())
+# Determine Step Range (Coordinates are Loaded per Step)
+nsteps = sh.coordinates_nsteps(crd_files[0], fixed=fixed)
 
 # Loop Steps
 print "// Processing %i Outputs per Run" % len(nsteps)
@@ -76,17 +72,17 @@ for nstep in nsteps:
             # Pick Axis
             ax = axarr[irow,icol]
 
-            if irun < len(dfo_all):
+            if irun < len(crd_files):
 
-                # Pick Run
-                dfo = dfo_all[irun]
+                # Pick Run, Step
+                dfo = sh.read_coordinates_and_stack([ crd_files[irun] ], \
+                                                    nstep=nstep, fixed=fixed)
                 dfr = dfr_all[irun]
 
                 # Does Step Exist?
-                if nstep in dfo.nstep.unique():
+                if len(dfo) > 0:
 
                     # Pick Step
-                    dfo = dfo[dfo.nstep == nstep]
                     dfr = dfr[dfr.nstep == nstep]
 
                     # Extract Jupiter Semi-Major Axis
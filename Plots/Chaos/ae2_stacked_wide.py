@@ -15,6 +15,7 @@ import numpy as np
 import pandas as pd
 import sys
 import other_helpers as oh
+import store_helpers as sh
 import constants as C
 import argparse
 
@@ -84,19 +85,6 @@ for itag_id, tag_id in enumerate(tag_ids):
         fnames_res_all.append(fnames_res_loc)
         fnames_res_loc = []
 
-# Load Coordinates
-dfo_all = []
-print "// Loading Coordinates Files"
-for fnames_crd_loc in fnames_crd_all:
-    dfo = pd.DataFrame()
-    for fname in fnames_crd_loc:
-        print "** %s" % fname
-        with pd.HDFStore("%s" % fname, 'r') as store:
-            dfo_tmp = store['df']
-            dfo = pd.concat([dfo, dfo_tmp])
-            del dfo_tmp
-    dfo_all.append(dfo.reset_index(drop=True))
-
 # Load Resonances
 dfr_all = []
 print "// Loading Resonance Files"
@@ -116,8 +104,11 @@ for fnames_res_loc in fnames_res_all:
         dfr.reset_index(drop=True, inplace=True)
     dfr_all.append(dfr)
 
-# Determine Step Range
-nsteps = np.asarray(dfo_all[0].nstep.unique())
+# Legacy (Fixed Format) Stores: Load Once, Not per Step
+fixed = sh.preload_fixed(crd_files)
+
+# Determine Step Range (Coordinates are Loaded per Step)
+nsteps = sh.coordinates_nsteps(fnames_crd_all[0], fixed=fixed)
 
 # Global Mass Scaling
 ms, ns = oh.mkline(5.0/2000.0, 1.0, 2.0, 16.0)
@@ -138,11 +129,11 @@ for nstep in nsteps:
         ax = axarr[isim]
 
         # Select Sim
-        dfo = dfo_all[isim]
         dfr = dfr_all[isim]
 
         # Pick Step
-        dfo = dfo[dfo.nstep == nstep]
+        dfo = sh.read_coordinates_and_stack(fnames_crd_all[isim], \
+                                            nstep=nstep, fixed=fixed)
         if not fnames_res_all[isim][0] == 'NONE':
             dfr = dfr[dfr.nstep == nstep]
 
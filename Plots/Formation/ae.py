@@ -34,7 +34,7 @@ for g in globs:
 df = ioh.read_output("%s/Out_%s_%012d.dat" % (args.dir_name, \
                                               args.run_name, \
                                               nsteps[-1]), \
-                     frame="heliocentric")
+                     frame="heliocentric", elements=[])
 mmin = df["mass"].min()
 
 # # 1 - Largest Mass from Last Output
@@ -67,7 +67,7 @@ for nstep in nsteps:
     df = ioh.read_output("%s/Out_%s_%012d.dat" % (args.dir_name, \
                                                   args.run_name, \
                                                   nstep), \
-                         frame="heliocentric")
+                         frame="heliocentric", elements=["a", "e"])
     df = df[df.mass<16.0]
     s = df.mass * m + n
     dfx = df.sort(columns=["mass"], ascending=False).head(3)
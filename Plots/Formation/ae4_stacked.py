@@ -14,9 +14,9 @@ tag_NN,/path/Coordinates_MM.hdf5
 import matplotlib as mpl; mpl.use('agg')
 import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
 import sys
 import other_helpers as oh
+import store_helpers as sh
 import constants as C
 
 
@@ -64,21 +64,11 @@ for itag_id, tag_id in enumerate(tag_ids):
         fnames_all.append(fnames_loc)
         fnames_loc = []
 
-# Load Coordinates
-df_all = []
-print "// Loading Coordinates Files"
-for fnames_loc in fnames_all:
-    df = pd.DataFrame()
-    for fname in fnames_loc:
-        print "** %s" % fname
-        with pd.HDFStore("%s" % fname, 'r') as store:
-            df_tmp = store['df']
-            df = pd.concat([df, df_tmp])
-            del df_tmp
-    df_all.append(df.reset_index(drop=True))
-
-# Determine Step Range
-nsteps = np.asarray(df_all[0].nstep.unique())
+# Legacy (Fixed Format) Stores: Load Once, Not per Step
+fixed = sh.preload_fixed(crd_files)
+
+# Determine Step Range (Coordinates are Loaded per Step)
+nsteps = sh.coordinates_nsteps(fnames_all[0], fixed=fixed)
 
 # Global Mass Scaling
 mx, nx = oh.mkline(5.0/8192.0, 1.0, 1.6, 12.0)
@@ -94,13 +84,14 @@ for nstep in nsteps:
     fig.set_size_inches(8,8)
 
     # Loop Sims
-    for isim, df in enumerate(df_all):
+    for isim, fnames_loc in enumerate(fnames_all):
         
         # Setup Axis
         ax = axarr.flatten()[isim]
 
-        # Filter Step, Extract Time
-        df = df[df.nstep == nstep]
+        # Load Step, Extract Time
+        df = sh.read_coordinates_and_stack(fnames_loc, \
+                                           nstep=nstep, fixed=fixed)
         if isim == 0:
             tout = df.time.iloc[0]
         
@@ -200,9 +200,7 @@ for istep, nstep in enumerate(nsteps):
     m = np.asarray(df.mass)
 
     # Convert to barycentric coordinates
-    x, vx = kh.helio2bary(x, vx, m)
-    y, vy = kh.helio2bary(y, vy, m)
-    z, vz = kh.helio2bary(z, vz, m)
+    x, y, z, vx, vy, vz = kh.helio2baryX(x, y, z, vx, vy, vz, m)
 
     # Compute Keplerian elements, and append the columns to the dataframe 
     df["a"], df["e"], df["i"], df["Omega"], df["omega"], df["M"] = \
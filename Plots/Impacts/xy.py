@@ -111,11 +111,12 @@ for istep, nstep in enumerate(nsteps):
 
     # Ellipses
     if not args.no_orbits:
-        xell, yell, _ = kh.compute_ellipseX(df[df.mass>0.0].a, \
-                                            df[df.mass>0.0].e, \
-                                            df[df.mass>0.0].i, \
-                                            df[df.mass>0.0].Omega, \
-                                            df[df.mass>0.0].omega)
+        xell, yell, _ = kh.compute_orbitsX(df[df.mass>0.0].a, \
+                                           df[df.mass>0.0].e, \
+                                           df[df.mass>0.0].i, \
+                                           df[df.mass>0.0].Omega, \
+                                           df[df.mass>0.0].omega, \
+                                           adaptive=True, dtype=np.float32)
 
     # Plot
     fig, ax = plt.subplots(1,1)
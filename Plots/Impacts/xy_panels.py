@@ -156,9 +156,7 @@ for istep, nstep in enumerate(nsteps):
             m = np.asarray(dfm.mass)
 
             # Convert Frame
-            x, vx = kh.helio2bary(x, vx, m)
-            y, vy = kh.helio2bary(y, vy, m)
-            z, vz = kh.helio2bary(z, vz, m)
+            x, y, z, vx, vy, vz = kh.helio2baryX(x, y, z, vx, vy, vz, m)
 
             # Compute Keplerian Elements, Append Columns
             dfm["a"], dfm["e"], dfm["i"], dfm["Omega"], dfm["omega"], _ = \
@@ -224,9 +222,7 @@ for istep, nstep in enumerate(nsteps):
             m = np.asarray(dfm.mass)
 
             # Convert Frame
-            x, vx = kh.helio2bary(x, vx, m)
-            y, vy = kh.helio2bary(y, vy, m)
-            z, vz = kh.helio2bary(z, vz, m)
+            x, y, z, vx, vy, vz = kh.helio2baryX(x, y, z, vx, vy, vz, m)
 
             # Compute Keplerian Elements, Append Columns
             dfm["a"], dfm["e"], dfm["i"], dfm["Omega"], dfm["omega"], _ = \
@@ -30,10 +30,10 @@ Code is embarrassingly parallel. Use the -np to define number of subprocesses.
 """
 
 import sys
-import glob
 import numpy as np
 import resonance_helpers as rh
 import io_helpers as ioh
+import track_helpers as th
 import multiprocessing as mp
 import argparse
 import constants as C
@@ -51,11 +51,11 @@ def extract_resonances(cdir):
 
     print "// Processing %s" % cdir
 
-    # Extract run name (again...)
+    # Extract run name (from manifest)
     # In:  Out_run_03_000057000000
     # Out: run_03
-    globs = glob.glob("%s/Out_*.dat" % cdir)
-    run_name = globs[0].strip().split("/")[-1][:-4][4:-13]
+    dfm = ioh.load_manifest(cdir)
+    run_name = dfm.run_name.iloc[0]
     
     # Running Index for Run
     nrun = int(run_name.strip().split('_')[-1])
@@ -75,6 +75,17 @@ def extract_resonances(cdir):
     five_to_two = np.zeros_like(nsteps) * np.nan
     seven_to_three = np.zeros_like(nsteps) * np.nan
     
+    # Track Jupiter/Saturn in One Streaming Pass
+    # Fail Fast on Missing Outputs
+    fnames = []
+    for nstep in nsteps:
+        fnames.append(ioh.manifest_lookup_nstep(dfm, cdir, nstep))
+    tracks = th.build_tracks(fnames, frame='heliocentric', \
+                             columns=['a', 'mass'], pids=[2000, 2001], \
+                             dtype=np.float64)
+    a_js = tracks["columns"]["a"]
+    m_js = tracks["columns"]["mass"] * C.mearth/C.msun
+
     # Loop Steps
     for istep, nstep in enumerate(nsteps):
 
@@ -84,18 +95,11 @@ def extract_resonances(cdir):
             if True:
                 print "** Step %012d/%012d" % (nstep, nsteps[-1])
 
-        fname = "%s/Out_%s_%012d.dat" % (cdir, run_name, nstep)
-        df = ioh.read_output_and_stack([fname], frame='heliocentric')
-        
         # Extract Time & Giant Planets
-        time[istep] = df.time.iloc[0]
+        time[istep] = tracks["time"][istep]
         t_over_tau[istep] = time[istep]/1.0e6
-        a_j = df[df.pid==2000].a.iloc[0]
-        m_j = df[df.pid==2000].mass.iloc[0]
-        m_j *= C.mearth/C.msun
-        a_s = df[df.pid==2001].a.iloc[0]
-        m_s = df[df.pid==2001].mass.iloc[0]
-        m_s *= C.mearth/C.msun
+        a_j, a_s = a_js[:,istep]
+        m_j, m_s = m_js[:,istep]
         
         # Compute Secular Resonance Locations
         a_nu_5_loc, a_nu_6_loc, a_nu_15_loc, a_nu_16_loc = \
@@ -127,9 +131,6 @@ def extract_resonances(cdir):
         three_to_two[istep] = a_j * (3.0/2.0)**(-C.twothirds)
         five_to_two[istep] = a_j * (5.0/2.0)**(-C.twothirds)
         seven_to_three[istep] = a_j * (7.0/3.0)**(-C.twothirds)
-
-        # Clean Up
-        del df
         
     # Prepare Data Frame
     data = { 'nu_5': a_nu_5, 'nu_6': a_nu_6, \
@@ -182,30 +183,21 @@ else:
         dirs.append(line)
     print "// Reading %i Directories" % len(dirs)
 
-# The Globbit
+# The Manifests (Rescan Once, Persisted for the Workers)
 run_names = []
 for idir, cdir in enumerate(dirs):
-    globs = glob.glob("%s/Out_*.dat" % cdir)
+    dfm = ioh.load_manifest(cdir, refresh=True)
     # Extract run names
     # In:  Out_run_03_000057000000
     # Out: run_03
-    run_names.append(globs[0].strip().split("/")[-1][:-4][4:-13])
-    # Extract directory w/ most outputs
-    if idir == 0:
-        lmax = len(globs)
-        xglobs = globs
-    else:
-        # Actual
-        if len(globs) > lmax:
-            lmax = len(globs)
-            xglobs = globs
-
-# Get Steps
-nsteps = np.zeros_like(xglobs, dtype=np.int64)
-for iglob, xglob in enumerate(sorted(xglobs)):
-    # In : /some/dir/Out_run_03_000156000000.dat
-    # Out: 156000000
-    nsteps[iglob] = int(xglob.strip().split("/")[-1][:-4].split("_")[-1])
+    run_names.append(dfm.run_name.iloc[0])
+    # Extract directory w/ most outputs, get steps
+    if idir == 0 or len(dfm) > lmax:
+        lmax = len(dfm)
+        nsteps = np.asarray(dfm.index, dtype=np.int64)
+
+# Gas Disk S/T Table (Built Once, Inherited/Cached for the Workers)
+rh.load_gas_table()
 
 # Loop Directories
 if args.np == 1:
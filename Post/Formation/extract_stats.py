@@ -13,7 +13,6 @@ Here, "dirlist" is a file looking like:
 """
 
 import sys
-import glob
 import numpy as np
 import pandas as pd
 import io_helpers as ioh
@@ -37,11 +36,11 @@ def extract_stats(cdir):
 
     print "// Processing %s" % cdir
 
-    # Extract run name (again...)
+    # Extract run name (from manifest)
     # In:  Out_run_03_000057000000
     # Out: run_03
-    globs = glob.glob("%s/Out_*.dat" % cdir)
-    run_name = globs[0].strip().split("/")[-1][:-4][4:-13]
+    dfm = ioh.load_manifest(cdir)
+    run_name = dfm.run_name.iloc[0]
     
     #
     # Allocate
@@ -66,7 +65,7 @@ def extract_stats(cdir):
             # Load output into dataframe.
             # Make sure to drop planets <= 12 Earth masses.
             fname = "%s/Out_%s_%012d.dat" % (cdir, run_name, nout)
-            df = ioh.read_output(fname, frame="heliocentric")
+            df = ioh.read_output(fname, frame="heliocentric", elements=[])
             df = df[df.mass <= 12.0]
 
             # Cutoff
@@ -133,30 +132,18 @@ else:
         dirs.append(line)
     print "// Reading %i Directories" % len(dirs)
 
-# The Globbit
+# The Manifests (Rescan Once, Persisted for the Workers)
 run_names = []
 for idir, cdir in enumerate(dirs):
-    globs = glob.glob("%s/Out_*.dat" % cdir)
+    dfm = ioh.load_manifest(cdir, refresh=True)
     # Extract run names
     # In:  Out_run_03_000057000000
     # Out: run_03
-    run_names.append(globs[0].strip().split("/")[-1][:-4][4:-13])
-    # Extract directory w/ most outputs
-    if idir == 0:
-        lmax = len(globs)
-        xglobs = globs
-    else:
-        # Actual
-        if len(globs) > lmax:
-            lmax = len(globs)
-            xglobs = globs
-
-# Get steps
-nsteps = np.zeros_like(xglobs, dtype=np.int64)
-for iglob, xglob in enumerate(sorted(xglobs)):
-    # In : /some/dir/Out_run_03_000156000000.dat
-    # Out: 156000000
-    nsteps[iglob] = int(xglob.strip().split("/")[-1][:-4].split("_")[-1])
+    run_names.append(dfm.run_name.iloc[0])
+    # Extract directory w/ most outputs, get steps
+    if idir == 0 or len(dfm) > lmax:
+        lmax = len(dfm)
+        nsteps = np.asarray(dfm.index, dtype=np.int64)
 
 # Loop directories. Serial or parallel.
 df_sts_runs = {}
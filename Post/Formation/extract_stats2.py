@@ -22,7 +22,6 @@ Here, "dirlist" is a file looking like:
 """
 
 import sys
-import glob
 import numpy as np
 import pandas as pd
 import io_helpers as ioh
@@ -67,30 +66,18 @@ else:
         dirs.append(line)
     print "// Reading %i Directories" % len(dirs)
 
-# The Globbit
+# The Manifests (Rescan Once, Persisted for the Workers)
 run_names = []
 for idir, cdir in enumerate(dirs):
-    globs = glob.glob("%s/Out_*.dat" % cdir)
+    dfm = ioh.load_manifest(cdir, refresh=True)
     # Extract run names
     # In:  Out_run_03_000057000000
     # Out: run_03
-    run_names.append(globs[0].strip().split("/")[-1][:-4][4:-13])
-    # Extract directory w/ most outputs
-    if idir == 0:
-        lmax = len(globs)
-        xglobs = globs
-    else:
-        # Actual
-        if len(globs) > lmax:
-            lmax = len(globs)
-            xglobs = globs
-
-# Get steps
-nsteps = np.zeros_like(xglobs, dtype=np.int64)
-for iglob, xglob in enumerate(sorted(xglobs)):
-    # In : /some/dir/Out_run_03_000156000000.dat
-    # Out: 156000000
-    nsteps[iglob] = int(xglob.strip().split("/")[-1][:-4].split("_")[-1])
+    run_names.append(dfm.run_name.iloc[0])
+    # Extract directory w/ most outputs, get steps
+    if idir == 0 or len(dfm) > lmax:
+        lmax = len(dfm)
+        nsteps = np.asarray(dfm.index, dtype=np.int64)
 
 ###############################################################################
 ###############################################################################
@@ -272,7 +259,8 @@ for istep, nstep in enumerate(nsteps):
     df = ioh.read_output_and_stack(fnames, \
                                    frame='heliocentric', \
                                    drop_duplicates=False, 
-                                   nofail=True)
+                                   nofail=True, \
+                                   elements=["a", "e", "i"])
     df = df[df.mass < 12.0]
     df_above = df[df.mass >= m_cutoff]
     df_below = df[df.mass < m_cutoff]
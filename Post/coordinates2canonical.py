@@ -0,0 +1,77 @@
+"""
+Compute Canonical (Delaunay/Poincare) Elements for Coordinate Stores
+(Coordinates_XX.hdf5), Write Coordinates_XX.canonical.hdf5 Alongside.
+Cf. store_helpers.write_canonical, kepler_helpers.kep2poiX.
+
+Actions use each particle's mass. Test particles have zero actions unless
+--specific (actions per unit mass) is given. Stores written with schema
+minimal lack the angles and cannot be converted.
+
+Filelist Format:
+/path/Coordinates_01.hdf5
+/path/Coordinates_02.hdf5
+...
+/path/Coordinates_NN.hdf5
+
+Use the -np to define number of subprocesses.
+"""
+
+import store_helpers as sh
+import sys
+import multiprocessing as mp
+import argparse
+
+
+###############################################################################
+# FUNCTION DEFINITIONS
+###############################################################################
+
+def convert(fname):
+    """
+    Processing Function.
+    """
+
+    cname = sh.write_canonical(fname, nsteps_per_chunk=args.nsteps_per_chunk, \
+                               specific=args.specific)
+    print "** %s -> %s" % (fname, cname)
+    return cname
+
+
+###############################################################################
+# MAIN PROGRAM STARTS HERE
+###############################################################################
+
+# Parse Arguments
+parser = argparse.ArgumentParser()
+parser.add_argument('-np', type=int, default=1, \
+                    help='Number of Processes')
+parser.add_argument('-nsteps_per_chunk', type=int, default=100, \
+                    help='Steps per Chunk')
+parser.add_argument('--specific', action='store_true', \
+                    help='Actions per Unit Mass')
+args = parser.parse_args()
+print "// Using %i Subprocesses" % args.np
+
+# List of Files
+if sys.stdin.isatty():
+    print "!! No File List (Use Stdin)."
+    sys.exit()
+else:
+    lines = sys.stdin.read().rstrip("\n").split("\n")
+    fnames = []
+    for line in lines:
+        fnames.append(line.strip())
+    print "// Reading %i Files" % len(fnames)
+
+# Loop Files
+if args.np == 1:
+    for fname in fnames:
+        convert(fname)
+else:
+    pool = mp.Pool(processes=args.np)
+    pool.map(convert, fnames)
+    pool.close()
+    pool.join()
+
+# Done
+print "// Done"
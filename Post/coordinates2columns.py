@@ -0,0 +1,70 @@
+"""
+Convert Coordinate Stores (Coordinates_XX.hdf5) to the Memory-Mapped Column
+Layout (Coordinates_XX.cols/). Cf. store_helpers.write_columns.
+
+The stacked plotting scripts use the column layout automatically wherever it
+is newer than the store. Re-run after outputs2dataframe.py --append.
+
+Filelist Format:
+/path/Coordinates_01.hdf5
+/path/Coordinates_02.hdf5
+...
+/path/Coordinates_NN.hdf5
+
+Use the -np to define number of subprocesses.
+"""
+
+import store_helpers as sh
+import sys
+import multiprocessing as mp
+import argparse
+
+
+###############################################################################
+# FUNCTION DEFINITIONS
+###############################################################################
+
+def convert(fname):
+    """
+    Processing Function.
+    """
+
+    dname = sh.write_columns(fname)
+    print "** %s -> %s" % (fname, dname)
+    return dname
+
+
+###############################################################################
+# MAIN PROGRAM STARTS HERE
+###############################################################################
+
+# Parse Arguments
+parser = argparse.ArgumentParser()
+parser.add_argument('-np', type=int, default=1, \
+                    help='Number of Processes')
+args = parser.parse_args()
+print "// Using %i Subprocesses" % args.np
+
+# List of Files
+if sys.stdin.isatty():
+    print "!! No File List (Use Stdin)."
+    sys.exit()
+else:
+    lines = sys.stdin.read().rstrip("\n").split("\n")
+    fnames = []
+    for line in lines:
+        fnames.append(line.strip())
+    print "// Reading %i Files" % len(fnames)
+
+# Loop Files
+if args.np == 1:
+    for fname in fnames:
+        convert(fname)
+else:
+    pool = mp.Pool(processes=args.np)
+    pool.map(convert, fnames)
+    pool.close()
+    pool.join()
+
+# Done
+print "// Done"
@@ -1,5 +1,7 @@
 """
 Convert Genga Coordinate Outputs to Dataframes (Per Directory).
+Writes queryable (table format) stores Coordinates_XX.hdf5, indexed by nstep
+and pid. Cf. store_helpers.read_coordinates.
 
 Dirlist Format:
 /path/01/
@@ -8,11 +10,24 @@ Dirlist Format:
 /path/NN/
 
 Code is embarrassingly parallel. Use the -np to define number of subprocesses.
+Alternatively, use -np_outputs to parse the outputs of each directory on a
+pool of subprocesses (useful for few, large directories). Cannot be combined.
+
+Use --append to refresh existing stores of running simulations. Only outputs
+whose nstep is not yet in Coordinates_XX.hdf5 are parsed and appended. Legacy
+(fixed format) stores are converted first.
+
+Use --schema compact/minimal to drop columns and downcast to float32 (cf.
+io_helpers.schemas). Bytes saved and the error introduced are reported.
+Appended outputs take the columns and types of the existing store. If the
+schema drops a stored column, nothing is parsed and the schema to use is
+printed.
 """
 
 import io_helpers as ioh
-import pandas as pd
+import store_helpers as sh
 import sys
+import os
 import glob
 import multiprocessing as mp
 import argparse
@@ -22,24 +37,72 @@ import argparse
 # FUNCTION DEFINITIONS
 ###############################################################################
 
-def outs2df(cdir):
+def store_fname(idir):
     """
-    Processing Function.
+    Coordinates_XX.hdf5 for Directory Index idir.
     """
 
-    print "** %s" % cdir
+    return "Coordinates_%02d.hdf5" % int(idir+1)
+
+def outs2df(task):
+    """
+    Processing Function. Writes Coordinates_XX.hdf5 for one directory.
+    """
+
+    idir, cdir = task
+    fname_out = store_fname(idir)
+    print "** %s -> %s" % (cdir, fname_out)
 
     # Glob Coordinate Output Files
     globs = glob.glob("%s/Out_*.dat" % cdir)
     globs = sorted(globs)
 
-    # Load Data
-    df = ioh.read_output_and_stack(globs, frame="heliocentric", \
-                                   drop_duplicates=False)
-    df.reset_index(drop=True, inplace=True)
-
-    # Return Dataframe
-    return df
+    # Skip Steps Already in Store, Keep File Numbering (ifname) of Full Run
+    ifnames = dict([ [ ioh.nstep_from_fname(fname), float(ifname) ] \
+                     for ifname, fname in enumerate(globs) ])
+    append = args.append and os.path.isfile(fname_out)
+    if append:
+        sh.convert_coordinates(fname_out)
+        nsteps_done = set(sh.coordinates_nsteps(fname_out))
+        globs = [ fname for fname in globs \
+                  if not ioh.nstep_from_fname(fname) in nsteps_done ]
+        print "** %s: Appending %i New Outputs" % (fname_out, len(globs))
+        if len(globs) == 0:
+            return fname_out
+
+    # Stream Snapshots into Store (Bounded Memory)
+    report = None
+    if args.np_outputs == 1:
+        dfs = ioh.iterate_output(globs, frame="heliocentric")
+        for idf, df in enumerate(dfs):
+            df["ifname"] = df.nstep.map(ifnames)
+            if args.schema is not None:
+                report = ioh.schema_report(df, args.schema, report)
+            sh.write_coordinates(fname_out, df, append=(append or idf > 0), \
+                                 schema=args.schema)
+    else:
+        df = ioh.read_output_parallel(globs, frame="heliocentric", \
+                                      nprocs=args.np_outputs)
+        df["ifname"] = df.nstep.map(ifnames)
+        if args.schema is not None:
+            report = ioh.schema_report(df, args.schema)
+        sh.write_coordinates(fname_out, df, append=append, \
+                             schema=args.schema)
+
+    # Report Schema Savings
+    if report is not None:
+        nbytes_in = report.bytes_in.sum()
+        nbytes_out = report.bytes_out.sum()
+        print "** %s: Schema %s, %.1f MB -> %.1f MB (%.1f%% Saved)" % \
+            (fname_out, args.schema, nbytes_in/1.0e6, nbytes_out/1.0e6, \
+             100.0 * (1.0 - float(nbytes_out)/max(nbytes_in, 1)))
+        print report.to_string()
+
+    # Index Steps, Particle IDs
+    sh.index_coordinates(fname_out)
+
+    # Return Filename
+    return fname_out
 
 
 ###############################################################################
@@ -50,8 +113,18 @@ def outs2df(cdir):
 parser = argparse.ArgumentParser()
 parser.add_argument('-np', type=int, default=1, \
                     help='Number of Processes')
+parser.add_argument('-np_outputs', type=int, default=1, \
+                    help='Number of Processes per Directory')
+parser.add_argument('--append', action='store_true', \
+                    help='Append New Outputs to Existing Stores')
+parser.add_argument('--schema', default=None, \
+                    choices=sorted(ioh.schemas.keys()), \
+                    help='Storage Schema (Default: Keep All)')
 args = parser.parse_args()
-print "// Using %i Subprocesses" % args.np
+if args.np > 1 and args.np_outputs > 1:
+    print "!! Use Either -np or -np_outputs."
+    sys.exit()
+print "// Using %i Subprocesses" % max(args.np, args.np_outputs)
 
 # List of Directories
 if sys.stdin.isatty():
@@ -64,24 +137,32 @@ else:
         dirs.append(line)
     print "// Reading %i Directories" % len(dirs)
 
-
-# Loop Directories
+# Check Existing Stores before Parsing (Appends Keep their Columns/Types)
+if args.append:
+    for idir, cdir in enumerate(dirs):
+        fname_out = store_fname(idir)
+        if not os.path.isfile(fname_out):
+            continue
+        ok, schema_store = sh.check_append(fname_out, args.schema)
+        if not ok:
+            print "!! %s: Schema %s Drops Stored Columns. Use --schema %s." % \
+                (fname_out, args.schema, schema_store)
+            sys.exit()
+        if schema_store != ( "full" if args.schema is None else args.schema ):
+            print "** %s: Stored with Schema %s, Appending in Its Types" % \
+                (fname_out, schema_store)
+
+# Loop Directories (Workers Save Dataframes)
+tasks = [ [ idir, cdir ] for idir, cdir in enumerate(dirs) ]
 if args.np == 1:
     result = []
-    for idir, cdir in enumerate(dirs):
-        df_tmp = outs2df(cdir)
-        result.append(df_tmp)
+    for task in tasks:
+        result.append(outs2df(task))
 else:
     pool = mp.Pool(processes=args.np)
-    result = pool.map(outs2df, dirs)
+    result = pool.map(outs2df, tasks)
     pool.close()
     pool.join()
 
-# Save
-print "// Saving Dataframes"
-for idf, df in enumerate(result):
-    with pd.HDFStore("Coordinates_%02d.hdf5" % int(idf+1)) as store:
-        store["df"] = df
-
 # Done
 print "// Done"
@@ -0,0 +1,101 @@
+"""
+Build Per-Particle Element Tracks (pid x nstep Cubes) from Genga Coordinate
+Outputs (Per Directory). Writes Tracks_XX.tracks/, cf. track_helpers.
+
+Each directory is streamed once; elements are computed per snapshot and
+written into the cubes. Trajectories are then rows of memory-mapped files
+(track_helpers.read_tracks, trajectory).
+
+Dirlist Format:
+/path/01/
+/path/02/
+...
+/path/NN/
+
+Code is embarrassingly parallel. Use the -np to define number of subprocesses.
+"""
+
+import io_helpers as ioh
+import track_helpers as th
+import sys
+import numpy as np
+import multiprocessing as mp
+import argparse
+
+
+###############################################################################
+# FUNCTION DEFINITIONS
+###############################################################################
+
+def outs2tracks(task):
+    """
+    Processing Function. Writes Tracks_XX.tracks for one directory.
+    """
+
+    idir, cdir = task
+    dname_out = "Tracks_%02d%s" % (int(idir+1), th.tracks_suffix)
+    print "** %s -> %s" % (cdir, dname_out)
+
+    # Coordinate Output Files in Step Order (Manifest, Rescan for New)
+    dfm = ioh.load_manifest(cdir, refresh=True)
+    fnames = [ ioh.manifest_lookup_nstep(dfm, cdir, nstep) \
+               for nstep in dfm.index ]
+
+    # Build, Write
+    tracks = th.build_tracks(fnames, args.frame, columns=args.columns, \
+                             pids=args.pids, \
+                             dtype=np.float64 if args.float64 \
+                                 else np.float32)
+    th.write_tracks(dname_out, tracks)
+    print "** %s: %i Particles x %i Steps" % \
+        (dname_out, len(tracks["pids"]), len(tracks["nsteps"]))
+
+    # Return Directory Name
+    return dname_out
+
+
+###############################################################################
+# MAIN PROGRAM STARTS HERE
+###############################################################################
+
+# Parse Arguments
+parser = argparse.ArgumentParser()
+parser.add_argument('-np', type=int, default=1, \
+                    help='Number of Processes')
+parser.add_argument('-frame', default='heliocentric', \
+                    choices=[ 'heliocentric', 'barycentric' ], \
+                    help='Reference Frame')
+parser.add_argument('-columns', nargs='+', default=th.columns_default, \
+                    help='Columns to Track')
+parser.add_argument('-pids', type=int, nargs='+', default=None, \
+                    help='Particle IDs to Track (Default: All)')
+parser.add_argument('--float64', action='store_true', \
+                    help='Store Cubes as float64 (Default: float32)')
+args = parser.parse_args()
+print "// Using %i Subprocesses" % args.np
+
+# List of Directories
+if sys.stdin.isatty():
+    print "!! No Directory List (Use Stdin)."
+    sys.exit()
+else:
+    lines = sys.stdin.read().rstrip("\n").split("\n")
+    dirs = []
+    for line in lines:
+        dirs.append(line)
+    print "// Reading %i Directories" % len(dirs)
+
+# Loop Directories (Workers Save Tracks)
+tasks = [ [ idir, cdir ] for idir, cdir in enumerate(dirs) ]
+if args.np == 1:
+    result = []
+    for task in tasks:
+        result.append(outs2tracks(task))
+else:
+    pool = mp.Pool(processes=args.np)
+    result = pool.map(outs2tracks, tasks)
+    pool.close()
+    pool.join()
+
+# Done
+print "// Done"
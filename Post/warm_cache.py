@@ -0,0 +1,54 @@
+"""
+Build Binary Sidecar Caches for Genga Coordinate Outputs (Per Directory).
+Subsequent reads via io_helpers.read_output(_and_stack) skip text parsing.
+Also (re)builds the run manifest (io_helpers.build_manifest).
+
+Dirlist Format:
+/path/01/
+/path/02/
+...
+/path/NN/
+
+Use the -np to define number of subprocesses (per directory).
+"""
+
+import io_helpers as ioh
+import sys
+import argparse
+
+
+###############################################################################
+# MAIN PROGRAM STARTS HERE
+###############################################################################
+
+# Parse Arguments
+parser = argparse.ArgumentParser()
+parser.add_argument('-np', type=int, default=1, \
+                    help='Number of Processes')
+args = parser.parse_args()
+print "// Using %i Subprocesses" % args.np
+
+# List of Directories
+if sys.stdin.isatty():
+    print "!! No Directory List (Use Stdin)."
+    sys.exit()
+else:
+    lines = sys.stdin.read().rstrip("\n").split("\n")
+    dirs = []
+    for line in lines:
+        dirs.append(line)
+    print "// Reading %i Directories" % len(dirs)
+
+# Loop Directories
+for cdir in dirs:
+    print "** %s" % cdir
+    nfiles = ioh.warm_output_cache(cdir, nprocs=args.np)
+    dfm = ioh.build_manifest(cdir)
+    if len(dfm) == 0:
+        print "!! No Outputs: %s" % cdir
+        continue
+    print "   %i Outputs, Steps %012d-%012d" % \
+        (nfiles, dfm.index[0], dfm.index[-1])
+
+# Done
+print "// Done"